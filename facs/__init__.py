@@ -17,31 +17,88 @@ Example:
 __version__ = "0.1.0"
 __author__ = "Yukkurisiteikitai"
 
-from .core import (
-    AUIntensity,
-    AUDetectionResult,
-    IntensityResult,
-    EmotionResult,
-    AnalysisResult,
-    FaceData,
-    TerminalDisplay,
-    ParallelFACSProcessor,
-    run_parallel_realtime,
-)
-from .core.enums import AnalysisMode  # 追加
-from .config import AU_DEFINITIONS, EMOTION_DEFINITIONS, LANDMARK_NAMES
-from .detectors import (
-    LandmarkDetectorFactory,
-    FeatureExtractor,
-    AUDetector,
-    FaceAligner,
-    FaceAlignment,
-    VectorizedAUDetector,
-    OptimizedFeatureExtractor,
-)
-from .estimators import IntensityEstimator, EmotionMapper
-from .visualization import FACSVisualizer, InteractiveFACSVisualizer
-from .analyzer import FACSAnalyzer
+from typing import TYPE_CHECKING
+import importlib
+
+# 公開名 -> 定義元モジュール
+# cv2 / mediapipe などの重い依存を含むため、属性への初回アクセス時に読み込む (PEP 562)
+_LAZY_ATTRS = {
+    # Main class
+    "FACSAnalyzer": ".analyzer",
+    "AnalysisMode": ".core.enums",
+    # Data models
+    "AUIntensity": ".core",
+    "AUDetectionResult": ".core",
+    "IntensityResult": ".core",
+    "EmotionResult": ".core",
+    "AnalysisResult": ".core",
+    "FaceData": ".core",
+    "FeatureVector": ".core",
+    # Config
+    "AU_DEFINITIONS": ".config",
+    "EMOTION_DEFINITIONS": ".config",
+    "LANDMARK_NAMES": ".config",
+    # Detectors
+    "LandmarkDetectorFactory": ".detectors",
+    "FeatureExtractor": ".detectors",
+    "AUDetector": ".detectors",
+    "FaceAligner": ".detectors",
+    "FaceAlignment": ".detectors",
+    "VectorizedAUDetector": ".detectors",
+    "OptimizedFeatureExtractor": ".detectors",
+    # Estimators
+    "IntensityEstimator": ".estimators",
+    "EmotionMapper": ".estimators",
+    # Visualization
+    "FACSVisualizer": ".visualization",
+    "InteractiveFACSVisualizer": ".visualization",
+    "TerminalDisplay": ".core",
+    # Parallel Processing
+    "ParallelFACSProcessor": ".core",
+    "run_parallel_realtime": ".core",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
+
+if TYPE_CHECKING:
+    from .core import (
+        AUIntensity,
+        AUDetectionResult,
+        IntensityResult,
+        EmotionResult,
+        AnalysisResult,
+        FaceData,
+        FeatureVector,
+        TerminalDisplay,
+        ParallelFACSProcessor,
+        run_parallel_realtime,
+    )
+    from .core.enums import AnalysisMode
+    from .config import AU_DEFINITIONS, EMOTION_DEFINITIONS, LANDMARK_NAMES
+    from .detectors import (
+        LandmarkDetectorFactory,
+        FeatureExtractor,
+        AUDetector,
+        FaceAligner,
+        FaceAlignment,
+        VectorizedAUDetector,
+        OptimizedFeatureExtractor,
+    )
+    from .estimators import IntensityEstimator, EmotionMapper
+    from .visualization import FACSVisualizer, InteractiveFACSVisualizer
+    from .analyzer import FACSAnalyzer
 
 __all__ = [
     # Version
@@ -56,6 +113,7 @@ __all__ = [
     "EmotionResult",
     "AnalysisResult",
     "FaceData",
+    "FeatureVector",
     # Config
     "AU_DEFINITIONS",
     "EMOTION_DEFINITIONS",
@@ -28,6 +28,7 @@ class AnalysisModeConfig:
             "max_faces": 1,
             "image_scale": 0.5,
             "use_temporal_filter": True,
+            "au_delta_threshold": 1e-3,
         },
         AnalysisMode.BALANCED: {
             "detection_confidence": 0.5,
@@ -144,6 +145,7 @@ class FACSAnalyzer:
         
         # リアルタイムモード用のフィルタ
         self._temporal_filter = TemporalFilter(self._config.get("smoothing_window", 3))
+        self._configure_au_detector()
         
         # 精密モード用のキャリブレーション
         self._baseline_landmarks: Optional[np.ndarray] = None
@@ -158,9 +160,16 @@ class FACSAnalyzer:
         self._mode = mode
         self._config = AnalysisModeConfig.get(mode)
         self._temporal_filter = TemporalFilter(self._config.get("smoothing_window", 3))
+        self._configure_au_detector()
         if mode != AnalysisMode.ACCURATE:
             self._calibrated = False
     
+    def _configure_au_detector(self):
+        """モードに応じてAU検出器のフレーム間キャッシュを設定"""
+        if isinstance(self._au_detector, VectorizedAUDetector):
+            self._au_detector.delta_threshold = self._config.get("au_delta_threshold", 0.0)
+            self._au_detector.reset_cache()
+    
     def calibrate(self, neutral_image: np.ndarray) -> bool:
         """ニュートラル表情でキャリブレーション（精密モード用）"""
         landmarks = self._landmark_detector.detect_landmarks(neutral_image)
@@ -38,26 +38,26 @@ def main():
         parser.print_help()
         return 0
     
-    if args.command in ("version", "v"):
-        from facs import __version__
-        print(f"facs-analyzer {__version__}")
-        return 0
-    
-    if args.command in ("list", "l"):
-        from facs import FACSAnalyzer
-        for au in FACSAnalyzer.list_all_aus():
-            print(f"AU{au['number']:2d}: {au['name']} - {au['description']}")
-        return 0
-    
-    if args.command in ("realtime", "r"):
-        from facs import FACSAnalyzer
-        analyzer = FACSAnalyzer()
-        analyzer.analyze_realtime(args.camera)
-        return 0
-    
-    if args.command in ("analyze", "a"):
-        return _analyze(args)
-    
+    return COMMANDS[args.command](args)
+
+def _version(args) -> int:
+    """バージョン表示"""
+    from facs import __version__
+    print(f"facs-analyzer {__version__}")
+    return 0
+
+def _list(args) -> int:
+    """AU一覧を表示（解析器本体は読み込まない）"""
+    from facs.config import AU_DEFINITIONS
+    for au in AU_DEFINITIONS.values():
+        print(f"AU{au.au_number:2d}: {au.name} - {au.description}")
+    return 0
+
+def _realtime(args) -> int:
+    """リアルタイム分析を実行"""
+    from facs import FACSAnalyzer
+    analyzer = FACSAnalyzer()
+    analyzer.analyze_realtime(args.camera)
     return 0
 
 def _analyze(args) -> int:
@@ -115,5 +115,13 @@ def _analyze(args) -> int:
     
     return 0
 
+# サブコマンド（エイリアス含む）-> ハンドラ
+COMMANDS = {
+    "analyze": _analyze, "a": _analyze,
+    "realtime": _realtime, "r": _realtime,
+    "list": _list, "l": _list,
+    "version": _version, "v": _version,
+}
+
 if __name__ == "__main__":
     sys.exit(main())
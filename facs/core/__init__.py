@@ -8,6 +8,7 @@ from .models import (
     EmotionResult,
     FaceData,
     AnalysisResult,
+    FeatureVector,
 )
 from .interfaces import (
     ILandmarkDetector,
@@ -18,14 +19,24 @@ from .interfaces import (
     IVisualizer,
     IAUDetectionStrategy,
 )
-from .terminal_display import TerminalDisplay
-from .parallel_processor import ParallelFACSProcessor, run_parallel_realtime
+
+
+def __getattr__(name: str):
+    # terminal_display は config を参照し (config -> core の循環を避ける)、
+    # parallel_processor は cv2 を読み込むため、初回アクセス時まで遅延させる
+    if name == "TerminalDisplay":
+        from .terminal_display import TerminalDisplay
+        return TerminalDisplay
+    if name in ("ParallelFACSProcessor", "run_parallel_realtime"):
+        from . import parallel_processor
+        return getattr(parallel_processor, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     "AUIntensity", "DetectorType",
     "ActionUnitDefinition", "EmotionDefinition",
     "AUDetectionResult", "IntensityResult", "EmotionResult",
-    "FaceData", "AnalysisResult",
+    "FaceData", "AnalysisResult", "FeatureVector",
     "ILandmarkDetector", "IFeatureExtractor", "IAUDetector",
     "IIntensityEstimator", "IEmotionMapper", "IVisualizer", "IAUDetectionStrategy",
     "TerminalDisplay",
@@ -10,6 +10,15 @@ class AUIntensity(Enum):
     MARKED = 3     # C
     SEVERE = 4     # D
     MAXIMUM = 5    # E
+    
+    @property
+    def label(self) -> str:
+        """FACS表記の強度ラベル ("-", "A"〜"E")"""
+        return _INTENSITY_LABELS[self.value]
+
+
+# 強度ラベル (AUIntensity.value でインデックス)
+_INTENSITY_LABELS = ("-", "A", "B", "C", "D", "E")
 
 
 class DetectorType(Enum):
@@ -5,7 +5,7 @@ from abc import ABC, abstractmethod
 from typing import Dict, List, Tuple, Optional
 import numpy as np
 
-from .models import AUDetectionResult, IntensityResult, EmotionResult, AnalysisResult
+from .models import AUDetectionResult, IntensityResult, EmotionResult, AnalysisResult, FeatureVector
 
 
 class ILandmarkDetector(ABC):
@@ -90,7 +90,7 @@ class IAUDetectionStrategy(ABC):
         pass
     
     @abstractmethod
-    def detect(self, landmarks: np.ndarray, distances: Dict[str, float],
+    def detect(self, landmarks: np.ndarray, feats: FeatureVector,
                angles: Dict[str, float], eye_dist: float) -> Tuple[float, float]:
         """検出を実行し、(raw_score, asymmetry)を返す"""
         pass
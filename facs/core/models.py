@@ -2,24 +2,74 @@
 データモデル定義
 """
 from dataclasses import dataclass, field
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, NamedTuple, Tuple, Optional
 import numpy as np
+import base64
 import json
+import sys
 import time
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from .enums import AUIntensity
 
+# 記録データの強度値 -> AUIntensity
+_INTENSITY_BY_VALUE = {intensity.value: intensity for intensity in AUIntensity}
+
+# インスタンスごとの __dict__ を持たないよう __slots__ を生成 (Python 3.10+)
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+# 変換不要なPython標準型（大半の値はここで即座に返る）
+_ATOMIC_TYPES = frozenset({int, float, bool, str, type(None)})
+
 
 def _to_python_type(value):
     """NumPy型をPython標準型に変換"""
-    if isinstance(value, (np.bool_, np.generic)):
-        return value.item()
+    if type(value) in _ATOMIC_TYPES:
+        return value
     if isinstance(value, np.ndarray):
         return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
     return value
 
 
-@dataclass
+class FeatureVector(NamedTuple):
+    """AU検出用の距離特徴（固定フィールド）
+    
+    検出器の内側ループで文字列キーの辞書引きを繰り返さないよう、
+    フレームごとに一度だけ距離辞書から生成する。
+    """
+    eye_distance: float
+    brow_distance: float
+    mouth_width: float
+    mouth_height_inner: float
+    mouth_height_outer: float
+    right_eye_aspect_ratio: float
+    left_eye_aspect_ratio: float
+    
+    @classmethod
+    def from_distances(cls, distances: Dict[str, float]) -> "FeatureVector":
+        """距離辞書から生成（欠損キーは検出器の既定値で補完）"""
+        get = distances.get
+        eye_dist = max(get("eye_distance", 1.0), 1e-6)
+        return cls(
+            eye_distance=eye_dist,
+            brow_distance=get("brow_distance", eye_dist * 0.3),
+            mouth_width=get("mouth_width", eye_dist * 0.5),
+            mouth_height_inner=get("mouth_height_inner", 0.0),
+            mouth_height_outer=get("mouth_height_outer", 0.0),
+            right_eye_aspect_ratio=get("right_eye_aspect_ratio", 0.25),
+            left_eye_aspect_ratio=get("left_eye_aspect_ratio", 0.25),
+        )
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class ActionUnitDefinition:
     """Action Unitの定義"""
     au_number: int
@@ -29,7 +79,7 @@ class ActionUnitDefinition:
     landmarks_involved: Tuple[int, ...]
 
 
-@dataclass
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class EmotionDefinition:
     """感情の定義"""
     name: str
@@ -40,7 +90,7 @@ class EmotionDefinition:
     arousal: float
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class AUDetectionResult:
     """AU検出結果"""
     au_number: int
@@ -52,7 +102,7 @@ class AUDetectionResult:
     asymmetry: float = 0.0
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class IntensityResult:
     """強度推定結果"""
     au_number: int
@@ -62,7 +112,7 @@ class IntensityResult:
     confidence: float
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class EmotionResult:
     """感情推定結果"""
     emotion: str
@@ -74,7 +124,7 @@ class EmotionResult:
     description: str
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class FaceData:
     """顔データ"""
     rect: Optional[Tuple[int, int, int, int]]
@@ -91,26 +141,44 @@ class FaceData:
         return max(self.distances.get("eye_distance", 1.0), 1e-6)
     
     def to_dict(self) -> Dict:
-        """シリアライズ用の辞書に変換"""
-        return {
+        """シリアライズ用の辞書に変換
+        
+        ランドマークはfloat32のバイト列をBase64文字列にして格納する
+        （数値リストより変換・パースともに高速）。
+        """
+        data = {
             "rect": list(self.rect) if self.rect else None,
-            "landmarks": self.landmarks.tolist() if self.landmarks is not None else None,
+            "landmarks": None,
             "distances": self.distances,
             "angles": self.angles,
         }
+        if self.landmarks is not None:
+            landmarks = np.ascontiguousarray(self.landmarks, dtype=np.float32)
+            data["landmarks"] = base64.b64encode(landmarks.tobytes()).decode("ascii")
+            data["landmarks_shape"] = list(landmarks.shape)
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict) -> "FaceData":
-        """辞書からFaceDataを復元"""
+        """辞書からFaceDataを復元（数値リスト形式の旧データにも対応）"""
+        landmarks = data.get("landmarks")
+        if isinstance(landmarks, str):
+            landmarks = np.frombuffer(
+                base64.b64decode(landmarks), dtype=np.float32
+            ).reshape(data["landmarks_shape"])
+        elif landmarks:
+            landmarks = np.asarray(landmarks, dtype=np.float32)
+        else:
+            landmarks = None
         return cls(
             rect=tuple(data["rect"]) if data.get("rect") else None,
-            landmarks=np.array(data["landmarks"]) if data.get("landmarks") else None,
+            landmarks=landmarks,
             distances=data.get("distances", {}),
             angles=data.get("angles", {}),
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class AnalysisResult:
     """分析結果"""
     timestamp: float = field(default_factory=time.time)
@@ -164,7 +232,7 @@ class AnalysisResult:
                     "name": v.name,
                     "detected": _to_python_type(v.detected),
                     "confidence": _to_python_type(v.confidence),
-                    "intensity": _to_python_type(v.intensity.value),
+                    "intensity": v.intensity.value,
                     "raw_score": _to_python_type(v.raw_score),
                     "asymmetry": _to_python_type(v.asymmetry),
                 }
@@ -173,7 +241,7 @@ class AnalysisResult:
             "intensity_results": {
                 str(k): {
                     "au_number": _to_python_type(v.au_number),
-                    "intensity": _to_python_type(v.intensity.value),
+                    "intensity": v.intensity.value,
                     "intensity_value": _to_python_type(v.intensity_value),
                     "intensity_label": v.intensity_label,
                     "confidence": _to_python_type(v.confidence),
@@ -186,8 +254,8 @@ class AnalysisResult:
                     "confidence": _to_python_type(e.confidence),
                     "valence": _to_python_type(e.valence),
                     "arousal": _to_python_type(e.arousal),
-                    "matched_aus": [_to_python_type(x) for x in e.matched_aus],
-                    "missing_aus": [_to_python_type(x) for x in e.missing_aus],
+                    "matched_aus": list(map(_to_python_type, e.matched_aus)),
+                    "missing_aus": list(map(_to_python_type, e.missing_aus)),
                     "description": e.description,
                 }
                 for e in self.emotions
@@ -203,39 +271,30 @@ class AnalysisResult:
         """記録用辞書からAnalysisResultを復元"""
         face_data = FaceData.from_dict(data["face_data"]) if data.get("face_data") else None
         
+        # AUIntensity(value) の Enum 呼び出しは遅いため、値 -> メンバーの辞書を引く
+        intensity_of = _INTENSITY_BY_VALUE.__getitem__
+        
+        # キーは au_number と同じ値なので、文字列キーを int() で解析し直さない
         au_results = {
-            int(k): AUDetectionResult(
-                au_number=v["au_number"],
-                name=v["name"],
-                detected=v["detected"],
-                confidence=v["confidence"],
-                intensity=AUIntensity(v["intensity"]),
-                raw_score=v["raw_score"],
-                asymmetry=v.get("asymmetry", 0.0),
+            v["au_number"]: AUDetectionResult(
+                v["au_number"], v["name"], v["detected"], v["confidence"],
+                intensity_of(v["intensity"]), v["raw_score"], v.get("asymmetry", 0.0),
             )
-            for k, v in data.get("au_results", {}).items()
+            for v in data.get("au_results", {}).values()
         }
         
         intensity_results = {
-            int(k): IntensityResult(
-                au_number=v["au_number"],
-                intensity=AUIntensity(v["intensity"]),
-                intensity_value=v["intensity_value"],
-                intensity_label=v["intensity_label"],
-                confidence=v["confidence"],
+            v["au_number"]: IntensityResult(
+                v["au_number"], intensity_of(v["intensity"]), v["intensity_value"],
+                v["intensity_label"], v["confidence"],
             )
-            for k, v in data.get("intensity_results", {}).items()
+            for v in data.get("intensity_results", {}).values()
         }
         
         emotions = [
             EmotionResult(
-                emotion=e["emotion"],
-                confidence=e["confidence"],
-                valence=e["valence"],
-                arousal=e["arousal"],
-                matched_aus=e["matched_aus"],
-                missing_aus=e["missing_aus"],
-                description=e["description"],
+                e["emotion"], e["confidence"], e["valence"], e["arousal"],
+                e["matched_aus"], e["missing_aus"], e["description"],
             )
             for e in data.get("emotions", [])
         ]
@@ -254,4 +313,8 @@ class AnalysisResult:
         )
     
     def to_json(self) -> str:
-        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(
+                self.to_dict(), option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+            ).decode()
+        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False, default=_to_python_type)
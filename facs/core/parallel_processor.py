@@ -3,25 +3,39 @@
 推論と描画を分離して並列実行するためのクラス群
 """
 import multiprocessing as mp
+from collections import deque
 from multiprocessing import Process, Queue, Event
+from multiprocessing.shared_memory import SharedMemory
 import numpy as np
 import cv2
 import time
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, List, Tuple
 from dataclasses import dataclass
 from queue import Empty, Full
+import pickle
+import struct
 import threading
 
+from ..config import AU_DEFINITIONS
+from .models import _DATACLASS_SLOTS
 
-@dataclass
+
+@dataclass(**_DATACLASS_SLOTS)
 class FrameData:
-    """フレームデータの転送用構造体"""
+    """
+    フレームデータの転送用構造体
+
+    通常は画像を共有メモリのバッファに置き、バッファ番号と形状のみを送る。
+    空きバッファがない場合などは image に画像そのものを載せる。
+    """
     frame_id: int
-    image: np.ndarray
     timestamp: float
+    buffer_index: int = -1
+    shape: Optional[Tuple[int, ...]] = None
+    image: Optional[np.ndarray] = None
 
 
-@dataclass  
+@dataclass(**_DATACLASS_SLOTS)
 class ResultData:
     """分析結果の転送用構造体"""
     frame_id: int
@@ -29,6 +43,92 @@ class ResultData:
     processing_time_ms: float
 
 
+class LatestResultSlot:
+    """
+    最新の分析結果1件だけを保持する共有メモリスロット
+    
+    ワーカーは結果をpickleして上書きし、シーケンス番号を進める。
+    読み出し側は番号が変わったときだけ取り出すため、途中の結果は
+    キューを経由せず、pickle解除もされずに捨てられる。
+    """
+    
+    HEADER = struct.Struct('<I')
+    
+    def __init__(self, size: int = 1 << 18):
+        self._shm = SharedMemory(create=True, size=size)
+        self._seq = mp.Value('Q', 0)
+        self._last_seq = 0
+    
+    def publish(self, result_data: 'ResultData') -> bool:
+        """結果を書き込む（スロットに収まらない場合はFalse）"""
+        payload = pickle.dumps(result_data, protocol=pickle.HIGHEST_PROTOCOL)
+        end = self.HEADER.size + len(payload)
+        if end > self._shm.size:
+            return False
+        with self._seq.get_lock():
+            self.HEADER.pack_into(self._shm.buf, 0, len(payload))
+            self._shm.buf[self.HEADER.size:end] = payload
+            self._seq.value += 1
+        return True
+    
+    def read(self) -> Optional['ResultData']:
+        """前回の読み出し以降に書き込まれた結果を取得（なければNone）"""
+        with self._seq.get_lock():
+            seq = self._seq.value
+            if seq == self._last_seq:
+                return None
+            (length,) = self.HEADER.unpack_from(self._shm.buf, 0)
+            payload = bytes(self._shm.buf[self.HEADER.size:self.HEADER.size + length])
+        self._last_seq = seq
+        return pickle.loads(payload)
+    
+    def close(self, unlink: bool = False):
+        """共有メモリを閉じる（作成側はunlinkも行う）"""
+        self._shm.close()
+        if unlink:
+            self._shm.unlink()
+
+
+# AU結果の転送用レコード型（1フレーム分を1つの連続バッファにまとめる）
+_AU_RECORD_DTYPE = np.dtype([
+    ('au_number', '<i2'), ('detected', '?'), ('confidence', '<f4'),
+    ('intensity', 'i1'), ('raw_score', '<f4'), ('asymmetry', '<f4'),
+])
+_INTENSITY_RECORD_DTYPE = np.dtype([
+    ('au_number', '<i2'), ('intensity', 'i1'),
+    ('intensity_value', '<f4'), ('confidence', '<f4'),
+])
+
+
+def _pack_au_results(au_results: Dict[int, Any]) -> np.ndarray:
+    """AU検出結果を構造化配列に変換"""
+    return np.array([
+        (v.au_number, v.detected, v.confidence, v.intensity.value, v.raw_score, v.asymmetry)
+        for v in au_results.values()
+    ], dtype=_AU_RECORD_DTYPE)
+
+
+def _pack_intensity_results(intensity_results: Dict[int, Any]) -> np.ndarray:
+    """強度推定結果を構造化配列に変換"""
+    return np.array([
+        (v.au_number, v.intensity.value, v.intensity_value, v.confidence)
+        for v in intensity_results.values()
+    ], dtype=_INTENSITY_RECORD_DTYPE)
+
+
+def _rect_from_landmarks(landmarks: np.ndarray, padding: float = 0.1) -> Tuple[int, int, int, int]:
+    """ランドマークの外接矩形から顔矩形を求める（MediaPipe検出器と同じ余白）"""
+    x_min, y_min = landmarks.min(axis=0).tolist()
+    x_max, y_max = landmarks.max(axis=0).tolist()
+    w, h = x_max - x_min, y_max - y_min
+    return (
+        int(max(0, x_min - w * padding)),
+        int(max(0, y_min - h * padding)),
+        int(w * (1 + 2 * padding)),
+        int(h * (1 + 2 * padding))
+    )
+
+
 class InferenceWorker:
     """
     推論ワーカープロセス
@@ -38,17 +138,34 @@ class InferenceWorker:
     def __init__(
         self,
         input_queue: mp.Queue,
-        output_queue: mp.Queue,
+        result_slot: LatestResultSlot,
         stop_event: mp.Event,
         use_mediapipe: bool = True,
-        mode: str = 'realtime'
+        mode: str = 'realtime',
+        send_features: bool = False,
+        buffer_names: Optional[List[str]] = None,
+        free_queue: Optional[mp.Queue] = None,
+        motion_threshold: float = 1.5
     ):
         self.input_queue = input_queue
-        self.output_queue = output_queue
+        self.result_slot = result_slot
         self.stop_event = stop_event
         self.use_mediapipe = use_mediapipe
         self.mode = mode
+        # 距離・角度は可視化で使わないため、必要な場合のみ送信する
+        self.send_features = send_features
+        self.buffer_names = buffer_names or []
+        self.free_queue = free_queue
+        self._buffers: List[SharedMemory] = []
         self._analyzer = None
+        
+        # 動きの小さいフレームで検出結果を再利用するための状態（0以下で無効）
+        # 連続した frame_id を同じワーカーが受け取る前提のため、単一ワーカー時のみ有効
+        self.motion_threshold = motion_threshold
+        self._last_thumb: Optional[np.ndarray] = None
+        self._last_roi: Optional[Tuple[int, int, int, int]] = None
+        self._last_result: Optional[Dict[str, Any]] = None
+        self._last_frame_id = -1
     
     def _init_analyzer(self):
         """プロセス内でアナライザーを初期化（pickling回避）"""
@@ -74,13 +191,61 @@ class InferenceWorker:
             'accurate': {'scale': 1.0, 'threshold': 0.2}
         }
         self._config = mode_map.get(self.mode, mode_map['realtime'])
+        
+        # 縮小画像の出力先（フレームサイズが変わるまで使い回す）
+        self._small_buf: Optional[np.ndarray] = None
     
     def run(self):
         """ワーカーのメインループ"""
         self._init_analyzer()
-        
-        from ..core.models import FaceData, AnalysisResult
-        
+        self._buffers = [SharedMemory(name=name) for name in self.buffer_names]
+        try:
+            self._loop()
+        finally:
+            for shm in self._buffers:
+                shm.close()
+            self.result_slot.close()
+    
+    def _downscale(self, image: np.ndarray, scale: float) -> np.ndarray:
+        """事前確保したバッファへ縮小（縮小にはINTER_AREAが高速かつ高品質）"""
+        h, w = image.shape[:2]
+        shape = (int(round(h * scale)), int(round(w * scale))) + image.shape[2:]
+        if self._small_buf is None or self._small_buf.shape != shape:
+            self._small_buf = np.empty(shape, dtype=image.dtype)
+        cv2.resize(image, (shape[1], shape[0]), dst=self._small_buf,
+                   interpolation=cv2.INTER_AREA)
+        return self._small_buf
+    
+    MOTION_THUMB_SCALE = 0.25
+    
+    def _motion_thumbnail(self, image: np.ndarray) -> np.ndarray:
+        """動き判定用の縮小グレースケール画像"""
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        return cv2.resize(
+            gray, None, fx=self.MOTION_THUMB_SCALE, fy=self.MOTION_THUMB_SCALE,
+            interpolation=cv2.INTER_AREA
+        )
+    
+    def _is_static(self, frame_id: int, thumb: np.ndarray) -> bool:
+        """直前に検出したフレームから顔領域がほぼ動いていないか"""
+        if (self._last_result is None or frame_id != self._last_frame_id + 1
+                or self._last_thumb is None or self._last_thumb.shape != thumb.shape):
+            return False
+        x0, y0, x1, y1 = self._last_roi
+        diff = cv2.absdiff(thumb[y0:y1, x0:x1], self._last_thumb[y0:y1, x0:x1])
+        return diff.size > 0 and cv2.mean(diff)[0] < self.motion_threshold
+    
+    def _set_motion_reference(self, thumb: np.ndarray, landmarks: np.ndarray):
+        """検出を行ったフレームを動き判定の基準として保持"""
+        h, w = thumb.shape
+        lo = np.floor(landmarks.min(axis=0) * self.MOTION_THUMB_SCALE).astype(int)
+        hi = np.ceil(landmarks.max(axis=0) * self.MOTION_THUMB_SCALE).astype(int) + 1
+        self._last_thumb = thumb
+        self._last_roi = (
+            max(int(lo[0]), 0), max(int(lo[1]), 0), min(int(hi[0]), w), min(int(hi[1]), h)
+        )
+    
+    def _loop(self):
         while not self.stop_event.is_set():
             try:
                 # タイムアウト付きで入力を取得
@@ -90,38 +255,63 @@ class InferenceWorker:
             
             start_time = time.time()
             
-            # 画像スケーリング
-            scale = self._config['scale']
-            if scale < 1.0:
-                small_image = cv2.resize(
-                    frame_data.image, None, fx=scale, fy=scale,
-                    interpolation=cv2.INTER_LINEAR
+            # 共有メモリ上の画像をコピーせずに参照
+            if frame_data.buffer_index >= 0:
+                image = np.ndarray(
+                    frame_data.shape, dtype=np.uint8,
+                    buffer=self._buffers[frame_data.buffer_index].buf
                 )
             else:
-                small_image = frame_data.image
+                image = frame_data.image
+            small_image = None
             
-            # ランドマーク検出
-            landmarks = self._landmark_detector.detect_landmarks(small_image)
+            try:
+                # 画像スケーリング
+                scale = self._config['scale']
+                if scale < 1.0:
+                    small_image = self._downscale(image, scale)
+                else:
+                    small_image = image
+                
+                # 前回の検出から顔領域がほぼ動いていなければ検出を省略
+                thumb = None
+                reuse = False
+                if self.motion_threshold > 0:
+                    thumb = self._motion_thumbnail(small_image)
+                    reuse = self._is_static(frame_data.frame_id, thumb)
+                
+                landmarks = None
+                if not reuse:
+                    # ランドマーク検出
+                    landmarks = self._landmark_detector.detect_landmarks(small_image)
+            finally:
+                # 画像を使い終えたらバッファを返却
+                del image, small_image
+                if frame_data.buffer_index >= 0:
+                    self.free_queue.put(frame_data.buffer_index)
             
+            self._last_frame_id = frame_data.frame_id
             result_dict = {'is_valid': False, 'frame_id': frame_data.frame_id}
             
-            if landmarks is not None:
-                # スケールを戻す
+            if reuse:
+                result_dict = dict(self._last_result, frame_id=frame_data.frame_id)
+            elif landmarks is None:
+                self._last_result = None
+            else:
+                if thumb is not None:
+                    self._set_motion_reference(thumb, landmarks)
+                
+                # スケールを戻す（検出器は毎回新しい配列を返すのでインプレースで良い）
                 if scale < 1.0:
-                    landmarks = landmarks / scale
+                    landmarks *= 1.0 / scale
+                
+                # 顔矩形はランドマークから求める（検出器を再度走らせない）
+                face_rect = _rect_from_landmarks(landmarks)
                 
                 # 特徴量抽出
                 distances = self._feature_extractor.compute_distances(landmarks)
                 angles = self._feature_extractor.compute_angles(landmarks)
                 
-                # 顔矩形検出
-                faces = self._landmark_detector.detect_faces(small_image)
-                if faces and scale < 1.0:
-                    faces = [
-                        (int(x/scale), int(y/scale), int(w/scale), int(h/scale))
-                        for x, y, w, h in faces
-                    ]
-                
                 # AU検出
                 au_results = self._au_detector.detect_all(landmarks, distances, angles)
                 
@@ -143,77 +333,63 @@ class InferenceWorker:
                 )
                 
                 # 結果をシリアライズ可能な形式に変換
+                # ランドマークはfloat32の生バイト列で送る（Pythonのfloatリストより軽量）
                 result_dict = {
                     'is_valid': True,
                     'frame_id': frame_data.frame_id,
-                    'face_rect': faces[0] if faces else None,
-                    'landmarks': landmarks.tolist(),
-                    'distances': distances,
-                    'angles': angles,
-                    'au_results': {
-                        k: {
-                            'au_number': v.au_number,
-                            'name': v.name,
-                            'detected': v.detected,
-                            'confidence': v.confidence,
-                            'intensity': v.intensity.value,
-                            'raw_score': v.raw_score,
-                            'asymmetry': v.asymmetry
-                        }
-                        for k, v in au_results.items()
-                    },
-                    'intensity_results': {
-                        k: {
-                            'au_number': v.au_number,
-                            'intensity': v.intensity.value,
-                            'confidence': v.confidence
-                        }
-                        for k, v in intensity_results.items()
-                    },
+                    'face_rect': face_rect,
+                    'landmarks_bytes': landmarks.astype(np.float32).tobytes(),
+                    'landmarks_shape': landmarks.shape,
+                    # AUごとの辞書ではなく1つの構造化配列で送る
+                    'au_results': _pack_au_results(au_results),
+                    'intensity_results': _pack_intensity_results(intensity_results),
                     'facs_code': facs_code,
                     'emotions': [
                         {
                             'emotion': e.emotion,
                             'confidence': e.confidence,
                             'valence': e.valence,
-                            'arousal': e.arousal
+                            'arousal': e.arousal,
+                            'matched_aus': e.matched_aus,
+                            'missing_aus': e.missing_aus,
+                            'description': e.description
                         }
                         for e in emotions
                     ],
                     'valence': valence,
                     'arousal': arousal
                 }
+                if self.send_features:
+                    result_dict['distances'] = distances
+                    result_dict['angles'] = angles
+                self._last_result = result_dict
             
             processing_time = (time.time() - start_time) * 1000
             
-            # 結果を出力キューに送信
-            try:
-                result_data = ResultData(
-                    frame_id=frame_data.frame_id,
-                    result_dict=result_dict,
-                    processing_time_ms=processing_time
-                )
-                self.output_queue.put(result_data, timeout=0.05)
-            except Full:
-                # キューがいっぱいの場合は古い結果を捨てる
-                try:
-                    self.output_queue.get_nowait()
-                    self.output_queue.put(result_data, timeout=0.05)
-                except:
-                    pass
+            # 最新結果のスロットを上書き（未読の古い結果は捨てられる）
+            self.result_slot.publish(ResultData(
+                frame_id=frame_data.frame_id,
+                result_dict=result_dict,
+                processing_time_ms=processing_time
+            ))
 
 
 def inference_worker_process(
     input_queue: mp.Queue,
-    output_queue: mp.Queue, 
+    result_slot: LatestResultSlot,
     stop_event: mp.Event,
     use_mediapipe: bool,
-    mode: str
+    mode: str,
+    send_features: bool = False,
+    buffer_names: Optional[List[str]] = None,
+    free_queue: Optional[mp.Queue] = None,
+    motion_threshold: float = 1.5
 ):
     """推論ワーカープロセスのエントリーポイント"""
     worker = InferenceWorker(
-        input_queue, output_queue, stop_event,
-        use_mediapipe, mode
+        input_queue, result_slot, stop_event,
+        use_mediapipe, mode, send_features,
+        buffer_names, free_queue, motion_threshold
     )
     worker.run()
 
@@ -229,19 +405,29 @@ class ParallelFACSProcessor:
         use_mediapipe: bool = True,
         mode: str = 'realtime',
         num_workers: int = 1,
-        queue_size: int = 4
+        queue_size: int = 4,
+        max_frame_size: Tuple[int, int] = (1920, 1080),
+        motion_threshold: float = 1.5
     ):
         self.use_mediapipe = use_mediapipe
         self.mode = mode
         self.num_workers = num_workers
         self.queue_size = queue_size
+        self.max_frame_size = max_frame_size
+        # 顔領域の平均輝度差がこの値未満なら前回の検出結果を再利用（0で無効）
+        # 再利用は連続フレームを同じワーカーが処理する num_workers == 1 の場合のみ
+        self.motion_threshold = motion_threshold
         
         # プロセス間通信用
         self._input_queue: Optional[mp.Queue] = None
-        self._output_queue: Optional[mp.Queue] = None
+        self._result_slot: Optional[LatestResultSlot] = None
         self._stop_event: Optional[mp.Event] = None
         self._workers: list = []
         
+        # フレーム転送用の共有メモリリング
+        self._buffers: List[SharedMemory] = []
+        self._free_queue: Optional[mp.Queue] = None
+        
         # 状態管理
         self._frame_counter = 0
         self._latest_result: Optional[Dict] = None
@@ -253,23 +439,39 @@ class ParallelFACSProcessor:
         # ビジュアライザー（メインプロセスで使用）
         self._visualizer = None
     
+    def _worker_motion_threshold(self) -> float:
+        """ワーカーに渡す動き判定の閾値（複数ワーカーではフレームが分散するため無効）"""
+        return self.motion_threshold if self.num_workers == 1 else 0.0
+    
     def start(self):
         """並列処理を開始"""
         # キューとイベントを作成
         self._input_queue = mp.Queue(maxsize=self.queue_size)
-        self._output_queue = mp.Queue(maxsize=self.queue_size)
+        self._result_slot = LatestResultSlot()
         self._stop_event = mp.Event()
         
+        # キュー内とワーカー処理中のフレーム数だけ共有メモリを確保
+        width, height = self.max_frame_size
+        self._free_queue = mp.Queue()
+        for i in range(self.queue_size + self.num_workers):
+            self._buffers.append(SharedMemory(create=True, size=width * height * 3))
+            self._free_queue.put(i)
+        buffer_names = [shm.name for shm in self._buffers]
+        
         # ワーカープロセスを起動
         for _ in range(self.num_workers):
             p = Process(
                 target=inference_worker_process,
                 args=(
                     self._input_queue,
-                    self._output_queue,
+                    self._result_slot,
                     self._stop_event,
                     self.use_mediapipe,
-                    self.mode
+                    self.mode,
+                    False,
+                    buffer_names,
+                    self._free_queue,
+                    self._worker_motion_threshold()
                 )
             )
             p.daemon = True
@@ -299,8 +501,17 @@ class ParallelFACSProcessor:
         # キューをクリーンアップ
         if self._input_queue:
             self._input_queue.close()
-        if self._output_queue:
-            self._output_queue.close()
+        if self._result_slot:
+            self._result_slot.close(unlink=True)
+            self._result_slot = None
+        if self._free_queue:
+            self._free_queue.close()
+        
+        # 共有メモリを解放
+        for shm in self._buffers:
+            shm.close()
+            shm.unlink()
+        self._buffers.clear()
         
         print("[ParallelFACS] Stopped")
     
@@ -317,33 +528,63 @@ class ParallelFACSProcessor:
         self._frame_counter += 1
         frame_data = FrameData(
             frame_id=self._frame_counter,
-            image=image.copy(),
             timestamp=time.time()
         )
         
+        buffer_index = self._acquire_buffer(image)
+        if buffer_index >= 0:
+            # 共有メモリへ1回コピーし、キューにはバッファ番号のみを載せる
+            shm = self._buffers[buffer_index]
+            np.copyto(np.ndarray(image.shape, dtype=np.uint8, buffer=shm.buf), image)
+            frame_data.buffer_index = buffer_index
+            frame_data.shape = image.shape
+        else:
+            # 共有メモリに載らない画像のみ、呼び出し側の変更から守るためコピーして送る
+            frame_data.image = image.copy()
+        
         try:
             self._input_queue.put(frame_data, timeout=0.01)
         except Full:
             # キューがいっぱいの場合は古いフレームを捨てる
             try:
-                self._input_queue.get_nowait()
+                self._release_frame(self._input_queue.get_nowait())
                 self._input_queue.put(frame_data, timeout=0.01)
             except:
-                pass
+                self._release_frame(frame_data)
         
         return self._frame_counter
     
-    def get_latest_result(self) -> Optional[Dict]:
-        """最新の分析結果を取得（ノンブロッキング）"""
-        # 新しい結果があれば取得
+    def _acquire_buffer(self, image: np.ndarray) -> int:
+        """空き共有メモリバッファの番号を取得（使えない場合は-1）"""
+        if image.dtype != np.uint8 or not self._buffers or image.nbytes > self._buffers[0].size:
+            return -1
+        try:
+            return self._free_queue.get_nowait()
+        except Empty:
+            pass
+        # 空きがなければ未処理の古いフレームを捨ててそのバッファを使う
+        # （画像をpickleで送るより新しいフレームを共有メモリに載せる方が安い）
         while True:
             try:
-                result_data = self._output_queue.get_nowait()
-                with self._result_lock:
-                    self._latest_result = result_data.result_dict
-                    self._latest_result['processing_time_ms'] = result_data.processing_time_ms
+                stale = self._input_queue.get_nowait()
             except Empty:
-                break
+                return -1
+            if stale.buffer_index >= 0:
+                return stale.buffer_index
+    
+    def _release_frame(self, frame_data: FrameData):
+        """送信されなかったフレームのバッファを返却"""
+        if frame_data.buffer_index >= 0:
+            self._free_queue.put(frame_data.buffer_index)
+    
+    def get_latest_result(self) -> Optional[Dict]:
+        """最新の分析結果を取得（ノンブロッキング）"""
+        # 新しい結果があれば取得
+        result_data = self._result_slot.read()
+        if result_data is not None:
+            with self._result_lock:
+                self._latest_result = result_data.result_dict
+                self._latest_result['processing_time_ms'] = result_data.processing_time_ms
         
         with self._result_lock:
             return self._latest_result
@@ -393,8 +634,12 @@ class ParallelFACSProcessor:
         )
         from ..core.enums import AUIntensity
         
+        intensity_of = {m.value: m for m in AUIntensity}.__getitem__
+        
         # ランドマークを復元
-        landmarks = np.array(result_dict['landmarks'])
+        landmarks = np.frombuffer(
+            result_dict['landmarks_bytes'], dtype=np.float32
+        ).reshape(result_dict['landmarks_shape'])
         
         # FaceDataを再構築
         face_data = FaceData(
@@ -404,27 +649,25 @@ class ParallelFACSProcessor:
             angles=result_dict.get('angles', {})
         )
         
-        # AU結果を再構築
+        # AU結果を再構築（tolist() で全レコードを一括でPythonのタプルに変換）
         au_results = {}
-        for k, v in result_dict.get('au_results', {}).items():
-            au_results[int(k)] = AUDetectionResult(
-                au_number=v['au_number'],
-                name=v['name'],
-                detected=v['detected'],
-                confidence=v['confidence'],
-                intensity=AUIntensity(v['intensity']),
-                raw_score=v['raw_score'],
-                asymmetry=v['asymmetry']
-            )
+        records = result_dict.get('au_results')
+        if records is not None:
+            for au, detected, conf, level, raw, asym in records.tolist():
+                name = AU_DEFINITIONS[au].name if au in AU_DEFINITIONS else f"AU{au}"
+                au_results[au] = AUDetectionResult(
+                    au, name, detected, conf, intensity_of(level), raw, asym
+                )
         
         # 強度結果を再構築
         intensity_results = {}
-        for k, v in result_dict.get('intensity_results', {}).items():
-            intensity_results[int(k)] = IntensityResult(
-                au_number=v['au_number'],
-                intensity=AUIntensity(v['intensity']),
-                confidence=v['confidence']
-            )
+        records = result_dict.get('intensity_results')
+        if records is not None:
+            for au, level, value, conf in records.tolist():
+                intensity = intensity_of(level)
+                intensity_results[au] = IntensityResult(
+                    au, intensity, value, intensity.label, conf
+                )
         
         # 感情結果を再構築
         emotions = [
@@ -432,7 +675,10 @@ class ParallelFACSProcessor:
                 emotion=e['emotion'],
                 confidence=e['confidence'],
                 valence=e['valence'],
-                arousal=e['arousal']
+                arousal=e['arousal'],
+                matched_aus=e.get('matched_aus', []),
+                missing_aus=e.get('missing_aus', []),
+                description=e.get('description', '')
             )
             for e in result_dict.get('emotions', [])
         ]
@@ -464,14 +710,12 @@ class FPSCounter:
     
     def __init__(self, window_size: int = 30):
         self.window_size = window_size
-        self.timestamps: list = []
+        # 上限を超えると古いものから自動で捨てられる
+        self.timestamps: deque = deque(maxlen=window_size)
     
     def update(self):
         """タイムスタンプを記録"""
-        now = time.time()
-        self.timestamps.append(now)
-        if len(self.timestamps) > self.window_size:
-            self.timestamps.pop(0)
+        self.timestamps.append(time.time())
     
     def get_fps(self) -> float:
         """現在のFPSを計算"""
@@ -1,10 +1,21 @@
 """
 ターミナル表示
 """
-from typing import Dict, Optional
+import sys
+from typing import Dict, List, Optional
 from .models import AnalysisResult, AUDetectionResult, IntensityResult
 from ..config import AU_DEFINITIONS
 
+# 感情バー（長さ20）を塗りつぶし量ごとに事前生成
+BARS_20 = tuple("█" * i + "░" * (20 - i) for i in range(21))
+
+# ヘッダーの区切り線（既定幅）
+_SEP = "=" * 60
+
+# 行ごとの書式。f文字列より % 書式の方が1行あたりの組み立てが速い
+_EMOTION_LINE = "  %-12s %s %.2f"
+_AU_LINE = "  AU%2d%-3s %-25s %.2f"
+
 
 class TerminalDisplay:
     """ターミナル用表示クラス"""
@@ -18,45 +29,85 @@ class TerminalDisplay:
     def __init__(self, use_colors: bool = True):
         self.use_colors = use_colors
     
+    @property
+    def use_colors(self) -> bool:
+        return self._use_colors
+    
+    @use_colors.setter
+    def use_colors(self, value: bool):
+        self._use_colors = value
+        self._reset = self.COLORS['reset']
+        # 毎回同じ装飾になる固定文字列はここで一度だけ組み立てる
+        self._no_face = self._c("顔が検出されませんでした", 'red')
+        self._facs_label = self._c('FACSコード:', 'bold')
+        self._time_label = self._c('処理時間:', 'dim')
+        self._emotion_heading = f"\n{self._c('【感情】', 'bold')}"
+        self._au_heading = f"\n{self._c('【検出AU】', 'bold')}"
+        self._legend = [
+            f"\n{self._c('【強度スケール】', 'bold')}",
+            f"  {self._c('[A]', 'green')} Trace    {self._c('[B]', 'cyan')} Slight",
+            f"  {self._c('[C]', 'yellow')} Marked   {self._c('[D]', 'magenta')} Severe",
+            f"  {self._c('[E]', 'red')} Maximum",
+        ]
+        self._legend_text = "\n".join(self._legend) + "\n"
+        self._emotion_bars = {
+            color: tuple(self._c(bar, color) for bar in BARS_20)
+            for color in ('green', 'red', 'yellow')
+        }
+    
     def _c(self, text: str, color: str) -> str:
-        if not self.use_colors:
+        if not self._use_colors:
             return text
-        return f"{self.COLORS.get(color, '')}{text}{self.COLORS['reset']}"
+        return f"{self.COLORS.get(color, '')}{text}{self._reset}"
+    
+    @staticmethod
+    def _emit(lines: List[str]):
+        """行をまとめて1回で書き出す（行ごとのprintより書き込み回数が少ない）"""
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
     
     def print_header(self, title: str, width: int = 60):
-        print("\n" + "=" * width)
-        print(f"{title:^{width}}")
-        print("=" * width)
+        self._emit(self.format_header(title, width))
+    
+    def format_header(self, title: str, width: int = 60) -> List[str]:
+        sep = _SEP if width == 60 else "=" * width
+        return ["\n" + sep, f"{title:^{width}}", sep]
     
     def print_full_analysis(self, result: AnalysisResult, show_au_details: bool = True):
+        self._emit(self.format_full_analysis(result, show_au_details))
+    
+    def format_full_analysis(self, result: AnalysisResult, show_au_details: bool = True) -> List[str]:
         if not result.is_valid:
-            print(self._c("顔が検出されませんでした", 'red'))
-            return
+            return [self._no_face]
         
-        print(f"\n{self._c('FACSコード:', 'bold')} {self._c(result.facs_code, 'cyan')}")
-        print(f"{self._c('処理時間:', 'dim')} {result.processing_time_ms:.1f}ms")
-        
-        print(f"\n{self._c('【感情】', 'bold')}")
+        lines = [
+            f"\n{self._facs_label} {self._c(result.facs_code, 'cyan')}",
+            f"{self._time_label} {result.processing_time_ms:.1f}ms",
+            self._emotion_heading,
+        ]
         for e in result.emotions[:5]:
             if e.confidence < 0.1:
                 continue
-            bar = "█" * int(e.confidence * 20) + "░" * (20 - int(e.confidence * 20))
             color = 'green' if e.valence > 0 else 'red' if e.valence < 0 else 'yellow'
-            print(f"  {e.emotion:12s} {self._c(bar, color)} {e.confidence:.2f}")
+            bar = self._emotion_bars[color][int(e.confidence * 20)]
+            lines.append(_EMOTION_LINE % (e.emotion, bar, e.confidence))
         
         if result.dominant_emotion:
-            print(f"\n  主要感情: {self._c(result.dominant_emotion.emotion, 'cyan')}")
-            print(f"  V: {result.valence:+.2f} | A: {result.arousal:+.2f}")
+            lines.append(f"\n  主要感情: {self._c(result.dominant_emotion.emotion, 'cyan')}")
+            lines.append(f"  V: {result.valence:+.2f} | A: {result.arousal:+.2f}")
         
         if show_au_details and result.active_aus:
-            print(f"\n{self._c('【検出AU】', 'bold')}")
+            lines.append(self._au_heading)
             for au in result.active_aus[:10]:
                 intensity = result.intensity_results.get(au.au_number)
                 label = f"[{intensity.intensity_label}]" if intensity else ""
-                print(f"  AU{au.au_number:2d}{label:3s} {au.name:25s} {au.confidence:.2f}")
+                lines.append(_AU_LINE % (au.au_number, label, au.name, au.confidence))
+        return lines
     
     def print_au_legend(self):
-        print(f"\n{self._c('【強度スケール】', 'bold')}")
-        print(f"  {self._c('[A]', 'green')} Trace    {self._c('[B]', 'cyan')} Slight")
-        print(f"  {self._c('[C]', 'yellow')} Marked   {self._c('[D]', 'magenta')} Severe")
-        print(f"  {self._c('[E]', 'red')} Maximum")
+        # 凡例は固定文字列なので、組み立て済みのテキストをそのまま書き出す
+        sys.stdout.write(self._legend_text)
+        sys.stdout.flush()
+    
+    def format_au_legend(self) -> List[str]:
+        return list(self._legend)
@@ -1,14 +1,52 @@
 """検出器モジュール"""
-from .landmark_detector import LandmarkDetectorFactory, MediaPipeLandmarkDetector, DlibLandmarkDetector
+from typing import TYPE_CHECKING
+import importlib
+
 from .feature_extractor import FeatureExtractor
 from .au_detector import AUDetector
-from .face_aligner import FaceAligner, FaceAlignment
 from .vectorized_au_detector import VectorizedAUDetector, BatchVectorizedAUDetector
 from .optimized_feature_extractor import OptimizedFeatureExtractor, BatchFeatureExtractor
 
+# 公開名 -> 定義元モジュール
+# cv2 / mediapipe / deepface を読み込むモジュールは、属性への初回アクセス時に読み込む (PEP 562)
+_LAZY_ATTRS = {
+    "LandmarkDetectorFactory": ".landmark_detector",
+    "MediaPipeLandmarkDetector": ".landmark_detector",
+    "DlibLandmarkDetector": ".landmark_detector",
+    "FaceAligner": ".face_aligner",
+    "FaceAlignment": ".face_aligner",
+    "DeepFaceAnalyzer": ".deepface_detector",
+    "DeepFaceLandmarkConverter": ".deepface_detector",
+    "visualize_landmarks_debug": ".debug_landmarks",
+    "compare_mediapipe_dlib": ".debug_landmarks",
+    "test_landmark_mapping": ".debug_landmarks",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
+
+if TYPE_CHECKING:
+    from .landmark_detector import LandmarkDetectorFactory, MediaPipeLandmarkDetector, DlibLandmarkDetector
+    from .face_aligner import FaceAligner, FaceAlignment
+    from .deepface_detector import DeepFaceAnalyzer, DeepFaceLandmarkConverter
+    from .debug_landmarks import visualize_landmarks_debug, compare_mediapipe_dlib, test_landmark_mapping
+
 __all__ = [
     "LandmarkDetectorFactory", "MediaPipeLandmarkDetector", "DlibLandmarkDetector",
     "FeatureExtractor", "AUDetector", "FaceAligner", "FaceAlignment",
     "VectorizedAUDetector", "BatchVectorizedAUDetector",
     "OptimizedFeatureExtractor", "BatchFeatureExtractor",
+    "DeepFaceAnalyzer", "DeepFaceLandmarkConverter",
+    "visualize_landmarks_debug", "compare_mediapipe_dlib", "test_landmark_mapping",
 ]
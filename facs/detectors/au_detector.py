@@ -1,16 +1,43 @@
+import math
+from bisect import bisect_right
 import numpy as np
 from typing import Dict, Tuple
 from ..core.interfaces import IAUDetector, IAUDetectionStrategy
-from ..core.models import AUDetectionResult
+from ..core.models import AUDetectionResult, FeatureVector
 from ..core.enums import AUIntensity
 from ..config import AU_DEFINITIONS
 
+
+def _clip01(x: float) -> float:
+    return 0.0 if x < 0.0 else 1.0 if x > 1.0 else x
+
+
+def _clip11(x: float) -> float:
+    return -1.0 if x < -1.0 else 1.0 if x > 1.0 else x
+
+
+# 強度の段階（AUIntensity.value 順）
+_INTENSITY_LEVELS = tuple(AUIntensity)
+
+
+def _intensity_bins(low: float, high: float) -> Tuple[float, ...]:
+    """強度の境界値。スコア以下の境界の個数がそのまま強度の段階になる"""
+    return (low * 0.5, low, high * 0.66, high, high * 1.3)
+
+
 class AUDetector(IAUDetector):
     """Action Unit検出器"""
     
     def __init__(self):
         self._strategies: Dict[int, IAUDetectionStrategy] = {}
-        self._thresholds = {au: {"low": 0.15, "high": 0.4} for au in AU_DEFINITIONS.keys()}
+        # AUの並び順ごとの並列テーブル（フレームごとの辞書引きを避ける）
+        self._au_order = tuple(AU_DEFINITIONS.keys())
+        self._au_names = tuple(AU_DEFINITIONS[au].name for au in self._au_order)
+        self._lows = tuple(0.15 for _ in self._au_order)
+        self._highs = tuple(0.4 for _ in self._au_order)
+        self._intensity_bins = tuple(
+            _intensity_bins(low, high) for low, high in zip(self._lows, self._highs)
+        )
     
     def register_strategy(self, strategy: IAUDetectionStrategy) -> None:
         self._strategies[strategy.au_number] = strategy
@@ -18,94 +45,89 @@ class AUDetector(IAUDetector):
     def detect_all(self, landmarks: np.ndarray, distances: Dict[str, float],
                    angles: Dict[str, float]) -> Dict[int, AUDetectionResult]:
         results = {}
-        eye_dist = max(distances.get("eye_distance", 1.0), 1e-6)
+        feats = FeatureVector.from_distances(distances)
+        eye_dist = feats.eye_distance
+        
+        # 戦略が未登録のAUは組み込みの計算を1回でまとめて行う
+        builtin = None
+        if any(au_num not in self._strategies for au_num in AU_DEFINITIONS):
+            builtin = self._detect_builtin_all(landmarks, feats, eye_dist)
         
-        for au_num, au_def in AU_DEFINITIONS.items():
-            if au_num in self._strategies:
-                raw_score, asymmetry = self._strategies[au_num].detect(landmarks, distances, angles, eye_dist)
+        strategies = self._strategies
+        for au_num, name, low, high, bins in zip(
+            self._au_order, self._au_names, self._lows, self._highs, self._intensity_bins
+        ):
+            strategy = strategies.get(au_num)
+            if strategy is not None:
+                raw_score, asymmetry = strategy.detect(landmarks, feats, angles, eye_dist)
             else:
-                raw_score, asymmetry = self._detect_builtin(au_num, landmarks, distances, angles, eye_dist)
+                raw_score, asymmetry = builtin.get(au_num, (0.0, 0.0))
             
-            thresholds = self._thresholds.get(au_num, {"low": 0.15, "high": 0.4})
-            detected = raw_score >= thresholds["low"]
-            confidence = min(raw_score / thresholds["high"], 1.0) if raw_score > 0 else 0.0
-            intensity = self._score_to_intensity(raw_score, thresholds)
+            detected = raw_score >= low
+            confidence = min(raw_score / high, 1.0) if raw_score > 0 else 0.0
+            # if/elif の連鎖ではなく境界値の二分探索で強度を決める
+            intensity = _INTENSITY_LEVELS[bisect_right(bins, raw_score)]
             
+            # フィールド順の位置引数で生成（キーワード引数の照合を省く）
             results[au_num] = AUDetectionResult(
-                au_number=au_num, name=au_def.name, detected=detected,
-                confidence=confidence, intensity=intensity, raw_score=raw_score, asymmetry=asymmetry
+                au_num, name, detected, confidence, intensity, raw_score, asymmetry
             )
         
         return results
     
-    def _score_to_intensity(self, score: float, thresholds: Dict) -> AUIntensity:
-        if score < thresholds["low"] * 0.5: return AUIntensity.ABSENT
-        elif score < thresholds["low"]: return AUIntensity.TRACE
-        elif score < thresholds["high"] * 0.66: return AUIntensity.SLIGHT
-        elif score < thresholds["high"]: return AUIntensity.MARKED
-        elif score < thresholds["high"] * 1.3: return AUIntensity.SEVERE
-        return AUIntensity.MAXIMUM
-    
-    def _detect_builtin(self, au_num: int, landmarks: np.ndarray, distances: Dict, angles: Dict, eye_dist: float) -> Tuple[float, float]:
-        if au_num == 1: return self._detect_au1(landmarks, distances, eye_dist)
-        elif au_num == 2: return self._detect_au2(landmarks, distances, eye_dist)
-        elif au_num == 4: return self._detect_au4(landmarks, distances, eye_dist)
-        elif au_num == 5: return self._detect_au5(distances)
-        elif au_num == 6: return self._detect_au6(landmarks, eye_dist)
-        elif au_num == 7: return self._detect_au7(distances)
-        elif au_num == 12: return self._detect_au12(landmarks, distances, eye_dist)
-        elif au_num == 25: return self._detect_au25(distances, eye_dist)
-        elif au_num == 26: return self._detect_au26(distances, eye_dist)
-        elif au_num == 43: return self._detect_au43(distances)
-        return 0.0, 0.0
-    
-    def _detect_au1(self, landmarks, distances, eye_dist):
-        right_dist = (landmarks[27][1] - landmarks[21][1]) / eye_dist
-        left_dist = (landmarks[27][1] - landmarks[22][1]) / eye_dist
-        score = max(0, ((right_dist + left_dist) / 2 - 0.18) / 0.12)
-        return min(score, 1.0), np.clip(left_dist - right_dist, -1.0, 1.0)
-    
-    def _detect_au2(self, landmarks, distances, eye_dist):
-        right_dist = (landmarks[36][1] - landmarks[17][1]) / eye_dist
-        left_dist = (landmarks[45][1] - landmarks[26][1]) / eye_dist
-        score = max(0, ((right_dist + left_dist) / 2 - 0.15) / 0.1)
-        return min(score, 1.0), np.clip(left_dist - right_dist, -1.0, 1.0)
+    # 組み込みAUの (基準値, 1/スケール)。スコアは clip((値 - 基準値) / スケール, 0, 1)
+    # （AU4/6/7/43 は値が基準値を下回るほど強い）。カーネル内では除算せず乗算する
+    BUILTIN_SCORE_CONSTS = {
+        "au1": (0.18, 1 / 0.12), "au2": (0.15, 1 / 0.1), "au4": (0.35, 1 / 0.12),
+        "au5": (0.28, 1 / 0.12), "au6": (0.75, 1 / 0.18), "au7": (0.25, 1 / 0.1),
+        "au12_elevation": (0.02, 1 / 0.06), "au12_width": (0.48, 1 / 0.1),
+        "au25": (0.02, 1 / 0.08), "au26": (0.05, 1 / 0.12), "au43": (0.2, 1 / 0.15),
+    }
     
-    def _detect_au4(self, landmarks, distances, eye_dist):
-        brow_dist = distances.get("brow_distance", eye_dist * 0.3) / eye_dist
-        return min(max(0, (0.35 - brow_dist) / 0.12), 1.0), 0.0
-    
-    def _detect_au5(self, distances):
-        ear = (distances.get("right_eye_aspect_ratio", 0.25) + distances.get("left_eye_aspect_ratio", 0.25)) / 2
-        return min(max(0, (ear - 0.28) / 0.12), 1.0), 0.0
-    
-    def _detect_au6(self, landmarks, eye_dist):
-        right_eye_bottom = (landmarks[40] + landmarks[41]) / 2
-        left_eye_bottom = (landmarks[46] + landmarks[47]) / 2
-        right_dist = np.linalg.norm(right_eye_bottom - landmarks[48]) / eye_dist
-        left_dist = np.linalg.norm(left_eye_bottom - landmarks[54]) / eye_dist
-        score = max(0, (0.75 - (right_dist + left_dist) / 2) / 0.18)
-        return min(score, 1.0), np.clip(left_dist - right_dist, -1.0, 1.0)
-    
-    def _detect_au7(self, distances):
-        ear = (distances.get("right_eye_aspect_ratio", 0.25) + distances.get("left_eye_aspect_ratio", 0.25)) / 2
-        return min(max(0, (0.25 - ear) / 0.1), 1.0), 0.0
-    
-    def _detect_au12(self, landmarks, distances, eye_dist):
-        right_elev = (landmarks[51][1] - landmarks[48][1]) / eye_dist
-        left_elev = (landmarks[51][1] - landmarks[54][1]) / eye_dist
-        mouth_width = distances.get("mouth_width", eye_dist * 0.5) / eye_dist
-        score = max(0, ((right_elev + left_elev) / 2 - 0.02) / 0.06) * 0.7 + max(0, (mouth_width - 0.48) / 0.1) * 0.3
-        return min(score, 1.0), np.clip(left_elev - right_elev, -1.0, 1.0)
-    
-    def _detect_au25(self, distances, eye_dist):
-        mouth_height = distances.get("mouth_height_inner", 0) / eye_dist
-        return min(max(0, (mouth_height - 0.02) / 0.08), 1.0), 0.0
-    
-    def _detect_au26(self, distances, eye_dist):
-        mouth_height = distances.get("mouth_height_outer", 0) / eye_dist
-        return min(max(0, (mouth_height - 0.05) / 0.12), 1.0), 0.0
-    
-    def _detect_au43(self, distances):
-        ear = (distances.get("right_eye_aspect_ratio", 0.25) + distances.get("left_eye_aspect_ratio", 0.25)) / 2
-        return min(max(0, (0.2 - ear) / 0.15), 1.0), 0.0
+    def _detect_builtin_all(self, landmarks: np.ndarray, feats: FeatureVector,
+                            eye_dist: float) -> Dict[int, Tuple[float, float]]:
+        """組み込みAUの (スコア, 非対称度) を一括計算
+        
+        ランドマークは一度だけPythonのfloatに展開する（NumPyスカラーの
+        要素アクセスと演算はAUごとに繰り返すと割高なため）。
+        """
+        c = self.BUILTIN_SCORE_CONSTS
+        (b1, k1), (b2, k2), (b4, k4) = c["au1"], c["au2"], c["au4"]
+        (b5, k5), (b6, k6), (b7, k7) = c["au5"], c["au6"], c["au7"]
+        (b12e, k12e), (b12w, k12w) = c["au12_elevation"], c["au12_width"]
+        (b25, k25), (b26, k26), (b43, k43) = c["au25"], c["au26"], c["au43"]
+        
+        lm = landmarks.tolist()
+        inv_eye = 1.0 / eye_dist
+        ear = (feats.right_eye_aspect_ratio + feats.left_eye_aspect_ratio) * 0.5
+        
+        # AU1/AU2: 眉の上がり
+        right_au1 = (lm[27][1] - lm[21][1]) * inv_eye
+        left_au1 = (lm[27][1] - lm[22][1]) * inv_eye
+        right_au2 = (lm[36][1] - lm[17][1]) * inv_eye
+        left_au2 = (lm[45][1] - lm[26][1]) * inv_eye
+        
+        # AU6: 目の下端から口角までの距離
+        right_au6 = math.hypot((lm[40][0] + lm[41][0]) * 0.5 - lm[48][0],
+                               (lm[40][1] + lm[41][1]) * 0.5 - lm[48][1]) * inv_eye
+        left_au6 = math.hypot((lm[46][0] + lm[47][0]) * 0.5 - lm[54][0],
+                              (lm[46][1] + lm[47][1]) * 0.5 - lm[54][1]) * inv_eye
+        
+        # AU12: 口角の持ち上がりと口幅
+        right_elev = (lm[51][1] - lm[48][1]) * inv_eye
+        left_elev = (lm[51][1] - lm[54][1]) * inv_eye
+        au12 = (max(0.0, ((right_elev + left_elev) * 0.5 - b12e) * k12e) * 0.7
+                + max(0.0, (feats.mouth_width * inv_eye - b12w) * k12w) * 0.3)
+        
+        return {
+            1: (_clip01(((right_au1 + left_au1) * 0.5 - b1) * k1), _clip11(left_au1 - right_au1)),
+            2: (_clip01(((right_au2 + left_au2) * 0.5 - b2) * k2), _clip11(left_au2 - right_au2)),
+            4: (_clip01((b4 - feats.brow_distance * inv_eye) * k4), 0.0),
+            5: (_clip01((ear - b5) * k5), 0.0),
+            6: (_clip01((b6 - (right_au6 + left_au6) * 0.5) * k6), _clip11(left_au6 - right_au6)),
+            7: (_clip01((b7 - ear) * k7), 0.0),
+            12: (min(au12, 1.0), _clip11(left_elev - right_elev)),
+            25: (_clip01((feats.mouth_height_inner * inv_eye - b25) * k25), 0.0),
+            26: (_clip01((feats.mouth_height_outer * inv_eye - b26) * k26), 0.0),
+            43: (_clip01((b43 - ear) * k43), 0.0),
+        }
@@ -3,9 +3,51 @@
 68点のランドマークが正しく配置されているか確認する
 """
 import numpy as np
-import cv2
 from typing import Optional
 
+# 領域ごとの色定義
+REGION_COLORS = {
+    'jaw': (255, 255, 0),        # シアン - 顎ライン
+    'right_eyebrow': (0, 255, 0), # 緑 - 右眉
+    'left_eyebrow': (0, 255, 0),  # 緑 - 左眉
+    'nose_bridge': (255, 0, 255), # マゼンタ - 鼻筋
+    'nose_tip': (255, 0, 255),    # マゼンタ - 鼻先
+    'right_eye': (255, 0, 0),     # 青 - 右目
+    'left_eye': (255, 0, 0),      # 青 - 左目
+    'outer_lip': (0, 0, 255),     # 赤 - 外側唇
+    'inner_lip': (0, 165, 255),   # オレンジ - 内側唇
+}
+
+# 領域定義 (開始, 終了, 閉じるか)
+REGIONS = {
+    'jaw': (0, 17, False),
+    'right_eyebrow': (17, 22, False),
+    'left_eyebrow': (22, 27, False),
+    'nose_bridge': (27, 31, False),
+    'nose_tip': (31, 36, False),
+    'right_eye': (36, 42, True),
+    'left_eye': (42, 48, True),
+    'outer_lip': (48, 60, True),
+    'inner_lip': (60, 68, True),
+}
+
+# (開始, 終了, 閉じるか, 色)
+REGION_POINT_RANGES = [
+    (start, end, closed, REGION_COLORS.get(name, (255, 255, 255)))
+    for name, (start, end, closed) in REGIONS.items()
+]
+
+# 色と開閉が同じ領域をまとめたもの。cv2.polylines は1回の呼び出しで複数の線を描ける
+_POLYLINE_GROUPS = {}
+for _start, _end, _closed, _color in REGION_POINT_RANGES:
+    _POLYLINE_GROUPS.setdefault((_color, _closed), []).append((_start, _end))
+_POLYLINE_GROUPS = [(color, closed, ranges) for (color, closed), ranges in _POLYLINE_GROUPS.items()]
+del _start, _end, _closed, _color
+
+# ランドマーク番号ごとの描画色
+_POINT_COLORS = [color for start, end, _, color in REGION_POINT_RANGES for _ in range(start, end)]
+
+
 def visualize_landmarks_debug(image: np.ndarray, landmarks: np.ndarray, 
                                show_numbers: bool = True,
                                show_regions: bool = True) -> np.ndarray:
@@ -18,70 +60,83 @@ def visualize_landmarks_debug(image: np.ndarray, landmarks: np.ndarray,
         show_numbers: ランドマーク番号を表示するか
         show_regions: 領域ごとに色分けするか
     """
+    # cv2 の読み込みは重いため、デバッグ描画を実際に行うときまで遅らせる
+    import cv2
     output = image.copy()
-    
-    # 領域ごとの色定義
-    region_colors = {
-        'jaw': (255, 255, 0),        # シアン - 顎ライン
-        'right_eyebrow': (0, 255, 0), # 緑 - 右眉
-        'left_eyebrow': (0, 255, 0),  # 緑 - 左眉
-        'nose_bridge': (255, 0, 255), # マゼンタ - 鼻筋
-        'nose_tip': (255, 0, 255),    # マゼンタ - 鼻先
-        'right_eye': (255, 0, 0),     # 青 - 右目
-        'left_eye': (255, 0, 0),      # 青 - 左目
-        'outer_lip': (0, 0, 255),     # 赤 - 外側唇
-        'inner_lip': (0, 165, 255),   # オレンジ - 内側唇
-    }
-    
-    # 領域定義
-    regions = {
-        'jaw': (0, 17, False),
-        'right_eyebrow': (17, 22, False),
-        'left_eyebrow': (22, 27, False),
-        'nose_bridge': (27, 31, False),
-        'nose_tip': (31, 36, False),
-        'right_eye': (36, 42, True),
-        'left_eye': (42, 48, True),
-        'outer_lip': (48, 60, True),
-        'inner_lip': (60, 68, True),
-    }
-    
-    # 各領域を描画
-    for region_name, (start, end, closed) in regions.items():
-        color = region_colors.get(region_name, (255, 255, 255))
-        pts = landmarks[start:end].astype(np.int32)
-        
-        if show_regions:
-            # ポリラインを描画
-            cv2.polylines(output, [pts.reshape((-1, 1, 2))], closed, color, 2)
-        
-        # 各点を描画
-        for i, (x, y) in enumerate(pts):
-            global_idx = start + i
-            cv2.circle(output, (int(x), int(y)), 3, color, -1)
-            cv2.circle(output, (int(x), int(y)), 4, (255, 255, 255), 1)
-            
-            if show_numbers:
-                # 番号を表示
-                cv2.putText(output, str(global_idx), (int(x) + 5, int(y) - 5),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.3, (255, 255, 255), 1)
+    pts = landmarks.astype(np.int32)
+    
+    if show_regions:
+        # ポリラインを色ごとにまとめて描画
+        for color, closed, ranges in _POLYLINE_GROUPS:
+            cv2.polylines(output, [pts[s:e].reshape((-1, 1, 2)) for s, e in ranges],
+                          closed, color, 2)
+    
+    # 各点を描画（cv2.circle に一括版はないので、座標は一度にPythonの整数へ変換しておく）
+    # 番号も点と同じ範囲（色が定義された68点）に揃える
+    point_list = pts[:len(_POINT_COLORS)].tolist()
+    for (x, y), color in zip(point_list, _POINT_COLORS):
+        cv2.circle(output, (x, y), 3, color, -1)
+        cv2.circle(output, (x, y), 4, (255, 255, 255), 1)
+    
+    if show_numbers:
+        # 番号を表示
+        for global_idx, (x, y) in enumerate(point_list):
+            cv2.putText(output, str(global_idx), (x + 5, y - 5),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.3, (255, 255, 255), 1)
     
     # 凡例を追加
-    legend_y = 30
-    for region_name, color in region_colors.items():
-        cv2.rectangle(output, (10, legend_y - 12), (25, legend_y), color, -1)
-        cv2.putText(output, region_name, (30, legend_y),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
-        legend_y += 18
+    _blit_legend(output)
     
     return output
 
 
+def _draw_legend(image: np.ndarray, color_override: Optional[tuple] = None) -> None:
+    """凡例を描画する（color_override 指定時は全要素をその色で描く）"""
+    import cv2
+    legend_y = 30
+    for region_name, color in REGION_COLORS.items():
+        cv2.rectangle(image, (10, legend_y - 12), (25, legend_y), color_override or color, -1)
+        cv2.putText(image, region_name, (30, legend_y),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.4, color_override or (255, 255, 255), 1)
+        legend_y += 18
+
+
+# 凡例のスプライト (画像, マスク)。凡例はフレームによらず同じなので一度だけ描画する
+_LEGEND_CACHE: dict = {}
+
+
+def _legend_sprite():
+    sprite = _LEGEND_CACHE.get("sprite")
+    if sprite is None:
+        canvas = np.zeros((220, 200, 3), dtype=np.uint8)
+        mask = np.zeros((220, 200), dtype=np.uint8)
+        _draw_legend(canvas)
+        _draw_legend(mask, (255,))
+        ys, xs = np.nonzero(mask)
+        h, w = int(ys.max()) + 1, int(xs.max()) + 1
+        sprite = _LEGEND_CACHE["sprite"] = (canvas[:h, :w].copy(), mask[:h, :w].copy())
+    return sprite
+
+
+def _blit_legend(output: np.ndarray) -> None:
+    """キャッシュした凡例をマスク付きで画像の左上へ書き込む"""
+    import cv2
+    if output.ndim != 3 or output.shape[2] != 3 or output.dtype != np.uint8:
+        _draw_legend(output)
+        return
+    sprite, mask = _legend_sprite()
+    h = min(sprite.shape[0], output.shape[0])
+    w = min(sprite.shape[1], output.shape[1])
+    # ROI はビューなので cv2.copyTo の書き込みがそのまま output に反映される
+    cv2.copyTo(sprite[:h, :w], mask[:h, :w], output[:h, :w])
+
+
 def compare_mediapipe_dlib(image: np.ndarray, mp_landmarks: np.ndarray, 
                            dlib_landmarks: Optional[np.ndarray] = None) -> np.ndarray:
     """
     MediaPipeとdlibのランドマークを比較
     """
+    import cv2
     output = image.copy()
     
     # MediaPipeのランドマーク（緑）
@@ -2,12 +2,20 @@
 DeepFaceライブラリを使用した顔分析
 DeepFace v0.0.89+ 対応
 """
+import hashlib
+import math
+import operator
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import cv2
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Hashable, List, Tuple, Optional
 from dataclasses import dataclass
+from ..core.models import _DATACLASS_SLOTS
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class DeepFaceResult:
     """DeepFace分析結果"""
     face_rect: Tuple[int, int, int, int]
@@ -21,6 +29,10 @@ class DeepFaceResult:
     yaw: float = 0.0
     pitch: float = 0.0
 
+# DeepFace の region 辞書から (x, y, w, h) を取り出す
+_REGION_FIELDS = operator.itemgetter('x', 'y', 'w', 'h')
+
+
 class DeepFaceAnalyzer:
     """DeepFaceを使用した顔分析（v0.0.89+対応）"""
     
@@ -29,12 +41,44 @@ class DeepFaceAnalyzer:
     
     def __init__(self, 
                  detector_backend: str = 'retinaface',
-                 enforce_detection: bool = False):
+                 enforce_detection: bool = False,
+                 cache_size: int = 256,
+                 reuse_threshold: float = 0.0,
+                 warmup: bool = True,
+                 warmup_async: bool = True):
+        """
+        Args:
+            detector_backend: 顔検出バックエンド
+            enforce_detection: 顔が見つからない場合に例外とするか
+            cache_size: 画像内容のハッシュをキーに保持する結果の件数（0で無効）
+            reuse_threshold: analyze で直前の画像との平均絶対差（画素値）がこの値未満なら
+                前回の結果を再利用する。0で無効。
+            warmup: 初期化時にダミー画像で分析モデルを構築しておくか
+                （初回フレームでのモデル構築による長い停止を避ける）
+            warmup_async: ウォームアップをバックグラウンドスレッドで行うか
+        """
         self._detector_backend = detector_backend
         self._enforce_detection = enforce_detection
         self._deepface = None
         self._version = None
+        self._cache_size = cache_size
+        self._cache: "OrderedDict[Hashable, list]" = OrderedDict()
+        self.reuse_threshold = reuse_threshold
+        self._last_image: Optional[np.ndarray] = None
+        self._last_results: List["DeepFaceResult"] = []
+        self._warmup_thread: Optional[threading.Thread] = None
+        # analyze_many 用のプロセスプール（初回呼び出しで作成）
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_workers = 0
         self._init_deepface()
+        if warmup and self.is_available:
+            if warmup_async:
+                self._warmup_thread = threading.Thread(
+                    target=self._warmup, name="deepface-warmup", daemon=True
+                )
+                self._warmup_thread.start()
+            else:
+                self._warmup()
     
     def _init_deepface(self):
         """DeepFaceを初期化"""
@@ -59,56 +103,257 @@ class DeepFaceAnalyzer:
     def is_available(self) -> bool:
         return self._deepface is not None
     
+    def _warmup(self) -> None:
+        """ダミー画像を1回分析して、analyze で使うモデルを構築しておく"""
+        try:
+            self._deepface.analyze(
+                img_path=np.zeros((224, 224, 3), dtype=np.uint8),
+                actions=self._ACTIONS,
+                detector_backend='skip',
+                enforce_detection=False,
+                silent=True,
+            )
+        except Exception as e:
+            print(f"DeepFaceウォームアップエラー: {e}")
+    
+    def _wait_warmup(self) -> None:
+        """ウォームアップ中なら終わるまで待つ（モデルの二重構築を避ける）"""
+        thread = self._warmup_thread
+        if thread is not None:
+            thread.join()
+            self._warmup_thread = None
+    
+    def clear_cache(self) -> None:
+        """結果キャッシュを破棄"""
+        self._cache.clear()
+        self._last_image = None
+        self._last_results = []
+    
+    def _content_key(self, image: np.ndarray) -> Optional[bytes]:
+        """画像内容のハッシュ（キャッシュ無効時は None）"""
+        if self._cache_size <= 0:
+            return None
+        digest = hashlib.blake2b(np.ascontiguousarray(image).data, digest_size=16)
+        digest.update(f"{image.shape}{image.dtype}".encode())
+        return digest.digest()
+    
+    def _cache_get(self, key: Hashable) -> Optional[list]:
+        value = self._cache.get(key)
+        if value is not None:
+            self._cache.move_to_end(key)
+        return value
+    
+    def _cache_put(self, key: Hashable, value: list) -> None:
+        self._cache[key] = value
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+    
+    def _is_near_duplicate(self, image: np.ndarray) -> bool:
+        """直前に analyze した画像とほぼ同じか"""
+        last = self._last_image
+        if self.reuse_threshold <= 0 or last is None or last.shape != image.shape \
+                or last.dtype != image.dtype:
+            return False
+        return cv2.norm(image, last, cv2.NORM_L1) / image.size < self.reuse_threshold
+    
+    # analyze_batch で1回の呼び出しにまとめる最大枚数
+    MAX_BATCH_SIZE = 16
+    
+    _ACTIONS = ['emotion', 'age', 'gender', 'race']
+    
+    def _analyze_raw(self, img_path):
+        """DeepFace.analyze を呼ぶ（v0.0.89+ API）"""
+        self._wait_warmup()
+        return self._deepface.analyze(
+            img_path=img_path,
+            actions=self._ACTIONS,
+            detector_backend=self._detector_backend,
+            enforce_detection=self._enforce_detection,
+            silent=True,
+            align=True  # 顔のアライメントを有効化
+        )
+    
+    def _parse_results(self, results, image: np.ndarray) -> List[DeepFaceResult]:
+        """1画像分の結果（辞書または辞書のリスト）をパース"""
+        if isinstance(results, dict):
+            results = [results]
+        
+        parsed_results = []
+        for result in results:
+            parsed = self._parse_result(result, image)
+            if parsed:
+                parsed_results.append(parsed)
+        return parsed_results
+    
     def analyze(self, image: np.ndarray) -> List[DeepFaceResult]:
-        """画像を分析"""
+        """画像を分析（同じ内容の画像・直前とほぼ同じ画像は前回の結果を返す）"""
         if not self.is_available:
             return []
         
-        try:
-            # DeepFace v0.0.89+ API
-            results = self._deepface.analyze(
-                img_path=image,
-                actions=['emotion', 'age', 'gender', 'race'],
-                detector_backend=self._detector_backend,
-                enforce_detection=self._enforce_detection,
-                silent=True,
-                align=True  # 顔のアライメントを有効化
-            )
-            
-            if isinstance(results, dict):
-                results = [results]
-            
-            parsed_results = []
-            for result in results:
-                parsed = self._parse_result(result, image)
-                if parsed:
-                    parsed_results.append(parsed)
+        if self._is_near_duplicate(image):
+            return list(self._last_results)
+        
+        key = self._content_key(image)
+        cached = self._cache_get(("analyze", key)) if key is not None else None
+        if cached is None:
+            try:
+                cached = self._parse_results(self._analyze_raw(image), image)
+            except Exception as e:
+                if "Face could not be detected" not in str(e):
+                    print(f"DeepFace分析エラー: {e}")
+                return []
+            if key is not None:
+                self._cache_put(("analyze", key), cached)
+        
+        self._remember(image, cached)
+        return list(cached)
+    
+    def _remember(self, image: np.ndarray, results: List[DeepFaceResult]) -> None:
+        """ほぼ同じ画像の判定用に直前の画像と結果を保持"""
+        if self.reuse_threshold > 0:
+            self._last_image = image.copy()
+            self._last_results = results
+    
+    def analyze_batch(self, images: List[np.ndarray],
+                      batch_size: int = MAX_BATCH_SIZE) -> List[List[DeepFaceResult]]:
+        """
+        複数画像をまとめて分析
+        
+        同じサイズの画像は最大 batch_size 枚ずつ (N, H, W, 3) 配列にして DeepFace.analyze に
+        1回で渡し、モデル呼び出しをまとめる。バッチ入力に対応していない DeepFace の場合は
+        1枚ずつの analyze にフォールバックする。
+        
+        Args:
+            images: 画像のリスト
+            batch_size: 1回の呼び出しにまとめる枚数（1〜MAX_BATCH_SIZE）
             
-            return parsed_results
+        Returns:
+            画像ごとの分析結果のリスト（入力と同じ順序）
+        """
+        if not self.is_available:
+            return [[] for _ in images]
+        
+        batch_size = max(1, min(batch_size, self.MAX_BATCH_SIZE))
+        outputs: List[Optional[List[DeepFaceResult]]] = [None] * len(images)
+        
+        # キャッシュにない画像だけをまとめて分析する
+        keys = [self._content_key(image) for image in images]
+        pending = []
+        for i, key in enumerate(keys):
+            cached = self._cache_get(("analyze", key)) if key is not None else None
+            if cached is None:
+                pending.append(i)
+            else:
+                outputs[i] = list(cached)
+        
+        for start in range(0, len(pending), batch_size):
+            indices = pending[start:start + batch_size]
+            chunk = [images[i] for i in indices]
+            batched = self._analyze_chunk(chunk) if len(chunk) > 1 else None
+            if batched is None:
+                # analyze 側でキャッシュされる
+                batched = [self.analyze(image) for image in chunk]
+            else:
+                for i, results in zip(indices, batched):
+                    if keys[i] is not None:
+                        self._cache_put(("analyze", keys[i]), results)
+            for i, results in zip(indices, batched):
+                outputs[i] = list(results)
+        return outputs
+    
+    def _analyze_chunk(self, chunk: List[np.ndarray]) -> Optional[List[List[DeepFaceResult]]]:
+        """同じサイズの画像をまとめて分析（まとめられない場合は None）"""
+        shape = chunk[0].shape
+        if len(shape) != 3 or any(image.shape != shape for image in chunk):
+            return None
+        try:
+            results = self._analyze_raw(np.stack(chunk))
+        except Exception:
+            # バッチ入力に未対応のバージョン、または一部の画像で失敗した場合
+            return None
+        # バッチ入力では画像ごとの結果リストが返る
+        if not isinstance(results, list) or len(results) != len(chunk) \
+                or not all(isinstance(r, list) for r in results):
+            return None
+        return [self._parse_results(r, image) for r, image in zip(results, chunk)]
+    
+    def analyze_many(self, images: List[np.ndarray],
+                     workers: Optional[int] = None) -> List[List[DeepFaceResult]]:
+        """
+        複数画像をプロセスプールで並列に分析
+        
+        各ワーカープロセスは DeepFaceAnalyzer を1つだけ作ってモデルを保持し、呼び出しごとには
+        読み込まない。プールは close() まで使い回す。CUDA デバイスがある場合（GPU の取り合いに
+        なる）やワーカーが1つ以下の場合は analyze_batch で分析する。
+
+        ワーカーはプロセス初期化時に同期的にウォームアップするため、プールを使う用途では
+        親プロセスのウォームアップは不要になる。analyze_many だけを使う場合は warmup=False で
+        生成するとよい。
+
+        Args:
+            images: 画像のリスト
+            workers: ワーカープロセス数（None で CPU 数の半分）
             
-        except Exception as e:
-            if "Face could not be detected" not in str(e):
-                print(f"DeepFace分析エラー: {e}")
-            return []
+        Returns:
+            画像ごとの分析結果のリスト（入力と同じ順序）
+        """
+        if not self.is_available:
+            return [[] for _ in images]
+        
+        if workers is None:
+            workers = (os.cpu_count() or 1) // 2
+        if workers <= 1 or _cuda_device_count() > 0:
+            return self.analyze_batch(images)
+        
+        outputs: List[Optional[List[DeepFaceResult]]] = [None] * len(images)
+        keys = [self._content_key(image) for image in images]
+        pending = []
+        for i, key in enumerate(keys):
+            cached = self._cache_get(("analyze", key)) if key is not None else None
+            if cached is None:
+                pending.append(i)
+            else:
+                outputs[i] = list(cached)
+        
+        if pending:
+            pool = self._get_pool(workers)
+            # map は入力と同じ順序で結果を返す
+            for i, results in zip(pending, pool.map(_worker_analyze, [images[i] for i in pending])):
+                if keys[i] is not None:
+                    self._cache_put(("analyze", keys[i]), results)
+                outputs[i] = list(results)
+        return outputs
+    
+    def _get_pool(self, workers: int) -> ProcessPoolExecutor:
+        """ワーカー数が同じなら既存のプールを返す"""
+        if self._pool is None or self._pool_workers != workers:
+            self.close()
+            self._pool = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_worker_init,
+                initargs=(self._detector_backend, self._enforce_detection),
+            )
+            self._pool_workers = workers
+        return self._pool
+    
+    def close(self) -> None:
+        """analyze_many のプロセスプールを終了"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+            self._pool_workers = 0
     
     def _parse_result(self, result: Dict, image: np.ndarray) -> Optional[DeepFaceResult]:
         """結果をパース（v0.0.89+ API対応）"""
         try:
             # 顔の矩形 - 新APIでは 'region' キー
             region = result.get('region', {})
-            face_rect = (
-                region.get('x', 0),
-                region.get('y', 0),
-                region.get('w', 0),
-                region.get('h', 0)
-            )
-            
-            # 感情
-            emotion = result.get('emotion', {})
-            dominant_emotion = result.get('dominant_emotion', 'neutral')
-            
-            # 年齢
-            age = result.get('age', 0)
+            try:
+                face_rect = _REGION_FIELDS(region)
+            except KeyError:
+                face_rect = (region.get('x', 0), region.get('y', 0),
+                             region.get('w', 0), region.get('h', 0))
             
             # 性別 - 新APIでは辞書形式
             gender_data = result.get('gender', {})
@@ -117,38 +362,25 @@ class DeepFaceAnalyzer:
             else:
                 gender = str(gender_data)
             
-            # 人種
-            race_data = result.get('race', {})
-            dominant_race = result.get('dominant_race', 'Unknown')
-            
-            # ランドマーク（RetinaFace/MTCNN使用時）
-            landmarks = None
-            roll, yaw, pitch = 0.0, 0.0, 0.0
-            
-            # facial_area にランドマークが含まれる場合
-            facial_area = result.get('facial_area', region)
-            if isinstance(facial_area, dict):
-                # RetinaFaceの場合、ランドマークは別途取得が必要
-                pass
-            
             # 顔の向きを推定（顔の矩形から）
+            # RetinaFace/MTCNN のランドマークは別途取得が必要なため、ここでは持たない
+            yaw = 0.0
             if face_rect[2] > 0 and face_rect[3] > 0:
-                # アスペクト比から簡易的にヨーを推定
-                aspect = face_rect[2] / face_rect[3]
-                if aspect < 0.8:
-                    yaw = (0.8 - aspect) * 50  # 顔が細い = 横向き
+                # アスペクト比から簡易的にヨーを推定（顔が細い = 横向き）
+                yaw = max(0.0, 0.8 - face_rect[2] / face_rect[3]) * 50
             
+            # フィールド順の位置引数で生成
             return DeepFaceResult(
-                face_rect=face_rect,
-                emotion=emotion,
-                dominant_emotion=dominant_emotion,
-                age=age,
-                gender=gender,
-                dominant_race=dominant_race,
-                landmarks=landmarks,
-                roll=roll,
-                yaw=yaw,
-                pitch=pitch
+                face_rect,
+                result.get('emotion', {}),
+                result.get('dominant_emotion', 'neutral'),
+                result.get('age', 0),
+                gender,
+                result.get('dominant_race', 'Unknown'),
+                None,
+                0.0,
+                yaw,
+                0.0,
             )
             
         except Exception as e:
@@ -187,20 +419,73 @@ class DeepFaceAnalyzer:
         return results
     
     def represent(self, image: np.ndarray, model_name: str = 'Facenet512') -> List[np.ndarray]:
-        """顔の埋め込みベクトルを取得"""
+        """顔の埋め込みベクトルを取得（同じ内容の画像とモデルの組は前回の結果を返す）"""
         if not self.is_available:
             return []
         
-        try:
-            embeddings = self._deepface.represent(
-                img_path=image,
-                model_name=model_name,
-                detector_backend=self._detector_backend,
-                enforce_detection=self._enforce_detection
-            )
-            return [np.array(e['embedding']) for e in embeddings]
-        except Exception:
-            return []
+        key = self._content_key(image)
+        cache_key = ("represent", model_name, key)
+        cached = self._cache_get(cache_key) if key is not None else None
+        if cached is None:
+            try:
+                embeddings = self._deepface.represent(
+                    img_path=image,
+                    model_name=model_name,
+                    detector_backend=self._detector_backend,
+                    enforce_detection=self._enforce_detection
+                )
+            except Exception:
+                return []
+            cached = [np.array(e['embedding']) for e in embeddings]
+            if key is not None:
+                self._cache_put(cache_key, cached)
+        return [e.copy() for e in cached]
+
+
+def _cuda_device_count() -> int:
+    """OpenCV から見える CUDA デバイス数（CUDA 非対応のビルドでは 0）"""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount()
+    except (AttributeError, cv2.error):
+        return 0
+
+
+# analyze_many のワーカープロセスごとの分析器（_worker_init で1回だけ作る）
+_worker_analyzer: Optional[DeepFaceAnalyzer] = None
+
+
+def _worker_init(detector_backend: str, enforce_detection: bool) -> None:
+    """ワーカープロセスの初期化（モデルの読み込みもここで済ませる）"""
+    global _worker_analyzer
+    _worker_analyzer = DeepFaceAnalyzer(
+        detector_backend=detector_backend,
+        enforce_detection=enforce_detection,
+        cache_size=0,
+        warmup_async=False,
+    )
+
+
+def _worker_analyze(image: np.ndarray) -> List[DeepFaceResult]:
+    """ワーカープロセスで1画像を分析"""
+    return _worker_analyzer.analyze(image)
+
+
+# convert_5_to_68 で使う部位ごとのパラメータ（角度の cos/sin など）。呼び出しごとに計算しない
+_CONTOUR_ANGLES = np.array([np.pi * (0.1 + (i / 16.0) * 0.8) for i in range(17)])
+_CONTOUR_COS = np.cos(_CONTOUR_ANGLES)
+_CONTOUR_SIN = np.sin(_CONTOUR_ANGLES)
+_BROW_T = np.arange(5) / 4.0
+_NOSE_BRIDGE_T = np.arange(4) / 3.0
+_NOSE_TIP_T = (np.arange(5) - 2) / 2.0
+_EYE_ANGLES = np.pi * np.array([0, 0.5, 0.8, 1.0, 1.5, 1.8])
+_EYE_COS = np.cos(_EYE_ANGLES)
+_EYE_SIN = np.sin(_EYE_ANGLES)
+_OUTER_LIP_ANGLES = np.array([2 * np.pi * i / 12 for i in range(12)])
+_OUTER_LIP_COS = np.cos(_OUTER_LIP_ANGLES)
+_OUTER_LIP_SIN = np.sin(_OUTER_LIP_ANGLES)
+_INNER_LIP_ANGLES = np.array([2 * np.pi * i / 8 for i in range(8)])
+_INNER_LIP_COS = np.cos(_INNER_LIP_ANGLES)
+_INNER_LIP_SIN = np.sin(_INNER_LIP_ANGLES)
 
 
 class DeepFaceLandmarkConverter:
@@ -229,76 +514,48 @@ class DeepFaceLandmarkConverter:
         
         # 基準値を計算
         eye_center = (left_eye + right_eye) / 2
-        eye_distance = np.linalg.norm(left_eye - right_eye)
+        eye_distance = math.hypot(left_eye[0] - right_eye[0], left_eye[1] - right_eye[1])
         mouth_center = (mouth_left + mouth_right) / 2
-        mouth_width = np.linalg.norm(mouth_left - mouth_right)
+        mouth_width = math.hypot(mouth_left[0] - mouth_right[0], mouth_left[1] - mouth_right[1])
         
-        # 68点を生成
-        landmarks_68 = np.zeros((68, 2), dtype=np.float32)
+        # 68点を生成（各部位を事前計算したパラメータ表からスライス単位でまとめて埋める）
+        landmarks_68 = np.empty((68, 2), dtype=np.float32)
         
         # 顔の輪郭 (0-16)
-        for i in range(17):
-            t = i / 16.0
-            angle = np.pi * (0.1 + t * 0.8)
-            r = h * 0.48
-            cx, cy = x + w * 0.5, y + h * 0.45
-            landmarks_68[i] = [cx - r * np.cos(angle), cy + r * np.sin(angle) * 0.9]
+        r = h * 0.48
+        cx, cy = x + w * 0.5, y + h * 0.45
+        landmarks_68[0:17, 0] = cx - r * _CONTOUR_COS
+        landmarks_68[0:17, 1] = cy + r * _CONTOUR_SIN * 0.9
         
         # 右眉 (17-21)
-        for i in range(5):
-            t = i / 4.0
-            landmarks_68[17 + i] = [
-                right_eye[0] - eye_distance * 0.3 + t * eye_distance * 0.4,
-                right_eye[1] - eye_distance * 0.25
-            ]
+        landmarks_68[17:22, 0] = right_eye[0] - eye_distance * 0.3 + _BROW_T * eye_distance * 0.4
+        landmarks_68[17:22, 1] = right_eye[1] - eye_distance * 0.25
         
         # 左眉 (22-26)
-        for i in range(5):
-            t = i / 4.0
-            landmarks_68[22 + i] = [
-                left_eye[0] - eye_distance * 0.1 + t * eye_distance * 0.4,
-                left_eye[1] - eye_distance * 0.25
-            ]
+        landmarks_68[22:27, 0] = left_eye[0] - eye_distance * 0.1 + _BROW_T * eye_distance * 0.4
+        landmarks_68[22:27, 1] = left_eye[1] - eye_distance * 0.25
         
         # 鼻筋 (27-30)
-        for i in range(4):
-            t = i / 3.0
-            landmarks_68[27 + i] = [nose[0], eye_center[1] + t * (nose[1] - eye_center[1])]
+        landmarks_68[27:31, 0] = nose[0]
+        landmarks_68[27:31, 1] = eye_center[1] + _NOSE_BRIDGE_T * (nose[1] - eye_center[1])
         
         # 鼻先 (31-35)
-        for i in range(5):
-            t = (i - 2) / 2.0
-            landmarks_68[31 + i] = [nose[0] + t * eye_distance * 0.2, nose[1] + eye_distance * 0.1]
+        landmarks_68[31:36, 0] = nose[0] + _NOSE_TIP_T * eye_distance * 0.2
+        landmarks_68[31:36, 1] = nose[1] + eye_distance * 0.1
         
-        # 右目 (36-41)
+        # 右目 (36-41)・左目 (42-47)
         eye_w, eye_h = eye_distance * 0.25, eye_distance * 0.1
-        for i, angle in enumerate([0, 0.5, 0.8, 1.0, 1.5, 1.8]):
-            landmarks_68[36 + i] = [
-                right_eye[0] + eye_w * np.cos(np.pi * angle),
-                right_eye[1] + eye_h * np.sin(np.pi * angle)
-            ]
-        
-        # 左目 (42-47)
-        for i, angle in enumerate([0, 0.5, 0.8, 1.0, 1.5, 1.8]):
-            landmarks_68[42 + i] = [
-                left_eye[0] + eye_w * np.cos(np.pi * angle),
-                left_eye[1] + eye_h * np.sin(np.pi * angle)
-            ]
+        landmarks_68[36:42, 0] = right_eye[0] + eye_w * _EYE_COS
+        landmarks_68[36:42, 1] = right_eye[1] + eye_h * _EYE_SIN
+        landmarks_68[42:48, 0] = left_eye[0] + eye_w * _EYE_COS
+        landmarks_68[42:48, 1] = left_eye[1] + eye_h * _EYE_SIN
         
         # 外側の唇 (48-59)
-        for i in range(12):
-            angle = 2 * np.pi * i / 12
-            landmarks_68[48 + i] = [
-                mouth_center[0] + mouth_width * 0.5 * np.cos(angle),
-                mouth_center[1] + mouth_width * 0.25 * np.sin(angle)
-            ]
+        landmarks_68[48:60, 0] = mouth_center[0] + mouth_width * 0.5 * _OUTER_LIP_COS
+        landmarks_68[48:60, 1] = mouth_center[1] + mouth_width * 0.25 * _OUTER_LIP_SIN
         
         # 内側の唇 (60-67)
-        for i in range(8):
-            angle = 2 * np.pi * i / 8
-            landmarks_68[60 + i] = [
-                mouth_center[0] + mouth_width * 0.3 * np.cos(angle),
-                mouth_center[1] + mouth_width * 0.12 * np.sin(angle)
-            ]
+        landmarks_68[60:68, 0] = mouth_center[0] + mouth_width * 0.3 * _INNER_LIP_COS
+        landmarks_68[60:68, 1] = mouth_center[1] + mouth_width * 0.12 * _INNER_LIP_SIN
         
         return landmarks_68
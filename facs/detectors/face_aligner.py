@@ -1,12 +1,15 @@
 """
 顔の傾き（回転・スケール）を正規化するモジュール
 """
+import math
 import numpy as np
 import cv2
 from typing import Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from ..core.models import _DATACLASS_SLOTS
+from .feature_extractor import _DIST_PAIRS, _INNER_MOUTH_PAIR, _mean_point, _point_distance
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class FaceAlignment:
     """顔のアライメント情報"""
     rotation_angle: float      # 回転角度（度）
@@ -16,12 +19,39 @@ class FaceAlignment:
     roll: float                # ロール（頭の傾き）
     yaw: float                 # ヨー（左右の向き）- 推定値
     pitch: float               # ピッチ（上下の向き）- 推定値
+    # 正規化のアフィン変換 normalized = landmarks @ matrix.T + offset（compute_alignment が設定）
+    matrix: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    offset: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+
+
+def _normalization_affine(roll: float, center: Tuple[float, float],
+                          eye_distance: float) -> Tuple[np.ndarray, np.ndarray]:
+    """中心移動・回転補正・スケール正規化を1つの (2x2 行列, 平行移動) にまとめる"""
+    angle_rad = -math.radians(roll)
+    c, s = math.cos(angle_rad), math.sin(angle_rad)
+    k = 1.0 / eye_distance if eye_distance > 0 else 1.0
+    matrix = np.array([[c * k, -s * k], [s * k, c * k]])
+    offset = -(matrix @ np.asarray(center, dtype=np.float64))
+    return matrix, offset
+
+def _apply_affine(points: np.ndarray, M: np.ndarray) -> np.ndarray:
+    """(N, 2) の点に 2x3 アフィン行列を適用（同次座標の配列は作らず cv2.transform で行う）
+
+    検出器が返す float32 のランドマークはそのまま float32 で変換し、float64 へのコピーを作らない。
+    """
+    points = np.asarray(points)
+    if points.dtype != np.float32:
+        points = points.astype(np.float64, copy=False)
+    points = points.reshape(-1, 1, 2)
+    return cv2.transform(points, M).reshape(-1, 2)
+
 
 class FaceAligner:
     """顔の傾きを正規化するクラス"""
     
     def __init__(self):
-        pass
+        # align_image(reuse_buffer=True) の出力先（サイズ・型が変わったら作り直す）
+        self._aligned_buf: Optional[np.ndarray] = None
     
     def compute_alignment(self, landmarks: np.ndarray) -> FaceAlignment:
         """
@@ -33,45 +63,58 @@ class FaceAligner:
         Returns:
             FaceAlignment: アライメント情報
         """
+        # 68点の小さな配列なので、Python の float に一度変換してスカラー演算する
+        points = landmarks.tolist()
+        
         # 目の中心を計算
-        left_eye_center = np.mean(landmarks[42:48], axis=0)
-        right_eye_center = np.mean(landmarks[36:42], axis=0)
+        lx, ly = _mean_point(points, 42, 48)
+        rx, ry = _mean_point(points, 36, 42)
         
         # 目の間の距離
-        eye_distance = np.linalg.norm(left_eye_center - right_eye_center)
+        dx, dy = lx - rx, ly - ry
+        eye_distance = math.hypot(dx, dy)
         
         # 顔の中心（両目の中点）
-        face_center = (left_eye_center + right_eye_center) / 2
+        face_center = ((lx + rx) / 2, (ly + ry) / 2)
         
         # ロール角（頭の傾き）を計算
         # 両目を結ぶ線の角度
-        dy = left_eye_center[1] - right_eye_center[1]
-        dx = left_eye_center[0] - right_eye_center[0]
-        roll_angle = np.degrees(np.arctan2(dy, dx))
-        
-        # ヨー角（左右の向き）を推定
-        # 鼻の位置と顔の中心のずれから推定
-        nose_tip = landmarks[30]
-        nose_to_center_x = nose_tip[0] - face_center[0]
-        yaw_estimate = np.clip(nose_to_center_x / (eye_distance * 0.3) * 30, -45, 45)
-        
-        # ピッチ角（上下の向き）を推定
-        # 鼻と口の位置関係から推定
-        mouth_center = (landmarks[48] + landmarks[54]) / 2
-        nose_to_mouth = mouth_center[1] - nose_tip[1]
-        expected_distance = eye_distance * 0.6
-        pitch_estimate = np.clip((nose_to_mouth - expected_distance) / expected_distance * 30, -30, 30)
+        roll_angle = math.degrees(math.atan2(dy, dx))
+        
+        # 目の間の距離が0（退化したランドマーク）の場合はヨー・ピッチを0とする
+        yaw_estimate = pitch_estimate = 0.0
+        if eye_distance > 0:
+            # ヨー角（左右の向き）を推定
+            # 鼻の位置と顔の中心のずれから推定
+            nose_x, nose_y = points[30]
+            nose_to_center_x = nose_x - face_center[0]
+            yaw_estimate = min(max(nose_to_center_x / (eye_distance * 0.3) * 30, -45.0), 45.0)
+            
+            # ピッチ角（上下の向き）を推定
+            # 鼻と口の位置関係から推定
+            mouth_center_y = (points[48][1] + points[54][1]) / 2
+            nose_to_mouth = mouth_center_y - nose_y
+            expected_distance = eye_distance * 0.6
+            pitch_estimate = min(max((nose_to_mouth - expected_distance) / expected_distance * 30, -30.0), 30.0)
+        
+        center = (face_center[0], face_center[1])
+        matrix, offset = _normalization_affine(roll_angle, center, eye_distance)
         
         return FaceAlignment(
             rotation_angle=roll_angle,
             scale=eye_distance,
-            center=(face_center[0], face_center[1]),
+            center=center,
             eye_distance=eye_distance,
             roll=roll_angle,
             yaw=yaw_estimate,
-            pitch=pitch_estimate
+            pitch=pitch_estimate,
+            matrix=matrix,
+            offset=offset,
         )
     
+    # normalize_landmarks で回転補正を省くロール角の絶対値の上限（度）
+    NORMALIZE_MAX_SKIP_ROLL = 1.0
+    
     def normalize_landmarks(self, landmarks: np.ndarray, 
                            alignment: Optional[FaceAlignment] = None) -> np.ndarray:
         """
@@ -87,50 +130,54 @@ class FaceAligner:
         if alignment is None:
             alignment = self.compute_alignment(landmarks)
         
-        # 1. 中心を原点に移動
-        centered = landmarks - np.array(alignment.center)
-        
-        # 2. 回転を補正（ロール角を0に）
-        angle_rad = -np.radians(alignment.roll)
-        rotation_matrix = np.array([
-            [np.cos(angle_rad), -np.sin(angle_rad)],
-            [np.sin(angle_rad), np.cos(angle_rad)]
-        ])
-        rotated = centered @ rotation_matrix.T
-        
-        # 3. スケールを正規化（目の間の距離を1.0に）
-        if alignment.eye_distance > 0:
-            normalized = rotated / alignment.eye_distance
-        else:
-            normalized = rotated
-        
+        if self._skips_rotation(alignment):
+            # ほぼ傾いていない顔は回転を省き、中心移動とスケール正規化だけを行う
+            # （出力は回転補正ありの場合と同じ float64）
+            normalized = np.subtract(landmarks, alignment.center, dtype=np.float64)
+            normalized *= 1.0 / alignment.eye_distance
+            return normalized
+        
+        # 中心移動・回転補正（ロール角を0に）・スケール正規化（目の間の距離を1.0に）を
+        # 1つのアフィン変換で行い、中間配列を作らない
+        matrix, offset = alignment.matrix, alignment.offset
+        if matrix is None or offset is None:
+            # 手動で作られたアライメントは初回に計算して保持する
+            matrix, offset = _normalization_affine(
+                alignment.roll, alignment.center, alignment.eye_distance
+            )
+            alignment.matrix, alignment.offset = matrix, offset
+        normalized = landmarks @ matrix.T
+        normalized += offset
         return normalized
     
+    def _skips_rotation(self, alignment: FaceAlignment) -> bool:
+        """正規化で回転補正を省くか（normalize / denormalize で同じ判定を使う）"""
+        return abs(alignment.roll) < self.NORMALIZE_MAX_SKIP_ROLL and alignment.eye_distance > 0
+    
     def denormalize_landmarks(self, normalized_landmarks: np.ndarray,
                               alignment: FaceAlignment) -> np.ndarray:
         """
         正規化されたランドマークを元の座標系に戻す
         """
-        # 逆順に処理
-        # 1. スケールを戻す
-        scaled = normalized_landmarks * alignment.eye_distance
-        
-        # 2. 回転を戻す
-        angle_rad = np.radians(alignment.roll)
-        rotation_matrix = np.array([
-            [np.cos(angle_rad), -np.sin(angle_rad)],
-            [np.sin(angle_rad), np.cos(angle_rad)]
-        ])
-        rotated = scaled @ rotation_matrix.T
-        
-        # 3. 中心を戻す
-        denormalized = rotated + np.array(alignment.center)
+        if self._skips_rotation(alignment):
+            # normalize_landmarks で回転を省いた場合は、スケールと中心だけを戻す
+            denormalized = np.multiply(normalized_landmarks, alignment.eye_distance, dtype=np.float64)
+            denormalized += np.asarray(alignment.center, dtype=np.float64)
+            return denormalized
+        
+        # スケール・回転・中心を逆順に戻す変換を1つのアフィン変換にまとめる
+        angle_rad = math.radians(alignment.roll)
+        c = math.cos(angle_rad) * alignment.eye_distance
+        s = math.sin(angle_rad) * alignment.eye_distance
+        denormalized = normalized_landmarks @ np.array([[c, s], [-s, c]])
+        denormalized += np.asarray(alignment.center, dtype=np.float64)
         
         return denormalized
     
     def align_image(self, image: np.ndarray, landmarks: np.ndarray,
                     output_size: Tuple[int, int] = (256, 256),
-                    eye_position: float = 0.35) -> Tuple[np.ndarray, np.ndarray]:
+                    eye_position: float = 0.35,
+                    reuse_buffer: bool = False) -> Tuple[np.ndarray, np.ndarray]:
         """
         画像とランドマークを正面向きに整列
         
@@ -139,18 +186,37 @@ class FaceAligner:
             landmarks: 68点ランドマーク
             output_size: 出力画像サイズ
             eye_position: 目の縦位置（0-1、上からの割合）
+            reuse_buffer: Trueの場合、整列画像を内部バッファに書き込んで返す
+                （動画処理で毎フレームの確保を避ける）。次の呼び出しで上書きされるため、
+                保持する場合は呼び出し側でコピーすること
             
         Returns:
             (整列された画像, 整列されたランドマーク)
         """
         alignment = self.compute_alignment(landmarks)
+        dst = self._output_buffer(image, output_size) if reuse_buffer else None
+        
+        # 出力画像での目の間隔
+        desired_eye_distance = output_size[0] * 0.4
+        
+        # ほぼ正面・ほぼ等倍の顔は、回転を伴う warpAffine の代わりに切り出し + resize で済ませる
+        crop = self._frontal_crop(image.shape, alignment, output_size, eye_position,
+                                  desired_eye_distance)
+        if crop is not None:
+            x0, y0, x1, y1 = crop
+            aligned_image = cv2.resize(image[y0:y1, x0:x1], output_size, dst=dst,
+                                       interpolation=cv2.INTER_LINEAR)
+            # resize の画素対応 dst = (src + 0.5) * s - 0.5 に切り出し位置を合わせた変換
+            sx, sy = output_size[0] / (x1 - x0), output_size[1] / (y1 - y0)
+            M = np.array([[sx, 0.0, (0.5 - x0) * sx - 0.5],
+                          [0.0, sy, (0.5 - y0) * sy - 0.5]])
+            return aligned_image, _apply_affine(landmarks, M)
         
         # 目の位置を基準にアフィン変換を計算
         left_eye = np.mean(landmarks[42:48], axis=0)
         right_eye = np.mean(landmarks[36:42], axis=0)
         
         # 出力画像での目の位置
-        desired_eye_distance = output_size[0] * 0.4
         desired_left_eye = np.array([
             output_size[0] * 0.5 + desired_eye_distance * 0.5,
             output_size[1] * eye_position
@@ -173,80 +239,105 @@ class FaceAligner:
         # アフィン変換
         M = cv2.getAffineTransform(src_pts, dst_pts)
         
-        aligned_image = cv2.warpAffine(image, M, output_size,
+        aligned_image = cv2.warpAffine(image, M, output_size, dst=dst,
                                        flags=cv2.INTER_LINEAR,
                                        borderMode=cv2.BORDER_CONSTANT,
                                        borderValue=(128, 128, 128))
         
         # ランドマークも変換
-        ones = np.ones((landmarks.shape[0], 1))
-        landmarks_h = np.hstack([landmarks, ones])
-        aligned_landmarks = landmarks_h @ M.T
+        return aligned_image, _apply_affine(landmarks, M)
+    
+    def _output_buffer(self, image: np.ndarray, output_size: Tuple[int, int]) -> np.ndarray:
+        """align_image の出力バッファ"""
+        shape = (output_size[1], output_size[0]) + image.shape[2:]
+        buf = self._aligned_buf
+        if buf is None or buf.shape != shape or buf.dtype != image.dtype:
+            buf = self._aligned_buf = np.empty(shape, dtype=image.dtype)
+        return buf
+    
+    # 切り出し + resize で整列する条件（ロール・ヨーの絶対値の上限、拡大率の範囲）
+    FRONTAL_MAX_ROLL = 2.0
+    FRONTAL_MAX_YAW = 5.0
+    FRONTAL_SCALE_RANGE = (0.9, 1.1)
+    
+    def _frontal_crop(self, image_shape: Tuple[int, ...], alignment: FaceAlignment,
+                      output_size: Tuple[int, int], eye_position: float,
+                      desired_eye_distance: float) -> Optional[Tuple[int, int, int, int]]:
+        """
+        正面向きの顔を整列する切り出し範囲 (x0, y0, x1, y1) を返す
         
-        return aligned_image, aligned_landmarks
+        傾きが小さく拡大率が1に近い場合のみ。範囲が画像からはみ出す場合は None
+        （warpAffine の定数色の余白と合わせるため）。
+        """
+        if alignment.eye_distance <= 0 or abs(alignment.roll) >= self.FRONTAL_MAX_ROLL \
+                or abs(alignment.yaw) >= self.FRONTAL_MAX_YAW:
+            return None
+        scale = desired_eye_distance / alignment.eye_distance
+        low, high = self.FRONTAL_SCALE_RANGE
+        if not low < scale < high:
+            return None
+        
+        # 両目の中点が出力の (幅/2, 高さ*eye_position) に来るように切り出す
+        cx, cy = alignment.center
+        x0 = int(round(cx - output_size[0] * 0.5 / scale))
+        y0 = int(round(cy - output_size[1] * eye_position / scale))
+        x1 = x0 + int(round(output_size[0] / scale))
+        y1 = y0 + int(round(output_size[1] / scale))
+        if x0 < 0 or y0 < 0 or x1 > image_shape[1] or y1 > image_shape[0]:
+            return None
+        return x0, y0, x1, y1
     
-    def compute_rotation_invariant_features(self, landmarks: np.ndarray) -> dict:
+    def compute_rotation_invariant_features(self, landmarks: np.ndarray,
+                                            alignment: Optional[FaceAlignment] = None,
+                                            normalized: Optional[np.ndarray] = None) -> dict:
         """
         回転に不変な特徴量を計算
         
         顔が傾いていても一貫した値を返す特徴量
-        """
-        alignment = self.compute_alignment(landmarks)
-        normalized = self.normalize_landmarks(landmarks, alignment)
-        
-        # 正規化されたランドマークから特徴量を計算
-        features = {}
         
-        # 目のアスペクト比（回転補正済み）
-        right_eye = normalized[36:42]
-        left_eye = normalized[42:48]
-        
-        right_eye_height = (np.linalg.norm(right_eye[1] - right_eye[5]) +
-                          np.linalg.norm(right_eye[2] - right_eye[4])) / 2
-        right_eye_width = np.linalg.norm(right_eye[0] - right_eye[3])
-        
-        left_eye_height = (np.linalg.norm(left_eye[1] - left_eye[5]) +
-                         np.linalg.norm(left_eye[2] - left_eye[4])) / 2
-        left_eye_width = np.linalg.norm(left_eye[0] - left_eye[3])
-        
-        features['right_eye_aspect_ratio'] = right_eye_height / max(right_eye_width, 1e-6)
-        features['left_eye_aspect_ratio'] = left_eye_height / max(left_eye_width, 1e-6)
-        
-        # 口のアスペクト比
-        outer_mouth = normalized[48:60]
-        inner_mouth = normalized[60:68]
-        
-        mouth_width = np.linalg.norm(outer_mouth[0] - outer_mouth[6])
-        mouth_height_outer = np.linalg.norm(outer_mouth[3] - outer_mouth[9])
-        mouth_height_inner = np.linalg.norm(inner_mouth[2] - inner_mouth[6])
-        
-        features['mouth_width'] = mouth_width
-        features['mouth_height_outer'] = mouth_height_outer
-        features['mouth_height_inner'] = mouth_height_inner
-        features['mouth_aspect_ratio'] = mouth_height_outer / max(mouth_width, 1e-6)
-        
-        # 眉の位置（目からの相対距離）
-        right_eyebrow = normalized[17:22]
-        left_eyebrow = normalized[22:27]
-        
-        right_eye_center = np.mean(right_eye, axis=0)
-        left_eye_center = np.mean(left_eye, axis=0)
-        
-        features['right_brow_height'] = np.mean(right_eyebrow[:, 1]) - right_eye_center[1]
-        features['left_brow_height'] = np.mean(left_eyebrow[:, 1]) - left_eye_center[1]
-        
-        # 眉間の距離（正規化済み）
-        features['brow_distance'] = np.linalg.norm(right_eyebrow[4] - left_eyebrow[0])
-        
-        # 目の距離（正規化後は常に約1.0）
-        features['eye_distance'] = np.linalg.norm(right_eye_center - left_eye_center)
-        
-        # アライメント情報も含める
-        features['roll'] = alignment.roll
-        features['yaw'] = alignment.yaw
-        features['pitch'] = alignment.pitch
-        
-        return features
+        Args:
+            landmarks: 68点ランドマーク
+            alignment: 計算済みのアライメント情報（Noneの場合は自動計算）
+            normalized: 計算済みの正規化ランドマーク（Noneの場合は自動計算）
+        """
+        if alignment is None:
+            alignment = self.compute_alignment(landmarks)
+        if normalized is None:
+            normalized = self.normalize_landmarks(landmarks, alignment)
+        
+        # 正規化されたランドマークから特徴量を計算（Python の float でスカラー演算）
+        points = normalized.tolist()
+        (right_v1, right_v2, right_eye_width, left_v1, left_v2, left_eye_width,
+         mouth_width, mouth_height_outer, brow_distance) = [
+            _point_distance(points, a, b) for a, b in _DIST_PAIRS
+        ]
+        right_eye_height = (right_v1 + right_v2) / 2
+        left_eye_height = (left_v1 + left_v2) / 2
+        right_eye_cx, right_eye_cy = _mean_point(points, 36, 42)
+        left_eye_cx, left_eye_cy = _mean_point(points, 42, 48)
+        
+        # 辞書は最後に1回で組み立てる
+        return {
+            # 目のアスペクト比（回転補正済み）
+            'right_eye_aspect_ratio': right_eye_height / max(right_eye_width, 1e-6),
+            'left_eye_aspect_ratio': left_eye_height / max(left_eye_width, 1e-6),
+            # 口のアスペクト比
+            'mouth_width': mouth_width,
+            'mouth_height_outer': mouth_height_outer,
+            'mouth_height_inner': _point_distance(points, *_INNER_MOUTH_PAIR),
+            'mouth_aspect_ratio': mouth_height_outer / max(mouth_width, 1e-6),
+            # 眉の位置（目からの相対距離）
+            'right_brow_height': _mean_point(points, 17, 22)[1] - right_eye_cy,
+            'left_brow_height': _mean_point(points, 22, 27)[1] - left_eye_cy,
+            # 眉間の距離（正規化済み）
+            'brow_distance': brow_distance,
+            # 目の距離（正規化後は常に約1.0）
+            'eye_distance': math.hypot(right_eye_cx - left_eye_cx, right_eye_cy - left_eye_cy),
+            # アライメント情報も含める
+            'roll': alignment.roll,
+            'yaw': alignment.yaw,
+            'pitch': alignment.pitch,
+        }
 
 
 class FeatureExtractorWithAlignment:
@@ -256,19 +347,36 @@ class FeatureExtractorWithAlignment:
     
     def __init__(self):
         self._aligner = FaceAligner()
+        # 直前に正規化したランドマークとその結果
+        # （compute_distances と compute_angles は同じフレームで続けて呼ばれる）
+        self._last_landmarks: Optional[np.ndarray] = None
+        self._last_alignment: Optional[FaceAlignment] = None
+        self._last_normalized: Optional[np.ndarray] = None
+    
+    def _align(self, landmarks: np.ndarray) -> Tuple[FaceAlignment, np.ndarray]:
+        """アライメントと正規化ランドマークを返す（同じランドマークなら前回の結果を再利用）"""
+        last = self._last_landmarks
+        if last is not None and last.shape == landmarks.shape and np.array_equal(last, landmarks):
+            return self._last_alignment, self._last_normalized
+        alignment = self._aligner.compute_alignment(landmarks)
+        normalized = self._aligner.normalize_landmarks(landmarks, alignment)
+        self._last_landmarks = np.array(landmarks, copy=True)
+        self._last_alignment = alignment
+        self._last_normalized = normalized
+        return alignment, normalized
     
     def compute_distances(self, landmarks: np.ndarray) -> dict:
         """
         回転に不変な距離特徴を計算
         """
-        return self._aligner.compute_rotation_invariant_features(landmarks)
+        alignment, normalized = self._align(landmarks)
+        return self._aligner.compute_rotation_invariant_features(landmarks, alignment, normalized)
     
     def compute_angles(self, landmarks: np.ndarray) -> dict:
         """
         回転補正後の角度特徴を計算
         """
-        alignment = self._aligner.compute_alignment(landmarks)
-        normalized = self._aligner.normalize_landmarks(landmarks, alignment)
+        alignment, normalized = self._align(landmarks)
         
         # 正規化後のランドマークで角度を計算
         right_eyebrow = normalized[17:22]
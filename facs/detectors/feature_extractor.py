@@ -1,31 +1,53 @@
+import math
 import numpy as np
-from typing import Dict
+from typing import Dict, List, Tuple
 from ..core.interfaces import IFeatureExtractor
 
+# compute_distances で距離を測るランドマークの組 (始点, 終点)
+# 右目の縦2本・横、左目の縦2本・横、口の幅・外側の高さ、眉間
+_DIST_PAIRS = (
+    (37, 41), (38, 40), (36, 39),
+    (43, 47), (44, 46), (42, 45),
+    (48, 54), (51, 57), (21, 22),
+)
+# 内側の口の高さ（内側の唇があるランドマークのみ）
+_INNER_MOUTH_PAIR = (62, 66)
+
+
+def _point_distance(points: List[List[float]], a: int, b: int) -> float:
+    pa, pb = points[a], points[b]
+    return math.hypot(pa[0] - pb[0], pa[1] - pb[1])
+
+
+def _mean_point(points: List[List[float]], start: int, end: int) -> Tuple[float, float]:
+    """points[start:end] の重心"""
+    region = points[start:end]
+    n = len(region)
+    return sum(p[0] for p in region) / n, sum(p[1] for p in region) / n
+
+
+def _eye_center_distance(points: List[List[float]]) -> float:
+    """右目 (36-41) と左目 (42-47) の中心間距離"""
+    (rx, ry), (lx, ly) = _mean_point(points, 36, 42), _mean_point(points, 42, 48)
+    return math.hypot(rx - lx, ry - ly)
+
+
 class FeatureExtractor(IFeatureExtractor):
     """顔特徴量抽出器"""
     
     def compute_distances(self, landmarks: np.ndarray) -> Dict[str, float]:
-        right_eye = landmarks[36:42]
-        left_eye = landmarks[42:48]
-        outer_mouth = landmarks[48:60]
-        inner_mouth = landmarks[60:68]
-        right_eyebrow = landmarks[17:22]
-        left_eyebrow = landmarks[22:27]
-        
-        right_eye_height = (np.linalg.norm(right_eye[1] - right_eye[5]) + np.linalg.norm(right_eye[2] - right_eye[4])) / 2
-        right_eye_width = np.linalg.norm(right_eye[0] - right_eye[3])
-        left_eye_height = (np.linalg.norm(left_eye[1] - left_eye[5]) + np.linalg.norm(left_eye[2] - left_eye[4])) / 2
-        left_eye_width = np.linalg.norm(left_eye[0] - left_eye[3])
-        
-        mouth_width = np.linalg.norm(outer_mouth[0] - outer_mouth[6])
-        mouth_height_outer = np.linalg.norm(outer_mouth[3] - outer_mouth[9])
-        mouth_height_inner = np.linalg.norm(inner_mouth[2] - inner_mouth[6]) if len(inner_mouth) > 6 else 0
+        # 68点・2次元の小さな配列なので、NumPy の呼び出しを重ねるより
+        # Python の float に一度変換してスカラー演算する方が速い
+        points = landmarks.tolist()
+        (right_v1, right_v2, right_eye_width, left_v1, left_v2, left_eye_width,
+         mouth_width, mouth_height_outer, brow_distance) = [
+            _point_distance(points, a, b) for a, b in _DIST_PAIRS
+        ]
+        mouth_height_inner = _point_distance(points, *_INNER_MOUTH_PAIR) if len(points) > 66 else 0
         
-        brow_distance = np.linalg.norm(right_eyebrow[4] - left_eyebrow[0])
-        right_eye_center = np.mean(right_eye, axis=0)
-        left_eye_center = np.mean(left_eye, axis=0)
-        eye_distance = np.linalg.norm(right_eye_center - left_eye_center)
+        right_eye_height = (right_v1 + right_v2) / 2
+        left_eye_height = (left_v1 + left_v2) / 2
+        eye_distance = _eye_center_distance(points)
         
         return {
             "right_eye_aspect_ratio": right_eye_height / max(right_eye_width, 1e-6),
@@ -39,11 +61,11 @@ class FeatureExtractor(IFeatureExtractor):
         }
     
     def compute_angles(self, landmarks: np.ndarray) -> Dict[str, float]:
-        right_eyebrow = landmarks[17:22]
-        left_eyebrow = landmarks[22:27]
-        outer_mouth = landmarks[48:60]
+        # 眉の両端 (17, 21) と (22, 26) だけを Python の float で取り出す
+        (r0x, r0y), (r4x, r4y) = landmarks[17].tolist(), landmarks[21].tolist()
+        (l0x, l0y), (l4x, l4y) = landmarks[22].tolist(), landmarks[26].tolist()
         
-        right_brow_angle = np.degrees(np.arctan2(right_eyebrow[0][1] - right_eyebrow[4][1], right_eyebrow[0][0] - right_eyebrow[4][0]))
-        left_brow_angle = np.degrees(np.arctan2(left_eyebrow[4][1] - left_eyebrow[0][1], left_eyebrow[4][0] - left_eyebrow[0][0]))
+        right_brow_angle = math.degrees(math.atan2(r0y - r4y, r0x - r4x))
+        left_brow_angle = math.degrees(math.atan2(l4y - l0y, l4x - l0x))
         
         return {'right_brow_angle': right_brow_angle, 'left_brow_angle': left_brow_angle}
@@ -7,11 +7,30 @@ import cv2
 from typing import List, Optional, Tuple
 from abc import ABC
 import os
+import threading
 import urllib.request
 
 from ..core.interfaces import ILandmarkDetector
 from ..core.enums import DetectorType
 
+
+def _landmarks_to_array(landmarks, w: int, h: int) -> np.ndarray:
+    """MediaPipe の正規化座標 (x, y) を (N, 2) float32 のピクセル座標配列にまとめる"""
+    # スケールは float64 で行い、最後に float32 にする（従来の点ごとの計算と同じ値になる）
+    points = np.array(([lm.x for lm in landmarks], [lm.y for lm in landmarks])).T
+    points *= (w, h)
+    return points.astype(np.float32)
+
+
+# OpenCVフォールバックで生成する近似ランドマーク（478点）の角度と半径の係数
+_APPROX_POINTS = 478
+_APPROX_T = np.arange(_APPROX_POINTS) / float(_APPROX_POINTS)
+_APPROX_ANGLES = _APPROX_T * 2 * np.pi * 3
+_APPROX_COS = np.cos(_APPROX_ANGLES)
+_APPROX_SIN = np.sin(_APPROX_ANGLES)
+_APPROX_RADIUS = 0.3 + 0.2 * np.sin(_APPROX_T * np.pi * 5)
+
+
 class BaseLandmarkDetector(ILandmarkDetector, ABC):
     """ランドマーク検出器の基底クラス"""
     
@@ -78,11 +97,36 @@ class MediaPipeLandmarkDetector(BaseLandmarkDetector):
     MODEL_URL = "https://storage.googleapis.com/mediapipe-models/face_landmarker/face_landmarker/float16/1/face_landmarker.task"
     MODEL_FILENAME = "face_landmarker.task"
     
-    def __init__(self):
+    # 解決済みのモデルパス（全インスタンスで共有）
+    _cached_model_path: Optional[str] = None
+    _model_path_lock = threading.Lock()
+    
+    def __init__(self, image_is_rgb: bool = False, max_num_faces: int = 1,
+                 refine_landmarks: bool = False):
+        """
+        Args:
+            image_is_rgb: 入力画像がすでにRGB順か（Trueの場合BGR→RGB変換を省く）
+            max_num_faces: 検出する顔の最大数（解析に使うのは先頭の顔のみ）
+            refine_landmarks: solutions API で虹彩・唇の精緻化モデルを使うか。
+                68点へのマッピングは虹彩の点 (468-477) を使わないため、通常は不要
+        """
+        self.image_is_rgb = image_is_rgb
+        self._max_num_faces = max_num_faces
+        self._refine_landmarks = refine_landmarks
+        # BGR→RGB変換の出力先（サイズが変わったら作り直す）
+        self._rgb_buffer: Optional[np.ndarray] = None
         self._mapping = self.get_mediapipe_to_68_mapping()
+        # 68点を1回のインデックス参照で取り出すための配列
+        self._mapping_np = np.asarray(self._mapping, dtype=np.intp)
+        self._mapping_min_points = int(self._mapping_np.max()) + 1
         self._api_type = None
         self._face_mesh = None
         self._face_landmarker = None
+        # OpenCVフォールバック用の顔検出器（初回使用時に読み込む）
+        self._face_cascade = None
+        # detect_landmarks_batch 用の VIDEO モードの検出器と、最後に渡したタイムスタンプ
+        self._video_landmarker = None
+        self._video_timestamp_ms = 0
         self._init_mediapipe()
     
     def _download_model(self, url: str, path: str) -> bool:
@@ -139,7 +183,25 @@ class MediaPipeLandmarkDetector(BaseLandmarkDetector):
         return False
     
     def _get_model_path(self) -> str:
-        """モデルファイルのパスを取得（必要に応じてダウンロード）"""
+        """モデルファイルのパスを取得（必要に応じてダウンロード）
+
+        見つかったパスはクラスで保持し、2つ目以降のインスタンスではファイルを探さない。
+        """
+        cached = MediaPipeLandmarkDetector._cached_model_path
+        if cached is not None:
+            return cached
+        
+        # 複数スレッドで同時に作られた場合もダウンロードは1回だけ
+        with MediaPipeLandmarkDetector._model_path_lock:
+            if MediaPipeLandmarkDetector._cached_model_path is None:
+                path = self._find_or_download_model()
+                if path:
+                    MediaPipeLandmarkDetector._cached_model_path = path
+                return path
+            return MediaPipeLandmarkDetector._cached_model_path
+    
+    def _find_or_download_model(self) -> str:
+        """候補パスからモデルを探し、なければダウンロード"""
         # モデルの保存場所
         model_dir = os.path.join(os.path.dirname(__file__), "..", "..", "models")
         os.makedirs(model_dir, exist_ok=True)
@@ -188,25 +250,13 @@ class MediaPipeLandmarkDetector(BaseLandmarkDetector):
     def _try_init_tasks_api(self) -> bool:
         """Tasks APIの初期化を試行"""
         try:
-            from mediapipe.tasks import python as mp_tasks
             from mediapipe.tasks.python import vision
             
-            model_path = self._get_model_path()
-            if not model_path or not os.path.exists(model_path):
+            options = self._landmarker_options(vision.RunningMode.IMAGE)
+            if options is None:
                 print("Tasks API: モデルファイルが見つかりません")
                 return False
             
-            base_options = mp_tasks.BaseOptions(model_asset_path=model_path)
-            options = vision.FaceLandmarkerOptions(
-                base_options=base_options,
-                running_mode=vision.RunningMode.IMAGE,
-                num_faces=10,
-                min_face_detection_confidence=0.5,
-                min_face_presence_confidence=0.5,
-                min_tracking_confidence=0.5,
-                output_face_blendshapes=False,
-                output_facial_transformation_matrixes=False
-            )
             self._face_landmarker = vision.FaceLandmarker.create_from_options(options)
             self._api_type = 'tasks'
             print("MediaPipe Tasks API使用")
@@ -216,6 +266,26 @@ class MediaPipeLandmarkDetector(BaseLandmarkDetector):
             print(f"Tasks API初期化失敗: {e}")
             return False
     
+    def _landmarker_options(self, running_mode):
+        """FaceLandmarker のオプション（モデルファイルがない場合は None）"""
+        from mediapipe.tasks import python as mp_tasks
+        from mediapipe.tasks.python import vision
+        
+        model_path = self._get_model_path()
+        if not model_path or not os.path.exists(model_path):
+            return None
+        
+        return vision.FaceLandmarkerOptions(
+            base_options=mp_tasks.BaseOptions(model_asset_path=model_path),
+            running_mode=running_mode,
+            num_faces=self._max_num_faces,
+            min_face_detection_confidence=0.5,
+            min_face_presence_confidence=0.5,
+            min_tracking_confidence=0.5,
+            output_face_blendshapes=False,
+            output_facial_transformation_matrixes=False
+        )
+    
     def _try_init_solutions_api(self) -> bool:
         """solutions APIの初期化を試行"""
         try:
@@ -225,8 +295,8 @@ class MediaPipeLandmarkDetector(BaseLandmarkDetector):
             
             self._face_mesh = mp.solutions.face_mesh.FaceMesh(
                 static_image_mode=True,
-                max_num_faces=10,
-                refine_landmarks=True,
+                max_num_faces=self._max_num_faces,
+                refine_landmarks=self._refine_landmarks,
                 min_detection_confidence=0.5,
                 min_tracking_confidence=0.5
             )
@@ -245,10 +315,9 @@ class MediaPipeLandmarkDetector(BaseLandmarkDetector):
         
         faces = []
         for landmarks in landmarks_list:
-            x_coords = [lm[0] for lm in landmarks]
-            y_coords = [lm[1] for lm in landmarks]
-            x_min, x_max = min(x_coords), max(x_coords)
-            y_min, y_max = min(y_coords), max(y_coords)
+            landmarks = np.asarray(landmarks)
+            x_min, y_min = landmarks.min(axis=0).tolist()
+            x_max, y_max = landmarks.max(axis=0).tolist()
             padding = 0.1
             w, h = x_max - x_min, y_max - y_min
             faces.append((
@@ -264,17 +333,89 @@ class MediaPipeLandmarkDetector(BaseLandmarkDetector):
         landmarks_list = self._get_raw_landmarks(image)
         if not landmarks_list:
             return None
+        return self._to_68_points(landmarks_list[0])
+    
+    def detect_landmarks_batch(self, images: List[np.ndarray],
+                               frame_interval_ms: int = 33) -> List[Optional[np.ndarray]]:
+        """
+        動画の連続フレームのランドマークをまとめて検出
         
-        raw_landmarks = landmarks_list[0]
-        landmarks_68 = np.zeros((68, 2), dtype=np.float32)
-        for i, mp_idx in enumerate(self._mapping):
-            if mp_idx < len(raw_landmarks):
-                landmarks_68[i] = [raw_landmarks[mp_idx][0], raw_landmarks[mp_idx][1]]
+        Tasks API では VIDEO モードの検出器に detect_for_video で続けて渡し、
+        前フレームの顔の追跡を使って検出を省く。それ以外は1枚ずつ detect_landmarks で検出する。
         
+        Args:
+            images: 時刻順のフレームのリスト
+            frame_interval_ms: フレーム間隔（ミリ秒）。VIDEO モードのタイムスタンプに使う
+            
+        Returns:
+            フレームごとの68点ランドマーク（顔がなければ None）
+        """
+        landmarker = self._get_video_landmarker() if self._api_type == 'tasks' else None
+        if landmarker is None:
+            return [self.detect_landmarks(image) for image in images]
+        
+        import mediapipe as mp
+        
+        results: List[Optional[np.ndarray]] = []
+        for image in images:
+            h, w = image.shape[:2]
+            # タイムスタンプは呼び出しをまたいで単調増加させる
+            self._video_timestamp_ms += max(1, int(frame_interval_ms))
+            try:
+                mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=self._to_rgb(image))
+                result = landmarker.detect_for_video(mp_image, self._video_timestamp_ms)
+            except Exception as e:
+                print(f"Tasks API処理エラー: {e}")
+                results.append(self.detect_landmarks(image))
+                continue
+            if result.face_landmarks:
+                results.append(self._to_68_points(_landmarks_to_array(result.face_landmarks[0], w, h)))
+            else:
+                results.append(None)
+        return results
+    
+    def _get_video_landmarker(self):
+        """VIDEO モードの FaceLandmarker（初回に作成、作れない場合は None）"""
+        if self._video_landmarker is None:
+            try:
+                from mediapipe.tasks.python import vision
+                options = self._landmarker_options(vision.RunningMode.VIDEO)
+                if options is not None:
+                    self._video_landmarker = vision.FaceLandmarker.create_from_options(options)
+            except Exception as e:
+                print(f"Tasks API (VIDEO) 初期化失敗: {e}")
+        return self._video_landmarker
+    
+    def _to_68_points(self, raw_landmarks: np.ndarray) -> np.ndarray:
+        """生のランドマーク (N, 2) から68点を取り出す"""
+        raw_landmarks = np.asarray(raw_landmarks)
+        mapping = self._mapping_np
+        if len(raw_landmarks) >= self._mapping_min_points:
+            return raw_landmarks[mapping].astype(np.float32, copy=False)
+        
+        # 点数が足りない場合、存在しない点は0のまま
+        landmarks_68 = np.zeros((68, 2), dtype=np.float32)
+        valid = mapping < len(raw_landmarks)
+        landmarks_68[valid] = raw_landmarks[mapping[valid]]
         return landmarks_68
     
-    def _get_raw_landmarks(self, image: np.ndarray) -> List[List[Tuple[float, float]]]:
-        """生のランドマークを取得"""
+    def _to_rgb(self, image: np.ndarray) -> np.ndarray:
+        """MediaPipeに渡すRGB画像（変換結果は使い回すバッファに書き込む）
+
+        mp.Image は C 連続の uint8 配列ならそのまま参照できるため、返す配列は常に C 連続にする。
+        """
+        if len(image.shape) == 3 and self.image_is_rgb:
+            # スライスなど非連続の入力だけコピーする
+            return np.ascontiguousarray(image)
+        h, w = image.shape[:2]
+        buffer = self._rgb_buffer
+        if buffer is None or buffer.shape[:2] != (h, w) or buffer.dtype != image.dtype:
+            buffer = self._rgb_buffer = np.empty((h, w, 3), dtype=image.dtype)
+        code = cv2.COLOR_GRAY2RGB if len(image.shape) == 2 else cv2.COLOR_BGR2RGB
+        return cv2.cvtColor(image, code, dst=buffer)
+    
+    def _get_raw_landmarks(self, image: np.ndarray) -> List[np.ndarray]:
+        """生のランドマークを取得（顔ごとの (N, 2) float32 配列のリスト）"""
         if self._api_type == 'tasks':
             return self._get_landmarks_tasks_api(image)
         elif self._api_type == 'solutions':
@@ -282,19 +423,16 @@ class MediaPipeLandmarkDetector(BaseLandmarkDetector):
         else:
             return self._get_landmarks_opencv(image)
     
-    def _get_landmarks_tasks_api(self, image: np.ndarray) -> List[List[Tuple[float, float]]]:
+    def _get_landmarks_tasks_api(self, image: np.ndarray) -> List[np.ndarray]:
         """Tasks API"""
         try:
             import mediapipe as mp
             
-            if len(image.shape) == 2:
-                image_rgb = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
-            else:
-                image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            image_rgb = self._to_rgb(image)
             
             h, w = image.shape[:2]
             
-            # MediaPipe Imageを作成
+            # MediaPipe Imageを作成（RGBバッファをそのまま渡す）
             mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=image_rgb)
             
             result = self._face_landmarker.detect(mp_image)
@@ -302,26 +440,18 @@ class MediaPipeLandmarkDetector(BaseLandmarkDetector):
             if not result.face_landmarks:
                 return []
             
-            all_landmarks = []
-            for face in result.face_landmarks:
-                landmarks = [(lm.x * w, lm.y * h) for lm in face]
-                all_landmarks.append(landmarks)
-            
-            return all_landmarks
+            return [_landmarks_to_array(face, w, h) for face in result.face_landmarks]
             
         except Exception as e:
             print(f"Tasks API処理エラー: {e}")
             return self._get_landmarks_opencv(image)
     
-    def _get_landmarks_solutions_api(self, image: np.ndarray) -> List[List[Tuple[float, float]]]:
+    def _get_landmarks_solutions_api(self, image: np.ndarray) -> List[np.ndarray]:
         """solutions API"""
         if self._face_mesh is None:
             return []
         
-        if len(image.shape) == 2:
-            image_rgb = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
-        else:
-            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        image_rgb = self._to_rgb(image)
         
         h, w = image.shape[:2]
         
@@ -330,23 +460,25 @@ class MediaPipeLandmarkDetector(BaseLandmarkDetector):
             if not results.multi_face_landmarks:
                 return []
             
-            return [[(lm.x * w, lm.y * h) for lm in face.landmark]
+            return [_landmarks_to_array(face.landmark, w, h)
                     for face in results.multi_face_landmarks]
         except Exception as e:
             print(f"solutions API処理エラー: {e}")
             return []
     
-    def _get_landmarks_opencv(self, image: np.ndarray) -> List[List[Tuple[float, float]]]:
+    def _get_landmarks_opencv(self, image: np.ndarray) -> List[np.ndarray]:
         """OpenCVフォールバック（顔検出のみ、ランドマークは近似）"""
         if len(image.shape) == 3:
             gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         else:
             gray = image
         
-        face_cascade = cv2.CascadeClassifier(
-            cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-        )
-        faces = face_cascade.detectMultiScale(gray, 1.1, 5, minSize=(30, 30))
+        if self._face_cascade is None:
+            # XMLの読み込みはフレームごとに行わない
+            self._face_cascade = cv2.CascadeClassifier(
+                cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+            )
+        faces = self._face_cascade.detectMultiScale(gray, 1.1, 5, minSize=(30, 30))
         
         if len(faces) == 0:
             return []
@@ -358,20 +490,15 @@ class MediaPipeLandmarkDetector(BaseLandmarkDetector):
         
         return results
     
-    def _generate_approximate_landmarks(self, x: int, y: int, w: int, h: int) -> List[Tuple[float, float]]:
-        """顔矩形から近似的なランドマークを生成"""
-        landmarks = []
+    def _generate_approximate_landmarks(self, x: int, y: int, w: int, h: int) -> np.ndarray:
+        """顔矩形から近似的なランドマーク (478, 2) float32 を生成"""
         cx, cy = x + w / 2, y + h / 2
         
-        # 478点の近似位置を生成
-        for i in range(478):
-            t = i / 478.0
-            angle = t * 2 * np.pi * 3
-            r = (0.3 + 0.2 * np.sin(t * np.pi * 5)) * min(w, h) / 2
-            lx = cx + r * np.cos(angle)
-            ly = cy + r * np.sin(angle) * 0.8 + h * 0.1
-            landmarks.append((lx, ly))
-        
+        # 478点の近似位置（角度ごとの cos/sin と半径の係数は事前計算した表を使う）
+        r = _APPROX_RADIUS * (min(w, h) / 2)
+        landmarks = np.empty((_APPROX_POINTS, 2), dtype=np.float32)
+        landmarks[:, 0] = cx + r * _APPROX_COS
+        landmarks[:, 1] = cy + r * _APPROX_SIN * 0.8 + h * 0.1
         return landmarks
 
 
@@ -403,7 +530,8 @@ class DlibLandmarkDetector(BaseLandmarkDetector):
             rect = dlib.rectangle(x, y, x + w, y + h)
         
         shape = self._predictor(gray, rect)
-        return np.array([[shape.part(i).x, shape.part(i).y] for i in range(68)], dtype=np.float32)
+        # shape.part(i) を点ごとに2回呼ばず、parts() を1回だけ走査する
+        return np.array([(p.x, p.y) for p in shape.parts()], dtype=np.float32)
 
 
 class LandmarkDetectorFactory:
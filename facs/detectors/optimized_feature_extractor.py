@@ -2,6 +2,7 @@
 最適化された特徴量抽出器
 NumPyのブロードキャスト演算を活用して高速に特徴量を計算
 """
+import math
 import numpy as np
 from typing import Dict, Tuple
 from ..core.interfaces import IFeatureExtractor
@@ -46,6 +47,15 @@ class OptimizedFeatureExtractor(IFeatureExtractor):
         # 目のアスペクト比計算用
         self._right_eye_v_pairs = np.array([[37, 41], [38, 40]])
         self._left_eye_v_pairs = np.array([[43, 47], [44, 46]])
+        
+        # compute_distances で1回にまとめて測る距離の組 (始点, 終点)
+        # 内唇の組は最後に置き、内唇のないランドマークでは除いて使う
+        pairs = (self.RIGHT_EYE_V1, self.RIGHT_EYE_V2, self.RIGHT_EYE_H,
+                 self.LEFT_EYE_V1, self.LEFT_EYE_V2, self.LEFT_EYE_H,
+                 self.MOUTH_WIDTH, self.MOUTH_HEIGHT_OUTER, self.BROW_DIST,
+                 self.MOUTH_HEIGHT_INNER)
+        self._pair_idx_a = np.array([a for a, _ in pairs])
+        self._pair_idx_b = np.array([b for _, b in pairs])
     
     def compute_distances(self, landmarks: np.ndarray) -> Dict[str, float]:
         """
@@ -58,41 +68,24 @@ class OptimizedFeatureExtractor(IFeatureExtractor):
             距離特徴量の辞書
         """
         # ========================================
-        # 目のアスペクト比（EAR）を一括計算
+        # 全ての組の距離を1回の gather + hypot で計算
         # ========================================
-        # 右目
-        right_eye_v1 = np.linalg.norm(landmarks[37] - landmarks[41])
-        right_eye_v2 = np.linalg.norm(landmarks[38] - landmarks[40])
-        right_eye_height = (right_eye_v1 + right_eye_v2) / 2
-        right_eye_width = np.linalg.norm(landmarks[36] - landmarks[39])
+        idx_a, idx_b = self._pair_idx_a, self._pair_idx_b
+        if landmarks.shape[0] <= 66:
+            idx_a, idx_b = idx_a[:-1], idx_b[:-1]
+        diffs = landmarks[idx_a] - landmarks[idx_b]
+        dists = np.hypot(diffs[:, 0], diffs[:, 1]).tolist()
+        (right_eye_v1, right_eye_v2, right_eye_width,
+         left_eye_v1, left_eye_v2, left_eye_width,
+         mouth_width, mouth_height_outer, brow_distance) = dists[:9]
+        mouth_height_inner = dists[9] if len(dists) > 9 else 0.0
         
-        # 左目
-        left_eye_v1 = np.linalg.norm(landmarks[43] - landmarks[47])
-        left_eye_v2 = np.linalg.norm(landmarks[44] - landmarks[46])
+        right_eye_height = (right_eye_v1 + right_eye_v2) / 2
         left_eye_height = (left_eye_v1 + left_eye_v2) / 2
-        left_eye_width = np.linalg.norm(landmarks[42] - landmarks[45])
-        
-        # ========================================
-        # 口の距離
-        # ========================================
-        mouth_width = np.linalg.norm(landmarks[48] - landmarks[54])
-        mouth_height_outer = np.linalg.norm(landmarks[51] - landmarks[57])
-        
-        # 内唇（存在確認）
-        if landmarks.shape[0] > 66:
-            mouth_height_inner = np.linalg.norm(landmarks[62] - landmarks[66])
-        else:
-            mouth_height_inner = 0.0
-        
-        # ========================================
-        # 眉と目の距離
-        # ========================================
-        brow_distance = np.linalg.norm(landmarks[21] - landmarks[22])
         
-        # 目の中心間距離（ベクトル演算）
-        right_eye_center = np.mean(landmarks[36:42], axis=0)
-        left_eye_center = np.mean(landmarks[42:48], axis=0)
-        eye_distance = np.linalg.norm(right_eye_center - left_eye_center)
+        # 目の中心間距離（右目・左目の中心を1回の和と定数倍で求める。np.mean より呼び出しが軽い）
+        (rx, ry), (lx, ly) = (landmarks[36:48].reshape(2, 6, 2).sum(axis=1) * (1 / 6)).tolist()
+        eye_distance = math.hypot(rx - lx, ry - ly)
         
         # ========================================
         # 安全な除算でアスペクト比計算
@@ -103,18 +96,18 @@ class OptimizedFeatureExtractor(IFeatureExtractor):
         mar = mouth_height_outer / max(mouth_width, eps)
         
         return {
-            "right_eye_aspect_ratio": float(right_ear),
-            "left_eye_aspect_ratio": float(left_ear),
-            "right_eye_height": float(right_eye_height),
-            "left_eye_height": float(left_eye_height),
-            "right_eye_width": float(right_eye_width),
-            "left_eye_width": float(left_eye_width),
-            "mouth_width": float(mouth_width),
-            "mouth_height_outer": float(mouth_height_outer),
-            "mouth_height_inner": float(mouth_height_inner),
-            "mouth_aspect_ratio": float(mar),
-            "brow_distance": float(brow_distance),
-            "eye_distance": float(max(eye_distance, eps)),
+            "right_eye_aspect_ratio": right_ear,
+            "left_eye_aspect_ratio": left_ear,
+            "right_eye_height": right_eye_height,
+            "left_eye_height": left_eye_height,
+            "right_eye_width": right_eye_width,
+            "left_eye_width": left_eye_width,
+            "mouth_width": mouth_width,
+            "mouth_height_outer": mouth_height_outer,
+            "mouth_height_inner": mouth_height_inner,
+            "mouth_aspect_ratio": mar,
+            "brow_distance": brow_distance,
+            "eye_distance": max(eye_distance, eps),
         }
     
     def compute_angles(self, landmarks: np.ndarray) -> Dict[str, float]:
@@ -127,17 +120,16 @@ class OptimizedFeatureExtractor(IFeatureExtractor):
         Returns:
             角度特徴量の辞書
         """
-        # 眉の角度をベクトル演算で計算
-        right_brow_vec = landmarks[17] - landmarks[21]
-        left_brow_vec = landmarks[26] - landmarks[22]
+        # 2点ずつのスカラー計算なので、ufunc を呼ばず Python の float で計算する
+        (r0x, r0y), (r4x, r4y) = landmarks[17].tolist(), landmarks[21].tolist()
+        (l0x, l0y), (l4x, l4y) = landmarks[22].tolist(), landmarks[26].tolist()
         
-        # arctan2をベクトル化
-        right_brow_angle = np.degrees(np.arctan2(right_brow_vec[1], right_brow_vec[0]))
-        left_brow_angle = np.degrees(np.arctan2(left_brow_vec[1], left_brow_vec[0]))
+        right_brow_angle = math.degrees(math.atan2(r0y - r4y, r0x - r4x))
+        left_brow_angle = math.degrees(math.atan2(l4y - l0y, l4x - l0x))
         
         return {
-            'right_brow_angle': float(right_brow_angle),
-            'left_brow_angle': float(left_brow_angle)
+            'right_brow_angle': right_brow_angle,
+            'left_brow_angle': left_brow_angle
         }
     
     def compute_all(self, landmarks: np.ndarray) -> Tuple[Dict[str, float], Dict[str, float]]:
@@ -156,70 +148,71 @@ class OptimizedFeatureExtractor(IFeatureExtractor):
 class BatchFeatureExtractor(OptimizedFeatureExtractor):
     """バッチ処理対応の特徴量抽出器"""
     
+    # compute_distances_batch_array の列の並び（compute_distances の辞書のキーと同じ順序）
+    DIST_COLUMNS = (
+        "right_eye_aspect_ratio", "left_eye_aspect_ratio",
+        "right_eye_height", "left_eye_height",
+        "right_eye_width", "left_eye_width",
+        "mouth_width", "mouth_height_outer", "mouth_height_inner",
+        "mouth_aspect_ratio", "brow_distance", "eye_distance",
+    )
+    
     def compute_distances_batch(self, landmarks_batch: np.ndarray) -> list:
         """
         複数フレームの距離特徴量をバッチで計算
         
+        フレームごとに辞書を作るため、大きなバッチでは
+        compute_distances_batch_array の方が速い。
+        
         Args:
             landmarks_batch: (N, 68, 2)のランドマーク配列
             
         Returns:
             N個の距離特徴量辞書のリスト
         """
-        batch_size = landmarks_batch.shape[0]
+        columns = self.DIST_COLUMNS
+        return [dict(zip(columns, row)) for row in self._distance_columns(landmarks_batch).tolist()]
+    
+    def compute_distances_batch_array(self, landmarks_batch: np.ndarray,
+                                      dtype=np.float32) -> np.ndarray:
+        """
+        複数フレームの距離特徴量を (N, 12) の配列で計算（辞書を作らない）
+        
+        Args:
+            landmarks_batch: (N, 68, 2)のランドマーク配列
+            dtype: 出力の型
+            
+        Returns:
+            (N, 12) の配列。列の並びは DIST_COLUMNS
+        """
+        return self._distance_columns(landmarks_batch).astype(dtype, copy=False)
+    
+    def _distance_columns(self, landmarks_batch: np.ndarray) -> np.ndarray:
+        """距離特徴量を DIST_COLUMNS の順に並べた (N, 12) の float32 配列"""
+        # 中間配列は全て float32 で計算する（バッチが大きいほど転送量の削減が効く）
+        landmarks_batch = np.asarray(landmarks_batch, dtype=np.float32)
         
         # ========================================
-        # ベクトル化されたバッチ計算
+        # 全ての組の距離を1回の gather + hypot で計算 → (N, K)
         # ========================================
+        idx_a, idx_b = self._pair_idx_a, self._pair_idx_b
+        has_inner = landmarks_batch.shape[1] > 66
+        if not has_inner:
+            idx_a, idx_b = idx_a[:-1], idx_b[:-1]
+        diffs = landmarks_batch[:, idx_a] - landmarks_batch[:, idx_b]
+        dists = np.hypot(diffs[..., 0], diffs[..., 1])
         
-        # 目の垂直距離（バッチ）
-        right_eye_v1 = np.linalg.norm(
-            landmarks_batch[:, 37] - landmarks_batch[:, 41], axis=1
-        )
-        right_eye_v2 = np.linalg.norm(
-            landmarks_batch[:, 38] - landmarks_batch[:, 40], axis=1
-        )
-        right_eye_heights = (right_eye_v1 + right_eye_v2) / 2
-        right_eye_widths = np.linalg.norm(
-            landmarks_batch[:, 36] - landmarks_batch[:, 39], axis=1
-        )
+        right_eye_widths, left_eye_widths = dists[:, 2], dists[:, 5]
+        mouth_widths, mouth_heights_outer = dists[:, 6], dists[:, 7]
+        right_eye_heights = (dists[:, 0] + dists[:, 1]) / 2
+        left_eye_heights = (dists[:, 3] + dists[:, 4]) / 2
+        mouth_heights_inner = dists[:, 9] if has_inner else np.zeros(landmarks_batch.shape[0], dtype=np.float32)
         
-        left_eye_v1 = np.linalg.norm(
-            landmarks_batch[:, 43] - landmarks_batch[:, 47], axis=1
-        )
-        left_eye_v2 = np.linalg.norm(
-            landmarks_batch[:, 44] - landmarks_batch[:, 46], axis=1
-        )
-        left_eye_heights = (left_eye_v1 + left_eye_v2) / 2
-        left_eye_widths = np.linalg.norm(
-            landmarks_batch[:, 42] - landmarks_batch[:, 45], axis=1
-        )
-        
-        # 口の距離（バッチ）
-        mouth_widths = np.linalg.norm(
-            landmarks_batch[:, 48] - landmarks_batch[:, 54], axis=1
-        )
-        mouth_heights_outer = np.linalg.norm(
-            landmarks_batch[:, 51] - landmarks_batch[:, 57], axis=1
-        )
-        
-        # 内唇
-        if landmarks_batch.shape[1] > 66:
-            mouth_heights_inner = np.linalg.norm(
-                landmarks_batch[:, 62] - landmarks_batch[:, 66], axis=1
-            )
-        else:
-            mouth_heights_inner = np.zeros(batch_size)
-        
-        # 眉間距離（バッチ）
-        brow_distances = np.linalg.norm(
-            landmarks_batch[:, 21] - landmarks_batch[:, 22], axis=1
-        )
-        
-        # 目の中心間距離（バッチ）
-        right_eye_centers = np.mean(landmarks_batch[:, 36:42], axis=1)
-        left_eye_centers = np.mean(landmarks_batch[:, 42:48], axis=1)
-        eye_distances = np.linalg.norm(right_eye_centers - left_eye_centers, axis=1)
+        # 目の中心間距離（右目・左目の中心を1回の和と定数倍で求める）
+        eye_centers = landmarks_batch[:, 36:48].reshape(-1, 2, 6, 2).sum(axis=2)
+        eye_centers *= 1 / 6
+        center_diffs = eye_centers[:, 0] - eye_centers[:, 1]
+        eye_distances = np.hypot(center_diffs[:, 0], center_diffs[:, 1])
         
         # アスペクト比（バッチ）
         eps = 1e-6
@@ -227,25 +220,13 @@ class BatchFeatureExtractor(OptimizedFeatureExtractor):
         left_ears = left_eye_heights / np.maximum(left_eye_widths, eps)
         mars = mouth_heights_outer / np.maximum(mouth_widths, eps)
         
-        # 結果をリストに変換
-        results = []
-        for i in range(batch_size):
-            results.append({
-                "right_eye_aspect_ratio": float(right_ears[i]),
-                "left_eye_aspect_ratio": float(left_ears[i]),
-                "right_eye_height": float(right_eye_heights[i]),
-                "left_eye_height": float(left_eye_heights[i]),
-                "right_eye_width": float(right_eye_widths[i]),
-                "left_eye_width": float(left_eye_widths[i]),
-                "mouth_width": float(mouth_widths[i]),
-                "mouth_height_outer": float(mouth_heights_outer[i]),
-                "mouth_height_inner": float(mouth_heights_inner[i]),
-                "mouth_aspect_ratio": float(mars[i]),
-                "brow_distance": float(brow_distances[i]),
-                "eye_distance": float(max(eye_distances[i], eps)),
-            })
-        
-        return results
+        return np.column_stack((
+            right_ears, left_ears,
+            right_eye_heights, left_eye_heights,
+            right_eye_widths, left_eye_widths,
+            mouth_widths, mouth_heights_outer, mouth_heights_inner,
+            mars, dists[:, 8], np.maximum(eye_distances, eps),
+        ))
     
     def compute_angles_batch(self, landmarks_batch: np.ndarray) -> list:
         """
@@ -1,7 +1,9 @@
+import math
 import numpy as np
 from typing import Dict, Tuple, List
 
 from ...core.interfaces import IAUDetectionStrategy
+from ...core.models import FeatureVector
 
 class BaseAUStrategy(IAUDetectionStrategy):
     """AU検出戦略の基底クラス"""
@@ -24,7 +26,7 @@ class AU1Strategy(BaseAUStrategy):
     """AU1: Inner Brow Raiser"""
     _au_number = 1
     
-    def detect(self, landmarks: np.ndarray, distances: Dict, angles: Dict, eye_dist: float) -> Tuple[float, float]:
+    def detect(self, landmarks: np.ndarray, feats: FeatureVector, angles: Dict, eye_dist: float) -> Tuple[float, float]:
         right_dist = (landmarks[27][1] - landmarks[21][1]) / eye_dist
         left_dist = (landmarks[27][1] - landmarks[22][1]) / eye_dist
         return self._compute_bilateral_score(right_dist, left_dist, 0.18, 0.12)
@@ -33,7 +35,7 @@ class AU2Strategy(BaseAUStrategy):
     """AU2: Outer Brow Raiser"""
     _au_number = 2
     
-    def detect(self, landmarks: np.ndarray, distances: Dict, angles: Dict, eye_dist: float) -> Tuple[float, float]:
+    def detect(self, landmarks: np.ndarray, feats: FeatureVector, angles: Dict, eye_dist: float) -> Tuple[float, float]:
         right_dist = (landmarks[36][1] - landmarks[17][1]) / eye_dist
         left_dist = (landmarks[45][1] - landmarks[26][1]) / eye_dist
         return self._compute_bilateral_score(right_dist, left_dist, 0.15, 0.1)
@@ -42,8 +44,8 @@ class AU4Strategy(BaseAUStrategy):
     """AU4: Brow Lowerer"""
     _au_number = 4
     
-    def detect(self, landmarks: np.ndarray, distances: Dict, angles: Dict, eye_dist: float) -> Tuple[float, float]:
-        brow_dist = distances.get("brow_distance", eye_dist * 0.3) / eye_dist
+    def detect(self, landmarks: np.ndarray, feats: FeatureVector, angles: Dict, eye_dist: float) -> Tuple[float, float]:
+        brow_dist = feats.brow_distance / eye_dist
         dist_score = max(0, (0.35 - brow_dist) / 0.12)
         return min(dist_score, 1.0), 0.0
 
@@ -51,20 +53,20 @@ class AU5Strategy(BaseAUStrategy):
     """AU5: Upper Lid Raiser"""
     _au_number = 5
     
-    def detect(self, landmarks: np.ndarray, distances: Dict, angles: Dict, eye_dist: float) -> Tuple[float, float]:
-        right_ear = distances.get("right_eye_aspect_ratio", 0.25)
-        left_ear = distances.get("left_eye_aspect_ratio", 0.25)
+    def detect(self, landmarks: np.ndarray, feats: FeatureVector, angles: Dict, eye_dist: float) -> Tuple[float, float]:
+        right_ear = feats.right_eye_aspect_ratio
+        left_ear = feats.left_eye_aspect_ratio
         return self._compute_bilateral_score(right_ear, left_ear, 0.28, 0.12)
 
 class AU6Strategy(BaseAUStrategy):
     """AU6: Cheek Raiser"""
     _au_number = 6
     
-    def detect(self, landmarks: np.ndarray, distances: Dict, angles: Dict, eye_dist: float) -> Tuple[float, float]:
+    def detect(self, landmarks: np.ndarray, feats: FeatureVector, angles: Dict, eye_dist: float) -> Tuple[float, float]:
         right_bottom = (landmarks[40] + landmarks[41]) / 2
         left_bottom = (landmarks[46] + landmarks[47]) / 2
-        right_dist = np.linalg.norm(right_bottom - landmarks[48]) / eye_dist
-        left_dist = np.linalg.norm(left_bottom - landmarks[54]) / eye_dist
+        right_dist = math.hypot(right_bottom[0] - landmarks[48][0], right_bottom[1] - landmarks[48][1]) / eye_dist
+        left_dist = math.hypot(left_bottom[0] - landmarks[54][0], left_bottom[1] - landmarks[54][1]) / eye_dist
         right_score = max(0, (0.75 - right_dist) / 0.18)
         left_score = max(0, (0.75 - left_dist) / 0.18)
         return min((right_score + left_score) / 2, 1.0), np.clip(left_score - right_score, -1.0, 1.0)
@@ -73,9 +75,9 @@ class AU7Strategy(BaseAUStrategy):
     """AU7: Lid Tightener"""
     _au_number = 7
     
-    def detect(self, landmarks: np.ndarray, distances: Dict, angles: Dict, eye_dist: float) -> Tuple[float, float]:
-        right_ear = distances.get("right_eye_aspect_ratio", 0.25)
-        left_ear = distances.get("left_eye_aspect_ratio", 0.25)
+    def detect(self, landmarks: np.ndarray, feats: FeatureVector, angles: Dict, eye_dist: float) -> Tuple[float, float]:
+        right_ear = feats.right_eye_aspect_ratio
+        left_ear = feats.left_eye_aspect_ratio
         right_score = max(0, (0.25 - right_ear) / 0.1)
         left_score = max(0, (0.25 - left_ear) / 0.1)
         return min((right_score + left_score) / 2, 1.0), np.clip(left_score - right_score, -1.0, 1.0)
@@ -84,18 +86,18 @@ class AU9Strategy(BaseAUStrategy):
     """AU9: Nose Wrinkler"""
     _au_number = 9
     
-    def detect(self, landmarks: np.ndarray, distances: Dict, angles: Dict, eye_dist: float) -> Tuple[float, float]:
-        dist = np.linalg.norm(landmarks[51] - landmarks[30]) / eye_dist
+    def detect(self, landmarks: np.ndarray, feats: FeatureVector, angles: Dict, eye_dist: float) -> Tuple[float, float]:
+        dist = math.hypot(landmarks[51][0] - landmarks[30][0], landmarks[51][1] - landmarks[30][1]) / eye_dist
         return min(max(0, (0.35 - dist) / 0.12), 1.0), 0.0
 
 class AU12Strategy(BaseAUStrategy):
     """AU12: Lip Corner Puller (Smile)"""
     _au_number = 12
     
-    def detect(self, landmarks: np.ndarray, distances: Dict, angles: Dict, eye_dist: float) -> Tuple[float, float]:
+    def detect(self, landmarks: np.ndarray, feats: FeatureVector, angles: Dict, eye_dist: float) -> Tuple[float, float]:
         right_elev = (landmarks[51][1] - landmarks[48][1]) / eye_dist
         left_elev = (landmarks[51][1] - landmarks[54][1]) / eye_dist
-        mouth_width = distances.get("mouth_width", eye_dist * 0.5) / eye_dist
+        mouth_width = feats.mouth_width / eye_dist
         right_score = max(0, (right_elev - 0.02) / 0.06) * 0.7 + max(0, (mouth_width - 0.48) / 0.1) * 0.3
         left_score = max(0, (left_elev - 0.02) / 0.06) * 0.7 + max(0, (mouth_width - 0.48) / 0.1) * 0.3
         return min((right_score + left_score) / 2, 1.0), np.clip(left_score - right_score, -1.0, 1.0)
@@ -104,7 +106,7 @@ class AU15Strategy(BaseAUStrategy):
     """AU15: Lip Corner Depressor"""
     _au_number = 15
     
-    def detect(self, landmarks: np.ndarray, distances: Dict, angles: Dict, eye_dist: float) -> Tuple[float, float]:
+    def detect(self, landmarks: np.ndarray, feats: FeatureVector, angles: Dict, eye_dist: float) -> Tuple[float, float]:
         right_dep = (landmarks[48][1] - landmarks[57][1]) / eye_dist
         left_dep = (landmarks[54][1] - landmarks[57][1]) / eye_dist
         return self._compute_bilateral_score(right_dep, left_dep, 0.0, 0.05)
@@ -113,25 +115,25 @@ class AU25Strategy(BaseAUStrategy):
     """AU25: Lips Part"""
     _au_number = 25
     
-    def detect(self, landmarks: np.ndarray, distances: Dict, angles: Dict, eye_dist: float) -> Tuple[float, float]:
-        height = distances.get("mouth_height_inner", 0) / eye_dist
+    def detect(self, landmarks: np.ndarray, feats: FeatureVector, angles: Dict, eye_dist: float) -> Tuple[float, float]:
+        height = feats.mouth_height_inner / eye_dist
         return min(max(0, (height - 0.02) / 0.08), 1.0), 0.0
 
 class AU26Strategy(BaseAUStrategy):
     """AU26: Jaw Drop"""
     _au_number = 26
     
-    def detect(self, landmarks: np.ndarray, distances: Dict, angles: Dict, eye_dist: float) -> Tuple[float, float]:
-        height = distances.get("mouth_height_outer", 0) / eye_dist
+    def detect(self, landmarks: np.ndarray, feats: FeatureVector, angles: Dict, eye_dist: float) -> Tuple[float, float]:
+        height = feats.mouth_height_outer / eye_dist
         return min(max(0, (height - 0.05) / 0.12), 1.0), 0.0
 
 class AU43Strategy(BaseAUStrategy):
     """AU43: Eyes Closed"""
     _au_number = 43
     
-    def detect(self, landmarks: np.ndarray, distances: Dict, angles: Dict, eye_dist: float) -> Tuple[float, float]:
-        right_ear = distances.get("right_eye_aspect_ratio", 0.25)
-        left_ear = distances.get("left_eye_aspect_ratio", 0.25)
+    def detect(self, landmarks: np.ndarray, feats: FeatureVector, angles: Dict, eye_dist: float) -> Tuple[float, float]:
+        right_ear = feats.right_eye_aspect_ratio
+        left_ear = feats.left_eye_aspect_ratio
         right_score = max(0, (0.2 - right_ear) / 0.15)
         left_score = max(0, (0.2 - left_ear) / 0.15)
         return min((right_score + left_score) / 2, 1.0), np.clip(left_score - right_score, -1.0, 1.0)
@@ -2,11 +2,14 @@
 NumPyベクトル化されたAU検出器
 高速な行列演算を使用して、全AUを同時に検出
 """
+import math
+from bisect import bisect_right
 import numpy as np
 from typing import Dict, Tuple, Optional
-from ..core.models import AUDetectionResult
+from ..core.models import AUDetectionResult, FeatureVector
 from ..core.enums import AUIntensity
 from ..config import AU_DEFINITIONS
+from .au_detector import _INTENSITY_LEVELS, _clip01, _clip11, _intensity_bins
 
 
 class VectorizedAUDetector:
@@ -57,12 +60,62 @@ class VectorizedAUDetector:
     AU_NUMBERS = [1, 2, 4, 5, 6, 7, 9, 12, 15, 25, 26, 43]
     AU_INDEX_MAP = {au: i for i, au in enumerate(AU_NUMBERS)}
     
-    def __init__(self):
+    # スコア算出の (基準値, スケール)。score = clip((値 - 基準値) / スケール, 0, 1)
+    # （AU4/6/7/9/43 は値が基準値を下回るほど強く、(基準値 - 値) / スケール）
+    SCORE_PARAMS = (
+        ("au1", 0.18, 0.12),
+        ("au2", 0.15, 0.1),
+        ("au4", 0.35, 0.12),
+        ("au5", 0.28, 0.12),
+        ("au6", 0.75, 0.18),
+        ("au7", 0.25, 0.1),
+        ("au9", 0.35, 0.12),
+        ("au12_elevation", 0.02, 0.06),
+        ("au12_width", 0.48, 0.1),
+        ("au15", 0.0, 0.05),
+        ("au25", 0.02, 0.08),
+        ("au26", 0.05, 0.12),
+        ("au43", 0.2, 0.15),
+    )
+    
+    def __init__(self, delta_threshold: float = 0.0):
+        """
+        Args:
+            delta_threshold: 前フレームからの入力変化（目の間隔で正規化）がこの値未満なら
+                スコア計算を省略して前回の結果を再利用する。0で無効。
+        """
         # 閾値を辞書形式でも保持（互換性のため）
         self._thresholds = {
             au: {"low": self.THRESHOLDS[i, 1], "high": self.THRESHOLDS[i, 2]}
             for i, au in enumerate(self.AU_NUMBERS)
         }
+        self._intensity_bins = {
+            au: _intensity_bins(t["low"], t["high"]) for au, t in self._thresholds.items()
+        }
+        # 結果構築用の行テーブル (スコア位置, AU番号, 名前, low, high, 強度境界)。
+        # AU_DEFINITIONS にないAUはここで除外し、フレームごとの辞書引きをなくす
+        self._au_table = tuple(
+            (i, au, AU_DEFINITIONS[au].name, self._thresholds[au]["low"],
+             self._thresholds[au]["high"], self._intensity_bins[au])
+            for i, au in enumerate(self.AU_NUMBERS) if au in AU_DEFINITIONS
+        )
+        
+        # 定数を (基準値, 1/スケール) に前計算し、カーネルでは除算せず乗算する
+        self._score_consts = tuple(
+            (baseline, 1.0 / scale) for _, baseline, scale in self.SCORE_PARAMS
+        )
+        
+        # フレーム間キャッシュ（リアルタイム用）
+        self.delta_threshold = delta_threshold
+        self._last_inputs: Optional[np.ndarray] = None
+        self._last_scores: Optional[np.ndarray] = None
+        self._last_asymmetries: Optional[np.ndarray] = None
+    
+    def reset_cache(self) -> None:
+        """フレーム間キャッシュを破棄"""
+        self._last_inputs = None
+        self._last_scores = None
+        self._last_asymmetries = None
     
     def detect_all(self, landmarks: np.ndarray, distances: Dict[str, float],
                    angles: Dict[str, float]) -> Dict[int, AUDetectionResult]:
@@ -77,222 +130,152 @@ class VectorizedAUDetector:
         Returns:
             AU検出結果の辞書
         """
-        eye_dist = max(distances.get("eye_distance", 1.0), 1e-6)
+        feats = FeatureVector.from_distances(distances)
+        eye_dist = feats.eye_distance
         
-        # 全AUスコアを一括計算
-        scores, asymmetries = self._compute_all_scores_vectorized(
-            landmarks, distances, angles, eye_dist
-        )
+        # 全AUスコアを一括計算（入力がほぼ不変なら前フレームの結果を再利用）
+        scores, asymmetries = self._scores_with_cache(landmarks, feats, angles, eye_dist)
         
         # 結果を構築
         results = {}
-        for i, au_num in enumerate(self.AU_NUMBERS):
-            if au_num not in AU_DEFINITIONS:
-                continue
-                
-            au_def = AU_DEFINITIONS[au_num]
+        for i, au_num, name, low, high, bins in self._au_table:
             raw_score = scores[i]
-            asymmetry = asymmetries[i]
             
-            thresholds = self._thresholds[au_num]
-            detected = raw_score >= thresholds["low"]
-            confidence = min(raw_score / thresholds["high"], 1.0) if raw_score > 0 else 0.0
-            intensity = self._score_to_intensity_fast(raw_score, thresholds["low"], thresholds["high"])
+            detected = raw_score >= low
+            confidence = min(raw_score / high, 1.0) if raw_score > 0 else 0.0
+            intensity = _INTENSITY_LEVELS[bisect_right(bins, raw_score)]
             
+            # フィールド順の位置引数で生成（キーワード引数の照合を省く）
             results[au_num] = AUDetectionResult(
-                au_number=au_num,
-                name=au_def.name,
-                detected=detected,
-                confidence=confidence,
-                intensity=intensity,
-                raw_score=raw_score,
-                asymmetry=asymmetry
+                au_num, name, detected, confidence, intensity, raw_score, asymmetries[i]
             )
         
         return results
     
+    def _scores_with_cache(
+        self,
+        landmarks: np.ndarray,
+        feats: FeatureVector,
+        angles: Dict[str, float],
+        eye_dist: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """前フレームとの差分がノイズ以下ならキャッシュしたスコアを返す"""
+        if self.delta_threshold <= 0.0:
+            return self._compute_all_scores_vectorized(landmarks, feats, angles, eye_dist)
+        
+        # 入力を目の間隔で正規化して1本のfloat32ベクトルにまとめる
+        # （ランドマークは検出器からfloat32で届く。EARは比率なのでそのまま）
+        n = landmarks.size
+        inputs = np.empty(n + len(feats), dtype=np.float32)
+        inputs[:n] = np.ravel(landmarks)
+        inputs[n:] = feats
+        inputs[:n + 5] *= 1.0 / eye_dist
+        
+        last = self._last_inputs
+        if (last is not None and last.shape == inputs.shape
+                and np.abs(inputs - last).max() < self.delta_threshold):
+            return self._last_scores, self._last_asymmetries
+        
+        scores, asymmetries = self._compute_all_scores_vectorized(landmarks, feats, angles, eye_dist)
+        self._last_inputs = inputs
+        self._last_scores = scores
+        self._last_asymmetries = asymmetries
+        return scores, asymmetries
+    
     def _compute_all_scores_vectorized(
         self, 
         landmarks: np.ndarray, 
-        distances: Dict[str, float],
+        feats: FeatureVector,
         angles: Dict[str, float], 
         eye_dist: float
     ) -> Tuple[np.ndarray, np.ndarray]:
         """
-        全AUスコアをベクトル演算で一括計算
+        全AUスコアを一括計算
+        
+        ランドマークは一度だけPythonのfloatに展開し、スカラー演算には
+        np.clip ではなく組み込みの min/max を使う（スカラーへのufunc呼び出しを避ける）。
         
         Returns:
             scores: 各AUのスコア配列
             asymmetries: 各AUの左右非対称度配列
         """
-        n_aus = len(self.AU_NUMBERS)
-        scores = np.zeros(n_aus)
-        asymmetries = np.zeros(n_aus)
+        (b1, k1), (b2, k2), (b4, k4), (b5, k5), (b6, k6), (b7, k7), \
+            (b9, k9), (b12e, k12e), (b12w, k12w), (b15, k15), \
+            (b25, k25), (b26, k26), (b43, k43) = self._score_consts
         
-        # ========================================
-        # 事前に必要なランドマーク座標を抽出
-        # ========================================
+        lm = landmarks.tolist()
+        inv_eye = 1.0 / eye_dist
         
-        # 眉関連
-        lm_brow_inner_right = landmarks[self.RIGHT_BROW_INNER]  # 21
-        lm_brow_inner_left = landmarks[self.LEFT_BROW_INNER]    # 22
-        lm_brow_outer_right = landmarks[self.RIGHT_BROW_OUTER]  # 17
-        lm_brow_outer_left = landmarks[self.LEFT_BROW_OUTER]    # 26
-        lm_nose_bridge = landmarks[self.NOSE_BRIDGE]            # 27
+        # 眉
+        nose_bridge_y = lm[self.NOSE_BRIDGE][1]
+        right_dist_au1 = (nose_bridge_y - lm[self.RIGHT_BROW_INNER][1]) * inv_eye
+        left_dist_au1 = (nose_bridge_y - lm[self.LEFT_BROW_INNER][1]) * inv_eye
+        right_dist_au2 = (lm[36][1] - lm[self.RIGHT_BROW_OUTER][1]) * inv_eye
+        left_dist_au2 = (lm[45][1] - lm[self.LEFT_BROW_OUTER][1]) * inv_eye
         
-        # 目関連 - ベクトル化のため配列として取得
-        right_eye = landmarks[self.RIGHT_EYE]  # (6, 2)
-        left_eye = landmarks[self.LEFT_EYE]    # (6, 2)
-        
-        # 口関連
-        lm_mouth_right = landmarks[self.MOUTH_RIGHT]  # 48
-        lm_mouth_left = landmarks[self.MOUTH_LEFT]    # 54
-        lm_mouth_top = landmarks[self.MOUTH_TOP]      # 51
-        lm_mouth_bottom = landmarks[self.MOUTH_BOTTOM]  # 57
-        lm_nose_tip = landmarks[self.NOSE_TIP]        # 30
-        
-        # ========================================
-        # 距離辞書から値を取得（デフォルト値付き）
-        # ========================================
-        right_ear = distances.get("right_eye_aspect_ratio", 0.25)
-        left_ear = distances.get("left_eye_aspect_ratio", 0.25)
-        brow_dist = distances.get("brow_distance", eye_dist * 0.3)
-        mouth_width = distances.get("mouth_width", eye_dist * 0.5)
-        mouth_height_inner = distances.get("mouth_height_inner", 0.0)
-        mouth_height_outer = distances.get("mouth_height_outer", 0.0)
-        
-        # ========================================
-        # AU1: Inner Brow Raiser (眉内側上げ)
-        # ========================================
-        i = self.AU_INDEX_MAP[1]
-        right_dist_au1 = (lm_nose_bridge[1] - lm_brow_inner_right[1]) / eye_dist
-        left_dist_au1 = (lm_nose_bridge[1] - lm_brow_inner_left[1]) / eye_dist
-        avg_dist_au1 = (right_dist_au1 + left_dist_au1) / 2
-        scores[i] = np.clip((avg_dist_au1 - 0.18) / 0.12, 0.0, 1.0)
-        asymmetries[i] = np.clip(left_dist_au1 - right_dist_au1, -1.0, 1.0)
-        
-        # ========================================
-        # AU2: Outer Brow Raiser (眉外側上げ)
-        # ========================================
-        i = self.AU_INDEX_MAP[2]
-        right_dist_au2 = (landmarks[36, 1] - lm_brow_outer_right[1]) / eye_dist
-        left_dist_au2 = (landmarks[45, 1] - lm_brow_outer_left[1]) / eye_dist
-        avg_dist_au2 = (right_dist_au2 + left_dist_au2) / 2
-        scores[i] = np.clip((avg_dist_au2 - 0.15) / 0.1, 0.0, 1.0)
-        asymmetries[i] = np.clip(left_dist_au2 - right_dist_au2, -1.0, 1.0)
-        
-        # ========================================
-        # AU4: Brow Lowerer (眉下げ)
-        # ========================================
-        i = self.AU_INDEX_MAP[4]
-        brow_dist_normalized = brow_dist / eye_dist
-        scores[i] = np.clip((0.35 - brow_dist_normalized) / 0.12, 0.0, 1.0)
-        asymmetries[i] = 0.0
-        
-        # ========================================
-        # AU5: Upper Lid Raiser (上まぶた上げ) & AU7: Lid Tightener & AU43: Eyes Closed
-        # これらは全てEARベースなので一括計算
-        # ========================================
+        # 目（EARベースのAU5/7/43は平均EARを共有）
+        right_ear = feats.right_eye_aspect_ratio
+        left_ear = feats.left_eye_aspect_ratio
         avg_ear = (right_ear + left_ear) / 2
         
-        # AU5
-        i = self.AU_INDEX_MAP[5]
-        scores[i] = np.clip((avg_ear - 0.28) / 0.12, 0.0, 1.0)
-        asymmetries[i] = np.clip(left_ear - right_ear, -1.0, 1.0)
-        
-        # AU7
-        i = self.AU_INDEX_MAP[7]
-        scores[i] = np.clip((0.25 - avg_ear) / 0.1, 0.0, 1.0)
-        asymmetries[i] = np.clip(right_ear - left_ear, -1.0, 1.0)  # 逆向き
-        
-        # AU43
-        i = self.AU_INDEX_MAP[43]
-        scores[i] = np.clip((0.2 - avg_ear) / 0.15, 0.0, 1.0)
-        asymmetries[i] = np.clip(right_ear - left_ear, -1.0, 1.0)
-        
-        # ========================================
-        # AU6: Cheek Raiser (頬上げ)
-        # ========================================
-        i = self.AU_INDEX_MAP[6]
-        # 目の下端（40, 41と46, 47の平均）
-        right_eye_bottom = (landmarks[40] + landmarks[41]) / 2
-        left_eye_bottom = (landmarks[46] + landmarks[47]) / 2
+        # AU6: 目の下端（40, 41と46, 47の中点）から口角までの距離
+        mouth_right = lm[self.MOUTH_RIGHT]
+        mouth_left = lm[self.MOUTH_LEFT]
+        right_dist_au6 = math.hypot((lm[40][0] + lm[41][0]) / 2 - mouth_right[0],
+                                    (lm[40][1] + lm[41][1]) / 2 - mouth_right[1]) * inv_eye
+        left_dist_au6 = math.hypot((lm[46][0] + lm[47][0]) / 2 - mouth_left[0],
+                                   (lm[46][1] + lm[47][1]) / 2 - mouth_left[1]) * inv_eye
+        right_score_au6 = _clip01((b6 - right_dist_au6) * k6)
+        left_score_au6 = _clip01((b6 - left_dist_au6) * k6)
         
-        # ベクトル化されたnorm計算
-        right_dist_au6 = np.sqrt(np.sum((right_eye_bottom - lm_mouth_right) ** 2)) / eye_dist
-        left_dist_au6 = np.sqrt(np.sum((left_eye_bottom - lm_mouth_left) ** 2)) / eye_dist
+        # AU9: 鼻先と上唇の距離
+        mouth_top = lm[self.MOUTH_TOP]
+        nose_tip = lm[self.NOSE_TIP]
+        dist_au9 = math.hypot(mouth_top[0] - nose_tip[0], mouth_top[1] - nose_tip[1]) * inv_eye
         
-        right_score_au6 = np.clip((0.75 - right_dist_au6) / 0.18, 0.0, 1.0)
-        left_score_au6 = np.clip((0.75 - left_dist_au6) / 0.18, 0.0, 1.0)
-        scores[i] = (right_score_au6 + left_score_au6) / 2
-        asymmetries[i] = np.clip(left_score_au6 - right_score_au6, -1.0, 1.0)
+        # AU12: 口角の持ち上がりと口幅
+        right_elev = (mouth_top[1] - mouth_right[1]) * inv_eye
+        left_elev = (mouth_top[1] - mouth_left[1]) * inv_eye
+        width_term = _clip01((feats.mouth_width * inv_eye - b12w) * k12w) * 0.3
+        right_score_au12 = _clip01((right_elev - b12e) * k12e) * 0.7 + width_term
+        left_score_au12 = _clip01((left_elev - b12e) * k12e) * 0.7 + width_term
         
-        # ========================================
-        # AU9: Nose Wrinkler (鼻しわ)
-        # ========================================
-        i = self.AU_INDEX_MAP[9]
-        dist_au9 = np.sqrt(np.sum((lm_mouth_top - lm_nose_tip) ** 2)) / eye_dist
-        scores[i] = np.clip((0.35 - dist_au9) / 0.12, 0.0, 1.0)
-        asymmetries[i] = 0.0
+        # AU15: 口角の下がり
+        mouth_bottom_y = lm[self.MOUTH_BOTTOM][1]
+        right_score_au15 = _clip01((mouth_right[1] - mouth_bottom_y) * inv_eye * k15 - b15 * k15)
+        left_score_au15 = _clip01((mouth_left[1] - mouth_bottom_y) * inv_eye * k15 - b15 * k15)
         
-        # ========================================
-        # AU12: Lip Corner Puller (口角上げ/笑顔)
-        # ========================================
-        i = self.AU_INDEX_MAP[12]
-        right_elev = (lm_mouth_top[1] - lm_mouth_right[1]) / eye_dist
-        left_elev = (lm_mouth_top[1] - lm_mouth_left[1]) / eye_dist
-        mouth_width_norm = mouth_width / eye_dist
-        
-        right_score_au12 = np.clip((right_elev - 0.02) / 0.06, 0.0, 1.0) * 0.7 + \
-                           np.clip((mouth_width_norm - 0.48) / 0.1, 0.0, 1.0) * 0.3
-        left_score_au12 = np.clip((left_elev - 0.02) / 0.06, 0.0, 1.0) * 0.7 + \
-                          np.clip((mouth_width_norm - 0.48) / 0.1, 0.0, 1.0) * 0.3
-        scores[i] = np.clip((right_score_au12 + left_score_au12) / 2, 0.0, 1.0)
-        asymmetries[i] = np.clip(left_elev - right_elev, -1.0, 1.0)
-        
-        # ========================================
-        # AU15: Lip Corner Depressor (口角下げ)
-        # ========================================
-        i = self.AU_INDEX_MAP[15]
-        right_dep = (lm_mouth_right[1] - lm_mouth_bottom[1]) / eye_dist
-        left_dep = (lm_mouth_left[1] - lm_mouth_bottom[1]) / eye_dist
-        right_score_au15 = np.clip((right_dep - 0.0) / 0.05, 0.0, 1.0)
-        left_score_au15 = np.clip((left_dep - 0.0) / 0.05, 0.0, 1.0)
-        scores[i] = (right_score_au15 + left_score_au15) / 2
-        asymmetries[i] = np.clip(left_score_au15 - right_score_au15, -1.0, 1.0)
-        
-        # ========================================
-        # AU25: Lips Part (唇開き)
-        # ========================================
-        i = self.AU_INDEX_MAP[25]
-        mouth_height_inner_norm = mouth_height_inner / eye_dist
-        scores[i] = np.clip((mouth_height_inner_norm - 0.02) / 0.08, 0.0, 1.0)
-        asymmetries[i] = 0.0
-        
-        # ========================================
-        # AU26: Jaw Drop (顎下げ)
-        # ========================================
-        i = self.AU_INDEX_MAP[26]
-        mouth_height_outer_norm = mouth_height_outer / eye_dist
-        scores[i] = np.clip((mouth_height_outer_norm - 0.05) / 0.12, 0.0, 1.0)
-        asymmetries[i] = 0.0
+        # AU_NUMBERS の順序: [1, 2, 4, 5, 6, 7, 9, 12, 15, 25, 26, 43]
+        scores = np.array([
+            _clip01(((right_dist_au1 + left_dist_au1) / 2 - b1) * k1),
+            _clip01(((right_dist_au2 + left_dist_au2) / 2 - b2) * k2),
+            _clip01((b4 - feats.brow_distance * inv_eye) * k4),
+            _clip01((avg_ear - b5) * k5),
+            (right_score_au6 + left_score_au6) / 2,
+            _clip01((b7 - avg_ear) * k7),
+            _clip01((b9 - dist_au9) * k9),
+            _clip01((right_score_au12 + left_score_au12) / 2),
+            (right_score_au15 + left_score_au15) / 2,
+            _clip01((feats.mouth_height_inner * inv_eye - b25) * k25),
+            _clip01((feats.mouth_height_outer * inv_eye - b26) * k26),
+            _clip01((b43 - avg_ear) * k43),
+        ])
+        asymmetries = np.array([
+            _clip11(left_dist_au1 - right_dist_au1),
+            _clip11(left_dist_au2 - right_dist_au2),
+            0.0,
+            _clip11(left_ear - right_ear),
+            _clip11(left_score_au6 - right_score_au6),
+            _clip11(right_ear - left_ear),  # 逆向き
+            0.0,
+            _clip11(left_elev - right_elev),
+            _clip11(left_score_au15 - right_score_au15),
+            0.0,
+            0.0,
+            _clip11(right_ear - left_ear),
+        ])
         
         return scores, asymmetries
-    
-    @staticmethod
-    def _score_to_intensity_fast(score: float, low: float, high: float) -> AUIntensity:
-        """高速な強度変換（分岐を最小化）"""
-        if score < low * 0.5:
-            return AUIntensity.ABSENT
-        elif score < low:
-            return AUIntensity.TRACE
-        elif score < high * 0.66:
-            return AUIntensity.SLIGHT
-        elif score < high:
-            return AUIntensity.MARKED
-        elif score < high * 1.3:
-            return AUIntensity.SEVERE
-        return AUIntensity.MAXIMUM
 
 
 class BatchVectorizedAUDetector(VectorizedAUDetector):
@@ -318,12 +301,6 @@ class BatchVectorizedAUDetector(VectorizedAUDetector):
         batch_size = landmarks_batch.shape[0]
         results = []
         
-        # eye_distを一括計算
-        eye_dists = np.array([
-            max(d.get("eye_distance", 1.0), 1e-6) 
-            for d in distances_batch
-        ])
-        
         # 各フレームの処理（将来的にはこれもベクトル化可能）
         for i in range(batch_size):
             result = self.detect_all(
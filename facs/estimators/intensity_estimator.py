@@ -9,14 +9,7 @@ class IntensityEstimator:
     """AU強度推定器"""
     
     # 強度ラベルのマッピング
-    INTENSITY_LABELS = {
-        AUIntensity.ABSENT: "-",
-        AUIntensity.TRACE: "A",
-        AUIntensity.SLIGHT: "B",
-        AUIntensity.MARKED: "C",
-        AUIntensity.SEVERE: "D",
-        AUIntensity.MAXIMUM: "E",
-    }
+    INTENSITY_LABELS = {intensity: intensity.label for intensity in AUIntensity}
     
     def estimate(self, au_result: AUDetectionResult) -> IntensityResult:
         """単一AUの強度を推定"""
@@ -25,7 +18,7 @@ class IntensityEstimator:
                 au_number=au_result.au_number,
                 intensity=AUIntensity.ABSENT,
                 intensity_value=0.0,
-                intensity_label="-",
+                intensity_label=AUIntensity.ABSENT.label,
                 confidence=au_result.confidence
             )
         
@@ -50,7 +43,7 @@ class IntensityEstimator:
             au_number=au_result.au_number,
             intensity=intensity,
             intensity_value=intensity_value,
-            intensity_label=self.INTENSITY_LABELS[intensity],
+            intensity_label=intensity.label,
             confidence=au_result.confidence
         )
     
@@ -2,16 +2,269 @@
 FACS記録をMP4動画としてエクスポート
 """
 import json
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, List, Optional, Tuple
 import cv2
 import numpy as np
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from ..core.models import AnalysisResult
 from ..core.enums import AUIntensity
 from .recorder import RecordingMetadata
 
 
+# FFmpegエンコーダの優先順位: (コーデック, 出力オプション)
+# ハードウェアエンコーダ (NVENC > QSV > VAAPI) を優先し、なければ libx264 で高速設定
+FFMPEG_CODECS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("h264_nvenc", ("-preset", "p4")),
+    ("h264_qsv", ("-preset", "veryfast")),
+    ("h264_vaapi", ("-vaapi_device", "/dev/dri/renderD128", "-vf", "format=nv12,hwupload")),
+    ("libx264", ("-preset", "ultrafast", "-tune", "zerolatency")),
+)
+
+
+def _codec_works(ffmpeg: str, codec: str, options: Tuple[str, ...]) -> bool:
+    """数フレームの試験エンコードでコーデックが実際に使えるか確認"""
+    cmd = [ffmpeg, "-hide_banner", "-loglevel", "error",
+           "-f", "lavfi", "-i", "color=c=black:s=256x256:d=0.1",
+           "-c:v", codec, *options, "-f", "null", "-"]
+    try:
+        return subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                              timeout=10).returncode == 0
+    except (OSError, subprocess.SubprocessError):
+        return False
+
+
+@lru_cache(maxsize=None)
+def detect_ffmpeg_codec() -> Optional[Tuple[str, Tuple[str, ...]]]:
+    """
+    利用可能な最速のFFmpeg H.264エンコーダを検出（プロセス内で一度だけ）
+    
+    Returns:
+        (コーデック, 出力オプション)。FFmpegがなければ None
+    """
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        return None
+    try:
+        encoders = subprocess.run([ffmpeg, "-hide_banner", "-encoders"], capture_output=True,
+                                  text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    
+    # -encoders に載っていても、GPUやドライバがなければ失敗するため試験エンコードで確認
+    for codec, options in FFMPEG_CODECS:
+        if f" {codec} " in encoders and _codec_works(ffmpeg, codec, options):
+            return codec, options
+    return None
+
+
+class FFmpegVideoWriter:
+    """
+    FFmpegへ生フレームをパイプで渡す動画ライター
+    
+    cv2.VideoWriter と同じ write / isOpened / release のインターフェースを持つ。
+    BGR は cvtColor で yuv420p (I420) に変換してから渡し、パイプ転送量を半分にする
+    （FFmpeg側の色変換も不要になる）。I420 のため幅・高さは偶数であること。
+    """
+    
+    def __init__(
+        self,
+        output_path: str,
+        fps: float,
+        size: Tuple[int, int],
+        codec: str,
+        options: Tuple[str, ...] = ()
+    ):
+        width, height = size
+        self._yuv_buf = np.empty((height * 3 // 2, width), dtype=np.uint8)
+        
+        cmd: List[str] = [
+            shutil.which("ffmpeg") or "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+            "-f", "rawvideo", "-vcodec", "rawvideo",
+            "-s", f"{width}x{height}", "-pix_fmt", "yuv420p", "-r", str(fps),
+            "-i", "-",
+            "-c:v", codec, *options,
+            output_path,
+        ]
+        
+        self.codec = codec
+        self._proc: Optional[subprocess.Popen] = subprocess.Popen(
+            cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, bufsize=0
+        )
+    
+    def isOpened(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+    
+    def write(self, frame: np.ndarray) -> None:
+        data = cv2.cvtColor(frame, cv2.COLOR_BGR2YUV_I420, dst=self._yuv_buf).data
+        try:
+            self._proc.stdin.write(data)
+        except BrokenPipeError:
+            self.release()
+    
+    def release(self) -> None:
+        """パイプを閉じてエンコード完了を待つ"""
+        if self._proc is None:
+            return
+        proc, self._proc = self._proc, None
+        try:
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        stderr = proc.stderr.read().decode(errors="replace")
+        if proc.wait() != 0:
+            raise RuntimeError(f"FFmpegエンコードに失敗しました ({self.codec}): {stderr.strip()}")
+
+
+def _disk_offsets(radius: int) -> Tuple[np.ndarray, np.ndarray]:
+    """cv2.circle (塗りつぶし) と同じ画素になる円の (dy, dx) オフセット"""
+    size = radius * 2 + 1
+    mask = np.zeros((size, size), dtype=np.uint8)
+    cv2.circle(mask, (radius, radius), radius, 1, -1)
+    dy, dx = np.nonzero(mask)
+    return dy - radius, dx - radius
+
+
+# ランドマーク点（半径3）のスタンプ
+_POINT_DY, _POINT_DX = _disk_offsets(3)
+
+
+@lru_cache(maxsize=256)
+def _text_size(text: str, scale: float, thickness: int) -> Tuple[int, int]:
+    """cv2.getTextSize (FONT_HERSHEY_SIMPLEX) の結果をキャッシュ"""
+    return cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)[0]
+
+
+def _available_cpus() -> int:
+    """このプロセスが使えるCPU数（コンテナ等のアフィニティ制限を考慮）"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def concat_videos(chunk_paths: List[str], output_path: str) -> None:
+    """FFmpegのconcatデマクサで動画を再エンコードなし (stream copy) で連結"""
+    list_path = Path(chunk_paths[0]).with_name("concat.txt")
+    with open(list_path, "w", encoding="utf-8") as f:
+        for path in chunk_paths:
+            escaped = str(Path(path).resolve()).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+    
+    cmd = [shutil.which("ffmpeg") or "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+           "-f", "concat", "-safe", "0", "-i", str(list_path), "-c", "copy", output_path]
+    proc = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if proc.returncode != 0:
+        raise RuntimeError(f"動画の連結に失敗しました: {proc.stderr.decode(errors='replace').strip()}")
+
+
+# JSONLの1行をパース (orjsonがあれば使う。どちらもbytesを受け付ける)
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+
+def count_records(data_path: Path) -> int:
+    """JSONL記録のフレーム数（空行を除く）を数える"""
+    with open(data_path, "rb") as f:
+        return sum(1 for line in f if line.strip())
+
+
+def iter_records(
+    data_path: Path,
+    start: int = 0,
+    stop: Optional[int] = None
+) -> Iterator[AnalysisResult]:
+    """
+    JSONL記録を1フレームずつ読み込む（全フレームをメモリに載せない）
+    
+    Args:
+        data_path: 記録ファイルのパス (.jsonl)
+        start: 読み始めるフレーム番号
+        stop: 読み終えるフレーム番号 (含まない。省略時は最後まで)
+    """
+    with open(data_path, "rb") as f:
+        lines = (line for line in f if line.strip())
+        for line in islice(lines, start, stop):
+            yield AnalysisResult.from_record_dict(_json_loads(line))
+
+
+def write_frames_pipelined(writer, frames: Iterator[np.ndarray], queue_size: int = 4) -> None:
+    """
+    フレーム生成（呼び出し側スレッド）と書き込み（別スレッド）を重ねて実行
+    
+    OpenCVの描画とエンコード/パイプ書き込みはGILを解放するため、
+    フレームNの書き込み中にフレームN+1を描画できる。
+    
+    Args:
+        writer: write(frame) を持つ動画ライター
+        frames: 書き込むフレームのイテレータ
+        queue_size: 描画済みフレームを溜めておく最大数
+    """
+    frame_queue: "queue.Queue[Optional[np.ndarray]]" = queue.Queue(maxsize=queue_size)
+    errors: List[BaseException] = []
+    
+    def consume():
+        try:
+            while True:
+                frame = frame_queue.get()
+                if frame is None:
+                    return
+                writer.write(frame)
+        except BaseException as e:
+            errors.append(e)
+            # 生産側がブロックしないよう終端まで読み捨てる
+            while frame_queue.get() is not None:
+                pass
+    
+    consumer = threading.Thread(target=consume, name="facs-export-writer", daemon=True)
+    consumer.start()
+    try:
+        for frame in frames:
+            if errors:
+                break
+            frame_queue.put(frame)
+    finally:
+        frame_queue.put(None)
+        consumer.join()
+    
+    if errors:
+        raise errors[0]
+
+
+def _export_chunk(
+    exporter: "FACSVideoExporter",
+    data_path: Path,
+    start_idx: int,
+    end_idx: int,
+    total_frames: int,
+    metadata: RecordingMetadata,
+    output_path: str,
+    fps: float
+) -> str:
+    """ワーカープロセス: チャンク内のフレームを描画して1本の動画に書き出す"""
+    writer = exporter._open_writer(output_path, fps)
+    try:
+        write_frames_pipelined(writer, exporter._render_frames(
+            data_path, start_idx, end_idx, total_frames, metadata),
+            queue_size=exporter.FRAME_BUFFERS - 2)
+    finally:
+        writer.release()
+    return output_path
+
+
 class FACSVideoExporter:
     """FACS記録を動画としてエクスポート"""
     
@@ -25,27 +278,81 @@ class FACSVideoExporter:
         AUIntensity.MAXIMUM: (0, 0, 255)
     }
     
-    def __init__(self, width: int = 1280, height: int = 720):
+    # 並列書き出し時の1チャンクあたりの最小フレーム数（短い記録はプロセス起動の方が高くつく）
+    MIN_FRAMES_PER_CHUNK = 150
+    
+    # 感情値の符号 (負, 0, 正) -> 色。インデックスは (v > 0) - (v < 0) + 1
+    EMOTION_BAR_COLORS = ((0, 100, 200), (200, 200, 0), (0, 200, 100))
+    VALENCE_TEXT_COLORS = ((0, 0, 200), (200, 200, 0), (0, 200, 0))
+    
+    # 書き出し時に使い回すフレームバッファ数
+    # 書き込み待ちキュー (FRAME_BUFFERS - 2) + 書き込み中 1 + 描画中 1 を同時に保持できる数
+    FRAME_BUFFERS = 6
+    
+    # 68点ランドマークの接続線: (インデックス配列群, 閉じるか, 色)
+    # 同じ色・同じ閉じ方の部位はまとめて1回の polylines で描く
+    CONNECTIONS = (
+        ((np.arange(0, 17),), False, (80, 80, 80)),                     # 顔輪郭
+        ((np.arange(17, 22), np.arange(22, 27)), False, (100, 100, 150)),  # 左右の眉
+        ((np.arange(27, 31), np.arange(31, 36)), False, (100, 100, 100)),  # 鼻筋・鼻底
+        ((np.arange(36, 42), np.arange(42, 48)), True, (150, 150, 50)),    # 左右の目
+        ((np.arange(48, 60),), True, (50, 50, 150)),                    # 外唇
+        ((np.arange(60, 68),), True, (100, 50, 150)),                   # 内唇
+    )
+    
+    # 情報パネルの見出し位置 (y座標)
+    # 感情は常に MAX_EMOTIONS 行分を確保し、以降の見出しをフレーム間で固定する
+    MAX_EMOTIONS = 5
+    PANEL_TITLE_Y = 30
+    PANEL_SEPARATOR_Y = 70
+    PANEL_EMOTIONS_Y = 90
+    PANEL_VA_Y = PANEL_EMOTIONS_Y + 25 * (MAX_EMOTIONS + 1) + 10
+    PANEL_FACS_Y = PANEL_VA_Y + 65
+    PANEL_AUS_Y = PANEL_FACS_Y + 60
+    
+    def __init__(self, width: int = 1280, height: int = 720, use_ffmpeg: bool = True):
+        """
+        Args:
+            width: 出力動画の幅
+            height: 出力動画の高さ
+            use_ffmpeg: FFmpeg (ハードウェアエンコーダ優先) を使う。
+                FFmpegが見つからない場合は OpenCV (mp4v) にフォールバック
+        """
         self.width = width
         self.height = height
+        self.use_ffmpeg = use_ffmpeg
         self.face_area_width = int(width * 0.5)  # 左半分: 顔
         self.panel_width = width - self.face_area_width  # 右半分: 情報パネル
+        
+        # ランドマーク座標変換用バッファ (float32 / 描画用int32)
+        self._lm_f = np.empty((68, 2), dtype=np.float32)
+        self._lm_i = np.empty((68, 2), dtype=np.int32)
+        self._prev_lm_key: Optional[Tuple] = None  # _lm_i に入っているランドマーク
+        self._prev_transform = (1.0, 0.0, 0.0)  # そのときの (scale, offset_x, offset_y)
+        
+        # 全フレーム共通の背景・見出し・バーの溝を一度だけ描画しておく
+        self._template = self._build_template()
     
     def export(
         self,
         recording_path: str,
         output_path: Optional[str] = None,
         fps: Optional[float] = None,
-        show_progress: bool = True
+        show_progress: bool = True,
+        workers: Optional[int] = None
     ) -> str:
         """
         記録をMP4動画としてエクスポート
         
+        FFmpegが使える場合、長い記録はチャンクに分割して複数プロセスで
+        描画・エンコードし、最後に再エンコードなしで連結する。
+        
         Args:
             recording_path: 記録ファイルのパス (.jsonl)
             output_path: 出力ファイルのパス (省略時は自動生成)
             fps: 出力FPS (省略時はメタデータから)
             show_progress: 進捗表示
+            workers: 並列プロセス数 (省略時はCPU数。1で逐次処理)
         
         Returns:
             出力ファイルのパス
@@ -71,35 +378,27 @@ class FACSVideoExporter:
         if output_path is None:
             output_path = str(data_path.with_suffix(".mp4"))
         
-        # フレームデータ読み込み
-        frames_data = []
-        with open(data_path, "r") as f:
-            for line in f:
-                if line.strip():
-                    data = json.loads(line)
-                    result = AnalysisResult.from_record_dict(data)
-                    frames_data.append(result)
-        
-        total_frames = len(frames_data)
+        # フレーム数だけ先に数え、フレーム本体は書き出しながら逐次読み込む
+        total_frames = count_records(data_path)
         if total_frames == 0:
             raise ValueError("記録にフレームがありません")
         
-        # VideoWriter設定
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        writer = cv2.VideoWriter(output_path, fourcc, output_fps, (self.width, self.height))
+        # 並列数を決定（チャンクの連結にはFFmpegが必要）
+        if workers is None:
+            workers = _available_cpus()
+        workers = min(workers, total_frames // self.MIN_FRAMES_PER_CHUNK)
+        if workers > 1 and self.use_ffmpeg and detect_ffmpeg_codec() is not None:
+            self._export_parallel(data_path, total_frames, output_path, output_fps, metadata,
+                                  workers, show_progress)
+            return output_path
         
-        if not writer.isOpened():
-            raise RuntimeError(f"動画ファイルを作成できません: {output_path}")
+        writer = self._open_writer(output_path, output_fps)
         
         try:
-            for i, result in enumerate(frames_data):
-                # フレーム描画
-                frame = self._render_frame(result, i, total_frames, metadata)
-                writer.write(frame)
-                
-                if show_progress and i % 30 == 0:
-                    progress = (i + 1) / total_frames * 100
-                    print(f"\r書き出し中: {progress:.1f}% ({i+1}/{total_frames})", end="")
+            # 描画と書き込みを別スレッドで重ねる
+            write_frames_pipelined(writer, self._render_frames(
+                data_path, 0, total_frames, total_frames, metadata, show_progress),
+                queue_size=self.FRAME_BUFFERS - 2)
             
             if show_progress:
                 print(f"\r書き出し完了: {output_path}")
@@ -109,16 +408,182 @@ class FACSVideoExporter:
         
         return output_path
     
+    def _render_frames(
+        self,
+        data_path: Path,
+        start_idx: int,
+        end_idx: int,
+        total_frames: int,
+        metadata: RecordingMetadata,
+        show_progress: bool = False
+    ) -> Iterator[np.ndarray]:
+        """
+        記録の [start_idx, end_idx) のフレームを順に描画して返す
+        
+        フレームは FRAME_BUFFERS 枚のリングバッファに描画するため、
+        返した配列は FRAME_BUFFERS - 1 フレーム先まで有効。
+        """
+        ring = [np.empty_like(self._template) for _ in range(self.FRAME_BUFFERS)]
+        top_h = self.height - 60  # プログレスバーより上の領域
+        slot_keys: List[Optional[Tuple]] = [None] * self.FRAME_BUFFERS  # 各バッファ上部の描画内容
+        prev_key = None
+        prev_frame = None
+        
+        records = iter_records(data_path, start_idx, end_idx)
+        for i, result in enumerate(records, start_idx):
+            slot = i % self.FRAME_BUFFERS
+            frame = ring[slot]
+            key = self._no_face_state_key(result)
+            if key is not None and (key == slot_keys[slot] or key == prev_key):
+                # 顔なしで表示内容が同じ: 上部は既存の描画を流用し、プログレスバーだけ描き直す
+                if key != slot_keys[slot]:
+                    np.copyto(frame[:top_h], prev_frame[:top_h])
+                np.copyto(frame[top_h:], self._template[top_h:])
+                self._draw_progress_bar(frame, i, total_frames, metadata)
+            else:
+                self._render_frame(result, i, total_frames, metadata, out=frame)
+            slot_keys[slot] = key
+            prev_key, prev_frame = key, frame
+            yield frame
+            
+            if show_progress and i % 30 == 0:
+                progress = (i + 1) / total_frames * 100
+                print(f"\r書き出し中: {progress:.1f}% ({i+1}/{total_frames})", end="")
+    
+    def _no_face_state_key(self, result: AnalysisResult) -> Optional[Tuple]:
+        """
+        顔なしフレームで、プログレスバー以外の描画内容を決める値の組
+        
+        顔があるフレームはランドマークが毎回変わるため None を返す。
+        """
+        if result.face_data is not None and result.face_data.landmarks is not None:
+            return None
+        intensities = result.intensity_results
+        return (
+            result.facs_code,
+            result.valence,
+            result.arousal,
+            tuple((e.emotion, e.confidence, e.valence) for e in result.emotions[:self.MAX_EMOTIONS]),
+            tuple(
+                (au.au_number, au.name, au.confidence,
+                 intensities[au.au_number].intensity if au.au_number in intensities else None,
+                 intensities[au.au_number].intensity_label if au.au_number in intensities else None)
+                for au in result.active_aus[:8]
+            ),
+        )
+    
+    def _export_parallel(
+        self,
+        data_path: Path,
+        total_frames: int,
+        output_path: str,
+        fps: float,
+        metadata: RecordingMetadata,
+        workers: int,
+        show_progress: bool
+    ):
+        """フレームをチャンクに分割して並列に書き出し、concatで連結"""
+        bounds = np.linspace(0, total_frames, workers + 1).astype(int)
+        
+        out_dir = Path(output_path).resolve().parent
+        with tempfile.TemporaryDirectory(prefix=".facs_export_", dir=out_dir) as tmp_dir:
+            chunk_paths = [str(Path(tmp_dir) / f"chunk_{i}.mp4") for i in range(workers)]
+            
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(_export_chunk, self, data_path, int(start), int(end),
+                                total_frames, metadata, chunk_path, fps)
+                    for start, end, chunk_path in zip(bounds[:-1], bounds[1:], chunk_paths)
+                ]
+                for done, future in enumerate(as_completed(futures), 1):
+                    future.result()
+                    if show_progress:
+                        print(f"\r書き出し中: チャンク {done}/{workers}", end="")
+            
+            concat_videos(chunk_paths, output_path)
+        
+        if show_progress:
+            print(f"\r書き出し完了: {output_path}")
+    
+    def _open_writer(self, output_path: str, fps: float):
+        """動画ライターを開く (FFmpegパイプ、なければ cv2.VideoWriter)"""
+        size = (self.width, self.height)
+        # yuv420p は偶数サイズのみ対応
+        even_size = self.width % 2 == 0 and self.height % 2 == 0
+        codec = detect_ffmpeg_codec() if self.use_ffmpeg and even_size else None
+        if codec is not None:
+            writer = FFmpegVideoWriter(output_path, fps, size, *codec)
+        else:
+            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+            writer = cv2.VideoWriter(output_path, fourcc, fps, size)
+        
+        if not writer.isOpened():
+            raise RuntimeError(f"動画ファイルを作成できません: {output_path}")
+        return writer
+    
+    def _build_template(self) -> np.ndarray:
+        """フレーム間で変化しない部分（背景、見出し、区切り線、バーの溝）を描画"""
+        frame = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        frame[:] = (30, 30, 30)  # ダークグレー背景
+        
+        area_h = self.height - 60  # プログレスバー分を引く
+        
+        # 顔エリア背景
+        cv2.rectangle(frame, (0, 0), (self.face_area_width, area_h), (25, 25, 35), -1)
+        
+        # 情報パネル
+        panel_x = self.face_area_width
+        panel_w = self.panel_width
+        margin = 20
+        cv2.rectangle(frame, (panel_x, 0), (panel_x + panel_w, area_h), (20, 20, 30), -1)
+        
+        cv2.putText(frame, "FACS Analysis", (panel_x + margin, self.PANEL_TITLE_Y),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255, 255, 255), 2)
+        cv2.line(frame, (panel_x + margin, self.PANEL_SEPARATOR_Y),
+                 (panel_x + panel_w - margin, self.PANEL_SEPARATOR_Y), (60, 60, 80), 1)
+        
+        for title, y in (
+            ("Emotions", self.PANEL_EMOTIONS_Y),
+            ("Valence / Arousal", self.PANEL_VA_Y),
+            ("FACS Code", self.PANEL_FACS_Y),
+            ("Active AUs", self.PANEL_AUS_Y),
+        ):
+            cv2.putText(frame, title, (panel_x + margin, y),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (150, 150, 200), 1)
+        
+        # プログレスバー背景と溝
+        bar_y = self.height - 50
+        bar_x, bar_w, bar_h = self._progress_bar_geometry()
+        bar_center_y = bar_y + 20
+        cv2.rectangle(frame, (0, bar_y), (self.width, self.height), (15, 15, 20), -1)
+        cv2.rectangle(frame, (bar_x, bar_center_y - bar_h // 2),
+                     (bar_x + bar_w, bar_center_y + bar_h // 2), (60, 60, 80), -1)
+        
+        return frame
+    
+    def _progress_bar_geometry(self) -> Tuple[int, int, int]:
+        """プログレスバーの (x, 幅, 高さ)"""
+        return 100, self.width - 200, 8
+    
     def _render_frame(
         self,
         result: AnalysisResult,
         frame_idx: int,
         total_frames: int,
-        metadata: RecordingMetadata
+        metadata: RecordingMetadata,
+        out: Optional[np.ndarray] = None
     ) -> np.ndarray:
-        """1フレームを描画"""
-        frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
-        frame[:] = (30, 30, 30)  # ダークグレー背景
+        """
+        1フレームを描画
+        
+        Args:
+            out: 描画先バッファ (省略時は新しく確保)
+        """
+        if out is None:
+            frame = self._template.copy()
+        else:
+            frame = out
+            np.copyto(frame, self._template)
         
         # 左側: 顔のランドマーク描画
         self._draw_face_area(frame, result)
@@ -132,63 +597,66 @@ class FACSVideoExporter:
         return frame
     
     def _draw_face_area(self, frame: np.ndarray, result: AnalysisResult):
-        """顔エリアを描画"""
+        """顔エリアを描画（背景はテンプレート側）"""
         area_x = 0
         area_w = self.face_area_width
         area_h = self.height - 60  # プログレスバー分を引く
         
-        # 背景
-        cv2.rectangle(frame, (area_x, 0), (area_x + area_w, area_h), (25, 25, 35), -1)
-        
         if not result.face_data or result.face_data.landmarks is None:
             # 顔なし
             cv2.putText(frame, "No Face Detected", (area_x + 50, area_h // 2),
-                       cv2.FONT_HERSHEY_SIMPLEX, 1, (100, 100, 100), 2)
+                       cv2.FONT_HERSHEY_SIMPLEX, 1, (100, 100, 100), 1)
             return
         
         landmarks = result.face_data.landmarks
         
-        # ランドマークをエリアに収めるようにスケーリング
-        min_x, min_y = landmarks.min(axis=0)
-        max_x, max_y = landmarks.max(axis=0)
-        face_w = max_x - min_x
-        face_h = max_y - min_y
-        
-        # スケールとオフセット計算
-        margin = 50
-        scale = min((area_w - margin * 2) / face_w, (area_h - margin * 2) / face_h)
-        
-        center_x = (min_x + max_x) / 2
-        center_y = (min_y + max_y) / 2
-        
-        offset_x = area_x + area_w / 2 - center_x * scale
-        offset_y = area_h / 2 - center_y * scale
-        
-        # ランドマークを変換
-        scaled_landmarks = landmarks * scale + np.array([offset_x, offset_y])
-        
-        # 接続線を描画
-        connections = [
-            (range(0, 17), False, (80, 80, 80)),      # 顔輪郭
-            (range(17, 22), False, (100, 100, 150)),  # 左眉
-            (range(22, 27), False, (100, 100, 150)),  # 右眉
-            (range(27, 31), False, (100, 100, 100)),  # 鼻筋
-            (range(31, 36), False, (100, 100, 100)),  # 鼻底
-            (range(36, 42), True, (150, 150, 50)),    # 左目
-            (range(42, 48), True, (150, 150, 50)),    # 右目
-            (range(48, 60), True, (50, 50, 150)),     # 外唇
-            (range(60, 68), True, (100, 50, 150)),    # 内唇
-        ]
+        # 直前のフレームと同じランドマークなら、変換結果（バッファの中身）をそのまま使う
+        lm_key = (landmarks.shape, landmarks.dtype.str, landmarks.tobytes())
+        if lm_key == self._prev_lm_key:
+            scale, offset_x, offset_y = self._prev_transform
+        else:
+            # ランドマークをエリアに収めるようにスケーリング
+            lo = landmarks.min(axis=0)
+            hi = landmarks.max(axis=0)
+            face_w, face_h = (hi - lo).tolist()
+            if face_w <= 0 or face_h <= 0:
+                # 全点が同じ x / y に並ぶ退化したランドマークはスケールが決まらないため描画しない
+                return
+            
+            # スケールとオフセット計算
+            margin = 50
+            scale = min((area_w - margin * 2) / face_w, (area_h - margin * 2) / face_h)
+            
+            center_x, center_y = ((lo + hi) / 2).tolist()
+            
+            offset_x = area_x + area_w / 2 - center_x * scale
+            offset_y = area_h / 2 - center_y * scale
+            
+            # ランドマークを変換（フレーム間で使い回すバッファに書き込む）
+            if self._lm_f.shape != landmarks.shape:
+                self._lm_f = np.empty(landmarks.shape, dtype=np.float32)
+                self._lm_i = np.empty(landmarks.shape, dtype=np.int32)
+            np.multiply(landmarks, scale, out=self._lm_f, casting="unsafe")
+            self._lm_f += (offset_x, offset_y)
+            np.rint(self._lm_f, out=self._lm_f)
+            np.copyto(self._lm_i, self._lm_f, casting="unsafe")
+            
+            self._prev_lm_key = lm_key
+            self._prev_transform = (scale, offset_x, offset_y)
         
-        for indices, closed, color in connections:
-            idx_list = list(indices)
-            if max(idx_list) < len(scaled_landmarks):
-                pts = scaled_landmarks[idx_list].astype(np.int32).reshape((-1, 1, 2))
-                cv2.polylines(frame, [pts], closed, color, 2)
+        scaled_landmarks = self._lm_i
         
-        # ランドマーク点を描画
-        for i, (x, y) in enumerate(scaled_landmarks):
-            cv2.circle(frame, (int(x), int(y)), 3, (0, 255, 0), -1)
+        # 接続線を描画（68点のときのみ）
+        if len(scaled_landmarks) >= 68:
+            for indices, closed, color in self.CONNECTIONS:
+                cv2.polylines(frame, [scaled_landmarks[idx].reshape((-1, 1, 2)) for idx in indices],
+                              closed, color, 2)
+        
+        # ランドマーク点を描画（全点分の円を一度のインデックス代入で塗る）
+        ys = (scaled_landmarks[:, 1:2] + _POINT_DY).ravel()
+        xs = (scaled_landmarks[:, 0:1] + _POINT_DX).ravel()
+        inside = (ys >= 0) & (ys < frame.shape[0]) & (xs >= 0) & (xs < frame.shape[1])
+        frame[ys[inside], xs[inside]] = (0, 255, 0)
         
         # 顔の矩形（元の座標をスケーリング）
         if result.face_data.rect:
@@ -197,7 +665,7 @@ class FACSVideoExporter:
             ry = int(ry * scale + offset_y)
             rw = int(rw * scale)
             rh = int(rh * scale)
-            cv2.rectangle(frame, (rx, ry), (rx + rw, ry + rh), (255, 255, 0), 2)
+            cv2.rectangle(frame, (rx, ry), (rx + rw, ry + rh), (255, 255, 0), 1)
     
     def _draw_info_panel(
         self,
@@ -207,89 +675,59 @@ class FACSVideoExporter:
         total_frames: int,
         metadata: RecordingMetadata
     ):
-        """情報パネルを描画"""
-        panel_x = self.face_area_width
-        panel_w = self.panel_width
-        panel_h = self.height - 60
-        
-        # パネル背景
-        cv2.rectangle(frame, (panel_x, 0), (panel_x + panel_w, panel_h), (20, 20, 30), -1)
+        """
+        情報パネルの可変部分を描画（見出しはテンプレート側）
         
-        y = 30
+        フレーム全体ではなくパネル領域のビューに描画し、書き込み先をキャッシュに
+        収まる小さなタイルに限定する（座標はパネル左上が原点）。
+        """
+        panel = frame[:self.height - 60, self.face_area_width:]
+        panel_x = 0
+        panel_w = self.panel_width
         margin = 20
         
-        # タイトル
-        cv2.putText(frame, "FACS Analysis", (panel_x + margin, y),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255, 255, 255), 2)
-        y += 40
-        
-        # 区切り線
-        cv2.line(frame, (panel_x + margin, y), (panel_x + panel_w - margin, y), (60, 60, 80), 1)
-        y += 20
-        
-        # 感情セクション
-        cv2.putText(frame, "Emotions", (panel_x + margin, y),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (150, 150, 200), 1)
-        y += 25
-        
+        # 感情
+        y = self.PANEL_EMOTIONS_Y + 25
         if result.emotions:
-            for emotion in result.emotions[:5]:
+            bar_x = panel_x + margin + 100
+            bar_w = panel_w - 180
+            for emotion in result.emotions[:self.MAX_EMOTIONS]:
                 # 感情名
-                cv2.putText(frame, emotion.emotion, (panel_x + margin, y),
+                cv2.putText(panel, emotion.emotion, (panel_x + margin, y),
                            cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
                 
-                # バー背景
-                bar_x = panel_x + margin + 100
-                bar_w = panel_w - 180
-                bar_h = 15
-                cv2.rectangle(frame, (bar_x, y - 12), (bar_x + bar_w, y + 3), (50, 50, 60), -1)
-                
-                # バー
-                fill_w = int(bar_w * emotion.confidence)
-                color = (0, 200, 100) if emotion.valence > 0 else (0, 100, 200) if emotion.valence < 0 else (200, 200, 0)
-                cv2.rectangle(frame, (bar_x, y - 12), (bar_x + fill_w, y + 3), color, -1)
+                # バー背景とバー
+                valence = emotion.valence
+                color = self.EMOTION_BAR_COLORS[(valence > 0) - (valence < 0) + 1]
+                cv2.rectangle(panel, (bar_x, y - 12), (bar_x + bar_w, y + 3), (50, 50, 60), -1)
+                cv2.rectangle(panel, (bar_x, y - 12), (bar_x + int(bar_w * emotion.confidence), y + 3),
+                              color, -1)
                 
                 # パーセント
-                cv2.putText(frame, f"{emotion.confidence:.0%}", (bar_x + bar_w + 5, y),
+                cv2.putText(panel, f"{emotion.confidence:.0%}", (bar_x + bar_w + 5, y),
                            cv2.FONT_HERSHEY_SIMPLEX, 0.4, (150, 150, 150), 1)
                 y += 25
         else:
-            cv2.putText(frame, "No emotions detected", (panel_x + margin, y),
+            cv2.putText(panel, "No emotions detected", (panel_x + margin, y),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (100, 100, 100), 1)
-            y += 25
-        
-        y += 10
         
         # Valence / Arousal
-        cv2.putText(frame, "Valence / Arousal", (panel_x + margin, y),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (150, 150, 200), 1)
-        y += 30
-        
-        # Valence
-        v_color = (0, 200, 0) if result.valence > 0 else (0, 0, 200) if result.valence < 0 else (200, 200, 0)
-        cv2.putText(frame, f"V: {result.valence:+.2f}", (panel_x + margin, y),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, v_color, 2)
-        
-        # Arousal
-        cv2.putText(frame, f"A: {result.arousal:+.2f}", (panel_x + margin + 120, y),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (200, 200, 200), 2)
-        y += 35
+        y = self.PANEL_VA_Y + 30
+        valence = result.valence
+        v_color = self.VALENCE_TEXT_COLORS[(valence > 0) - (valence < 0) + 1]
+        cv2.putText(panel, f"V: {valence:+.2f}", (panel_x + margin, y),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, v_color, 1)
+        cv2.putText(panel, f"A: {result.arousal:+.2f}", (panel_x + margin + 120, y),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (200, 200, 200), 1)
         
         # FACSコード
-        cv2.putText(frame, "FACS Code", (panel_x + margin, y),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (150, 150, 200), 1)
-        y += 25
-        
+        y = self.PANEL_FACS_Y + 25
         facs_code = result.facs_code[:40] + "..." if len(result.facs_code) > 40 else result.facs_code
-        cv2.putText(frame, facs_code, (panel_x + margin, y),
+        cv2.putText(panel, facs_code, (panel_x + margin, y),
                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
-        y += 35
         
         # Active AUs
-        cv2.putText(frame, "Active AUs", (panel_x + margin, y),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (150, 150, 200), 1)
-        y += 25
-        
+        y = self.PANEL_AUS_Y + 25
         if result.active_aus:
             for au in result.active_aus[:8]:
                 intensity = result.intensity_results.get(au.au_number)
@@ -300,18 +738,18 @@ class FACSVideoExporter:
                 label = intensity.intensity_label if intensity else ""
                 
                 text = f"AU{au.au_number}: {au.name[:15]}"
-                cv2.putText(frame, text, (panel_x + margin, y),
+                cv2.putText(panel, text, (panel_x + margin, y),
                            cv2.FONT_HERSHEY_SIMPLEX, 0.45, color, 1)
                 
-                cv2.putText(frame, f"[{label}]", (panel_x + margin + 180, y),
+                cv2.putText(panel, f"[{label}]", (panel_x + margin + 180, y),
                            cv2.FONT_HERSHEY_SIMPLEX, 0.4, color, 1)
                 
                 conf_text = f"{au.confidence:.0%}"
-                cv2.putText(frame, conf_text, (panel_x + panel_w - 60, y),
+                cv2.putText(panel, conf_text, (panel_x + panel_w - 60, y),
                            cv2.FONT_HERSHEY_SIMPLEX, 0.4, (150, 150, 150), 1)
                 y += 22
         else:
-            cv2.putText(frame, "No AUs detected", (panel_x + margin, y),
+            cv2.putText(panel, "No AUs detected", (panel_x + margin, y),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (100, 100, 100), 1)
     
     def _draw_progress_bar(
@@ -321,24 +759,14 @@ class FACSVideoExporter:
         total_frames: int,
         metadata: RecordingMetadata
     ):
-        """プログレスバーを描画"""
+        """プログレスバーの可変部分を描画（背景と溝はテンプレート側）"""
         bar_y = self.height - 50
         bar_height = 40
         margin = 20
         
-        # 背景
-        cv2.rectangle(frame, (0, bar_y), (self.width, self.height), (15, 15, 20), -1)
-        
-        # プログレスバー
-        bar_x = 100
-        bar_w = self.width - 200
-        bar_h = 8
+        bar_x, bar_w, bar_h = self._progress_bar_geometry()
         bar_center_y = bar_y + bar_height // 2
         
-        # バー背景
-        cv2.rectangle(frame, (bar_x, bar_center_y - bar_h // 2),
-                     (bar_x + bar_w, bar_center_y + bar_h // 2), (60, 60, 80), -1)
-        
         # プログレス
         progress = frame_idx / max(total_frames - 1, 1)
         fill_w = int(bar_w * progress)
@@ -359,7 +787,9 @@ class FACSVideoExporter:
         
         # フレーム番号
         frame_text = f"Frame {frame_idx + 1}/{total_frames}"
-        text_size = cv2.getTextSize(frame_text, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)[0]
+        # HERSHEY_SIMPLEX の数字は等幅なので、桁数が同じなら幅も同じ
+        digits = "0" * len(str(frame_idx + 1))
+        text_size = _text_size(f"Frame {digits}/{total_frames}", 0.5, 1)
         cv2.putText(frame, frame_text, (self.width - margin - text_size[0], bar_center_y + 5),
                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
 
@@ -374,11 +804,14 @@ def main():
     parser.add_argument("--width", type=int, default=1280, help="出力動画の幅")
     parser.add_argument("--height", type=int, default=720, help="出力動画の高さ")
     parser.add_argument("--fps", type=float, help="出力FPS")
+    parser.add_argument("--no-ffmpeg", action="store_true", help="FFmpegを使わずOpenCVで書き出す")
+    parser.add_argument("-j", "--workers", type=int, help="並列プロセス数 (省略時はCPU数)")
     
     args = parser.parse_args()
     
-    exporter = FACSVideoExporter(width=args.width, height=args.height)
-    output = exporter.export(args.input, args.output, args.fps)
+    exporter = FACSVideoExporter(width=args.width, height=args.height,
+                                 use_ffmpeg=not args.no_ffmpeg)
+    output = exporter.export(args.input, args.output, args.fps, workers=args.workers)
     print(f"出力: {output}")
 
 
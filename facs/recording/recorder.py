@@ -8,6 +8,12 @@ from pathlib import Path
 from typing import Optional, TextIO
 from datetime import datetime
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from ..core.models import AnalysisResult
 
 
@@ -106,7 +112,13 @@ class FACSRecorder:
         result.frame_number = self._frame_count
         record = result.to_record_dict()
         
-        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        if ORJSON_AVAILABLE:
+            line = orjson.dumps(
+                record, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE
+            ).decode()
+        else:
+            line = json.dumps(record, ensure_ascii=False) + "\n"
+        self._file.write(line)
         self._frame_count += 1
     
     def stop(self) -> RecordingMetadata:
@@ -3,6 +3,7 @@ import pytest
 import numpy as np
 
 from facs.detectors import FeatureExtractor, AUDetector
+from facs.core.models import FeatureVector
 
 
 class TestFeatureExtractor:
@@ -29,6 +30,22 @@ class TestFeatureExtractor:
         angles = extractor.compute_angles(dummy_landmarks)
         assert isinstance(angles, dict)
 
+    def test_batch_distances_match_single(self, extractor):
+        """バッチ計算（辞書・配列）が1フレームずつの計算と一致する"""
+        from facs.detectors import BatchFeatureExtractor
+        batch = np.random.RandomState(0).rand(4, 68, 2) * 100 + 100
+        batch_extractor = BatchFeatureExtractor()
+        dicts = batch_extractor.compute_distances_batch(batch)
+        array = batch_extractor.compute_distances_batch_array(batch, dtype=np.float64)
+
+        assert array.shape == (4, len(BatchFeatureExtractor.DIST_COLUMNS))
+        assert batch_extractor.compute_distances_batch_array(batch).dtype == np.float32
+        for landmarks, row, distances in zip(batch, array, dicts):
+            expected = extractor.compute_distances(landmarks)
+            assert list(distances) == list(BatchFeatureExtractor.DIST_COLUMNS)
+            assert np.allclose([distances[k] for k in expected], [expected[k] for k in expected])
+            assert np.allclose(row, [expected[k] for k in BatchFeatureExtractor.DIST_COLUMNS])
+
 
 class TestAUDetector:
     """AU検出器のテスト"""
@@ -55,6 +72,54 @@ class TestAUDetector:
         results = detector.detect_all(landmarks, distances, angles)
         assert isinstance(results, dict)
         assert len(results) > 0
+    
+    def test_detect_all_with_strategies(self, detector, dummy_data):
+        """戦略登録時も全AU検出できる"""
+        from facs.detectors.strategies import get_all_strategies
+        for strategy in get_all_strategies():
+            detector.register_strategy(strategy)
+        landmarks, distances, angles = dummy_data
+        results = detector.detect_all(landmarks, distances, angles)
+        assert 9 in results and 15 in results
+
+
+class TestVectorizedAUDetector:
+    """ベクトル化AU検出器のテスト"""
+    
+    def test_delta_cache_reuses_scores(self):
+        """入力がほぼ不変なら前フレームのスコアを再利用する"""
+        from facs.detectors import VectorizedAUDetector
+        detector = VectorizedAUDetector(delta_threshold=1e-3)
+        np.random.seed(42)
+        landmarks = np.random.rand(68, 2) * 100 + 100
+        distances = {"eye_distance": 50.0}
+        
+        first = detector.detect_all(landmarks, distances, {})
+        cached = detector._last_scores
+        second = detector.detect_all(landmarks + 1e-4, distances, {})
+        assert detector._last_scores is cached
+        assert second[1].raw_score == first[1].raw_score
+        
+        detector.detect_all(landmarks + 5.0, distances, {})
+        assert detector._last_scores is not cached
+
+
+class TestFeatureVector:
+    """FeatureVectorのテスト"""
+    
+    def test_from_distances_defaults(self):
+        """欠損キーは検出器の既定値で補完される"""
+        feats = FeatureVector.from_distances({"eye_distance": 50.0})
+        assert feats.eye_distance == 50.0
+        assert feats.brow_distance == pytest.approx(15.0)
+        assert feats.mouth_width == pytest.approx(25.0)
+        assert feats.mouth_height_inner == 0.0
+        assert feats.right_eye_aspect_ratio == 0.25
+    
+    def test_eye_distance_clamped(self):
+        """eye_distanceは0除算しないよう下限がある"""
+        feats = FeatureVector.from_distances({"eye_distance": 0.0})
+        assert feats.eye_distance > 0
 
 
 # ランドマーク検出器のテストはMediaPipeの初期化が必要なため別途
@@ -65,3 +130,255 @@ class TestLandmarkDetectorFactory:
         """インポートテスト"""
         from facs.detectors import LandmarkDetectorFactory
         assert LandmarkDetectorFactory is not None
+
+    def test_mediapipe_mapping(self, monkeypatch):
+        """生のランドマーク配列から68点がマッピング順に取り出される"""
+        from facs.detectors import MediaPipeLandmarkDetector
+        detector = MediaPipeLandmarkDetector()
+        raw = np.random.RandomState(0).rand(478, 2) * 100
+        monkeypatch.setattr(detector, "_get_raw_landmarks", lambda image: [raw])
+
+        landmarks = detector.detect_landmarks(None)
+        assert landmarks.dtype == np.float32
+        assert np.array_equal(landmarks, raw[detector._mapping].astype(np.float32))
+        x, y, w, h = detector.detect_faces(None)[0]
+        assert x <= raw[:, 0].min() and y <= raw[:, 1].min()
+
+    def test_mediapipe_rgb_buffer(self):
+        """BGR→RGB変換はバッファを使い回し、RGB入力では変換しない"""
+        from facs.detectors import MediaPipeLandmarkDetector
+        detector = MediaPipeLandmarkDetector()
+        image = np.random.RandomState(0).randint(0, 256, (40, 50, 3), dtype=np.uint8)
+        rgb = detector._to_rgb(image)
+        assert np.array_equal(rgb, image[..., ::-1])
+        assert detector._to_rgb(image) is rgb
+
+        detector.image_is_rgb = True
+        assert detector._to_rgb(image) is image
+        assert detector._to_rgb(image[:, ::2]).flags["C_CONTIGUOUS"]
+
+    def test_model_path_cached(self, monkeypatch):
+        """モデルパスは1回だけ探し、以降はクラスで共有する"""
+        from facs.detectors import MediaPipeLandmarkDetector
+        calls = []
+        monkeypatch.setattr(MediaPipeLandmarkDetector, "_cached_model_path", None)
+        monkeypatch.setattr(MediaPipeLandmarkDetector, "_find_or_download_model",
+                            lambda self: calls.append(1) or "model.task")
+        first = MediaPipeLandmarkDetector.__new__(MediaPipeLandmarkDetector)
+        second = MediaPipeLandmarkDetector.__new__(MediaPipeLandmarkDetector)
+        assert first._get_model_path() == second._get_model_path() == "model.task"
+        assert len(calls) == 1
+
+    def test_detect_landmarks_batch_video_mode(self, monkeypatch):
+        """VIDEOモードでは単調増加するタイムスタンプでフレームを順に渡す"""
+        import sys
+        import types
+        from facs.detectors import MediaPipeLandmarkDetector
+        fake_mp = types.SimpleNamespace(
+            Image=lambda image_format, data: data,
+            ImageFormat=types.SimpleNamespace(SRGB="srgb"),
+        )
+        monkeypatch.setitem(sys.modules, "mediapipe", fake_mp)
+        point = types.SimpleNamespace(x=0.5, y=0.25)
+        timestamps = []
+
+        class FakeLandmarker:
+            def detect_for_video(self, image, timestamp_ms):
+                timestamps.append(timestamp_ms)
+                faces = [[point] * 478] if image[0, 0, 0] else []
+                return types.SimpleNamespace(face_landmarks=faces)
+
+        detector = MediaPipeLandmarkDetector()
+        detector._api_type = "tasks"
+        detector._video_landmarker = FakeLandmarker()
+        images = [np.full((20, 40, 3), v, dtype=np.uint8) for v in (1, 0, 1)]
+        results = detector.detect_landmarks_batch(images, frame_interval_ms=10)
+        detector.detect_landmarks_batch(images[:1], frame_interval_ms=10)
+
+        assert results[1] is None
+        assert np.array_equal(results[0], np.tile([20.0, 5.0], (68, 1)).astype(np.float32))
+        assert timestamps == [10, 20, 30, 40]
+
+
+class TestDebugLandmarks:
+    """デバッグ描画のテスト"""
+    
+    @pytest.mark.parametrize("shape", [(480, 640, 3), (60, 80, 3)])
+    def test_cached_legend_matches_direct_draw(self, shape):
+        """キャッシュした凡例の書き込みが直接描画と一致する（画像が小さい場合も）"""
+        from facs.detectors.debug_landmarks import _blit_legend, _draw_legend
+        cached = np.full(shape, 7, dtype=np.uint8)
+        direct = cached.copy()
+        _blit_legend(cached)
+        _draw_legend(direct)
+        assert np.array_equal(cached, direct)
+
+    def test_extra_points_not_labelled(self):
+        """68点を超える点には点も番号も描かない"""
+        from facs.detectors.debug_landmarks import visualize_landmarks_debug
+        image = np.zeros((480, 640, 3), dtype=np.uint8)
+        landmarks = np.vstack([np.full((68, 2), 100.0), [[550.0, 400.0], [560.0, 410.0]]])
+        output = visualize_landmarks_debug(image, landmarks, show_regions=False)
+        assert not output[380:, 520:].any()
+
+
+class TestFaceAligner:
+    """顔アライメントのテスト"""
+    
+    def test_normalize_landmarks(self):
+        """正規化後は両目の中心が (±0.5, 0) に来る（傾きがあっても）"""
+        from facs.detectors import FaceAligner
+        np.random.seed(0)
+        landmarks = np.random.rand(68, 2) * 100 + 100
+        theta = np.radians(20)
+        rotation = np.array([[np.cos(theta), -np.sin(theta)], [np.sin(theta), np.cos(theta)]])
+        tilted = landmarks @ rotation.T * 1.5 + 30
+        
+        normalized = FaceAligner().normalize_landmarks(tilted)
+        right_eye = normalized[36:42].mean(axis=0)
+        left_eye = normalized[42:48].mean(axis=0)
+        assert np.allclose(right_eye, [-0.5, 0.0])
+        assert np.allclose(left_eye, [0.5, 0.0])
+
+    def test_normalize_landmarks_near_zero_roll(self):
+        """ロール角が小さい顔は回転を省いても回転補正ありの結果とほぼ一致する"""
+        from facs.detectors import FaceAligner
+        np.random.seed(0)
+        landmarks = np.random.rand(68, 2) * 100 + 100
+        landmarks[36:42] = [[100, 150], [110, 146], [120, 146], [130, 150], [120, 154], [110, 154]]
+        landmarks[42:48] = landmarks[36:42] + [80, 1]
+        aligner = FaceAligner()
+        alignment = aligner.compute_alignment(landmarks)
+        assert 0 < abs(alignment.roll) < aligner.NORMALIZE_MAX_SKIP_ROLL
+
+        normalized = aligner.normalize_landmarks(landmarks, alignment)
+        aligner.NORMALIZE_MAX_SKIP_ROLL = 0.0
+        rotated = aligner.normalize_landmarks(landmarks, alignment)
+        assert np.allclose(normalized, rotated, atol=0.02)
+
+    @pytest.mark.parametrize("dtype", [np.float32, np.float64])
+    def test_normalize_denormalize_round_trip_near_zero_roll(self, dtype):
+        """ロール角約0.9度でも正規化→逆変換で元に戻り、出力の型は回転補正の有無によらない"""
+        from facs.detectors import FaceAligner
+        np.random.seed(0)
+        landmarks = np.random.rand(68, 2) * 100 + 100
+        landmarks[36:42] = [[100, 150], [110, 146], [120, 146], [130, 150], [120, 154], [110, 154]]
+        landmarks[42:48] = landmarks[36:42] + [80, 1.26]
+        landmarks = landmarks.astype(dtype)
+        aligner = FaceAligner()
+        alignment = aligner.compute_alignment(landmarks)
+        assert 0.85 < abs(alignment.roll) < aligner.NORMALIZE_MAX_SKIP_ROLL
+
+        normalized = aligner.normalize_landmarks(landmarks, alignment)
+        restored = aligner.denormalize_landmarks(normalized, alignment)
+        assert normalized.dtype == np.float64
+        assert np.allclose(restored, landmarks, atol=1e-3)
+
+        aligner.NORMALIZE_MAX_SKIP_ROLL = 0.0
+        assert aligner.normalize_landmarks(landmarks, alignment).dtype == normalized.dtype
+
+    def test_align_image_frontal_crop(self):
+        """正面向きの顔は切り出し + resize で整列され、目が所定の位置に来る"""
+        from facs.detectors import FaceAligner
+        landmarks = np.zeros((68, 2))
+        landmarks[:] = [150.0, 160.0]
+        landmarks[36:42] = [100.0, 100.0]
+        landmarks[42:48] = [202.4, 100.0]
+        image = np.random.RandomState(0).randint(0, 255, (300, 300, 3), dtype=np.uint8)
+        
+        aligner = FaceAligner()
+        assert aligner._frontal_crop(image.shape, aligner.compute_alignment(landmarks),
+                                     (256, 256), 0.35, 256 * 0.4) is not None
+        aligned, aligned_landmarks = aligner.align_image(image, landmarks)
+        assert aligned.shape == (256, 256, 3)
+        assert np.allclose(aligned_landmarks[36], [76.8, 89.6], atol=1.0)
+        assert np.allclose(aligned_landmarks[42], [179.2, 89.6], atol=1.0)
+
+
+class TestDeepFaceAnalyzeBatch:
+    """DeepFaceのバッチ分析のテスト（DeepFace本体の代わりに偽物を使う）"""
+    
+    @staticmethod
+    def _result(x):
+        return {"region": {"x": x, "y": 0, "w": 10, "h": 10}, "emotion": {},
+                "dominant_emotion": "happy", "age": 30, "gender": {},
+                "dominant_gender": "Woman", "dominant_race": "asian"}
+    
+    def _analyzer(self, supports_batch):
+        from facs.detectors import DeepFaceAnalyzer
+        calls = []
+        result = self._result
+        
+        class FakeDeepFace:
+            @staticmethod
+            def analyze(img_path, **kwargs):
+                calls.append(img_path.shape)
+                if img_path.ndim == 4:
+                    if not supports_batch:
+                        raise ValueError("unsupported input")
+                    return [[result(int(img[0, 0, 0]))] for img in img_path]
+                return [result(int(img_path[0, 0, 0]))]
+        
+        analyzer = DeepFaceAnalyzer(detector_backend="opencv")
+        analyzer._deepface = FakeDeepFace
+        return analyzer, calls
+    
+    @pytest.mark.parametrize("supports_batch", [True, False])
+    def test_analyze_batch_order(self, supports_batch):
+        """バッチ対応の有無にかかわらず入力順に結果が返る"""
+        analyzer, calls = self._analyzer(supports_batch)
+        images = [np.full((8, 8, 3), i, dtype=np.uint8) for i in range(5)]
+        results = analyzer.analyze_batch(images, batch_size=2)
+        assert [r[0].face_rect[0] for r in results] == [0, 1, 2, 3, 4]
+        if supports_batch:
+            assert calls == [(2, 8, 8, 3), (2, 8, 8, 3), (8, 8, 3)]
+    
+    def test_analyze_cache(self):
+        """同じ内容の画像はDeepFaceを呼ばずにキャッシュから返す"""
+        analyzer, calls = self._analyzer(True)
+        image = np.full((8, 8, 3), 3, dtype=np.uint8)
+        first = analyzer.analyze(image)
+        assert analyzer.analyze(image.copy()) == first
+        assert analyzer.analyze_batch([image, image + 1])[0] == first
+        assert len(calls) == 2
+    
+    def test_warmup(self):
+        """ウォームアップはダミー画像で1回分析し、その後の分析はウォームアップ完了を待つ"""
+        import threading
+        analyzer, calls = self._analyzer(True)
+        analyzer._warmup_thread = threading.Thread(target=analyzer._warmup)
+        analyzer._warmup_thread.start()
+        analyzer.analyze(np.ones((8, 8, 3), dtype=np.uint8))
+        assert calls == [(224, 224, 3), (8, 8, 3)]
+        assert analyzer._warmup_thread is None
+
+    def test_extract_faces_skips_warmup_wait(self):
+        """分析モデルを使わない顔抽出はウォームアップ完了を待たない"""
+        import threading
+        analyzer, _ = self._analyzer(True)
+        analyzer._deepface.extract_faces = staticmethod(lambda img_path, **kwargs: [{}])
+        release = threading.Event()
+        analyzer._warmup_thread = threading.Thread(target=release.wait)
+        analyzer._warmup_thread.start()
+        try:
+            assert analyzer.extract_faces(np.ones((8, 8, 3), dtype=np.uint8)) == [{}]
+            assert analyzer._warmup_thread.is_alive()
+        finally:
+            release.set()
+
+    def test_analyze_many(self, monkeypatch):
+        """プールで分析した結果が入力順に返り、キャッシュ済みの画像はプールに送らない"""
+        from concurrent.futures import ThreadPoolExecutor
+        from facs.detectors import deepface_detector
+        analyzer, calls = self._analyzer(True)
+        worker, worker_calls = self._analyzer(True)
+        monkeypatch.setattr(deepface_detector, "_worker_analyzer", worker)
+        monkeypatch.setattr(deepface_detector, "_cuda_device_count", lambda: 0)
+        analyzer._pool, analyzer._pool_workers = ThreadPoolExecutor(2), 2
+
+        images = [np.full((8, 8, 3), i, dtype=np.uint8) for i in range(5)]
+        analyzer.analyze(images[3])
+        results = analyzer.analyze_many(images, workers=2)
+        analyzer.close()
+        assert [r[0].face_rect[0] for r in results] == [0, 1, 2, 3, 4]
+        assert len(calls) == 1 and len(worker_calls) == 4
@@ -59,6 +59,12 @@ class TestIntensityEstimator:
         assert result.intensity == AUIntensity.ABSENT
         assert result.intensity_label == "-"
 
+    def test_intensity_label(self):
+        """強度ラベル"""
+        assert AUIntensity.ABSENT.label == "-"
+        assert AUIntensity.MARKED.label == "C"
+        assert AUIntensity.MAXIMUM.label == "E"
+
 
 class TestEmotionMapper:
     """感情マッピングのテスト"""
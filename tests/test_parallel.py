@@ -0,0 +1,102 @@
+"""並列処理のテスト"""
+import queue
+import time
+
+import pytest
+import numpy as np
+
+from facs.core.parallel_processor import FrameData, InferenceWorker, ParallelFACSProcessor
+
+
+class _FakeLandmarkDetector:
+    """呼び出し回数を数える固定ランドマーク検出器"""
+
+    def __init__(self, landmarks):
+        self.landmarks = landmarks
+        self.calls = 0
+
+    def detect_landmarks(self, image):
+        self.calls += 1
+        return self.landmarks.copy()
+
+
+class _FakeResultSlot:
+    def __init__(self):
+        self.results = []
+
+    def publish(self, result_data):
+        self.results.append(result_data)
+        return True
+
+
+class _StopWhenEmpty:
+    """入力キューが空になったら停止するイベント"""
+
+    def __init__(self, input_queue):
+        self.input_queue = input_queue
+
+    def is_set(self):
+        return self.input_queue.empty()
+
+
+class TestInferenceWorker:
+    """推論ワーカーのテスト"""
+
+    @pytest.fixture
+    def detector(self, dummy_landmarks):
+        return _FakeLandmarkDetector(dummy_landmarks)
+
+    def _run(self, monkeypatch, detector, frames, motion_threshold):
+        """frames を順に処理し、ワーカーと結果を返す"""
+        from facs.detectors import LandmarkDetectorFactory
+        monkeypatch.setattr(LandmarkDetectorFactory, "create", lambda *args, **kwargs: detector)
+
+        input_queue = queue.Queue()
+        for frame_id, image in frames:
+            input_queue.put(FrameData(frame_id=frame_id, timestamp=time.time(), image=image))
+        slot = _FakeResultSlot()
+        worker = InferenceWorker(
+            input_queue, slot, _StopWhenEmpty(input_queue),
+            mode='balanced', motion_threshold=motion_threshold
+        )
+        worker._init_analyzer()
+        worker._loop()
+        return worker, slot.results
+
+    def test_static_frames_reuse_result(self, monkeypatch, detector, dummy_face_image):
+        """連続する静止フレームでは検出を省略して前回の結果を使う"""
+        frames = [(1, dummy_face_image), (2, dummy_face_image), (4, dummy_face_image)]
+        _, results = self._run(monkeypatch, detector, frames, motion_threshold=1.5)
+
+        # frame_id が飛んだフレームは再検出する
+        assert detector.calls == 2
+        assert [r.frame_id for r in results] == [1, 2, 4]
+        assert [r.result_dict['frame_id'] for r in results] == [1, 2, 4]
+        assert results[1].result_dict['landmarks_bytes'] == results[0].result_dict['landmarks_bytes']
+
+    def test_moving_frames_redetect(self, monkeypatch, detector, dummy_face_image):
+        """顔領域が変化したフレームは再検出する"""
+        moved = 255 - dummy_face_image
+        frames = [(1, dummy_face_image), (2, moved)]
+        self._run(monkeypatch, detector, frames, motion_threshold=1.5)
+        assert detector.calls == 2
+
+    def test_reuse_disabled(self, monkeypatch, detector, dummy_face_image):
+        """閾値0以下では動き判定用の縮小画像も作らない"""
+        monkeypatch.setattr(InferenceWorker, "_motion_thumbnail",
+                            lambda self, image: pytest.fail("thumbnail computed"))
+        frames = [(1, dummy_face_image), (2, dummy_face_image)]
+        worker, results = self._run(monkeypatch, detector, frames, motion_threshold=0)
+
+        assert detector.calls == 2
+        assert worker._last_thumb is None
+        assert all(r.result_dict['is_valid'] for r in results)
+
+
+class TestParallelFACSProcessor:
+    """並列処理マネージャーのテスト"""
+
+    def test_reuse_only_with_single_worker(self):
+        """複数ワーカーでは連続フレームが分散するため再利用を無効にする"""
+        assert ParallelFACSProcessor(num_workers=1)._worker_motion_threshold() == 1.5
+        assert ParallelFACSProcessor(num_workers=2)._worker_motion_threshold() == 0.0
@@ -0,0 +1,111 @@
+"""記録・エクスポートのテスト"""
+import pytest
+import numpy as np
+import cv2
+
+from facs.core.models import AnalysisResult, FaceData
+from facs.recording import FACSRecorder
+from facs.recording.exporter import FACSVideoExporter
+
+
+class TestFACSVideoExporter:
+    """動画エクスポーターのテスト"""
+
+    @pytest.fixture
+    def recording(self, tmp_path):
+        """顔あり/なしのフレームを含む記録を作成"""
+        landmarks = np.random.RandomState(0).rand(68, 2) * 100 + 100
+        recorder = FACSRecorder(str(tmp_path), name="rec")
+        recorder.start(fps=10.0)
+        for i in range(6):
+            face = FaceData(landmarks=landmarks, rect=(100, 100, 100, 100)) if i in (2, 3) else None
+            recorder.record_frame(AnalysisResult(face_data=face))
+        recorder.stop()
+        return recorder.data_path
+
+    def test_export(self, recording, tmp_path):
+        """全フレームが書き出される"""
+        exporter = FACSVideoExporter(width=320, height=240, use_ffmpeg=False)
+        output = exporter.export(str(recording), str(tmp_path / "out.mp4"), show_progress=False)
+
+        cap = cv2.VideoCapture(output)
+        assert cap.isOpened()
+        assert int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) == 6
+        cap.release()
+
+    def test_export_empty(self, tmp_path):
+        """フレームのない記録はエラー"""
+        recorder = FACSRecorder(str(tmp_path), name="empty")
+        recorder.start()
+        recorder.stop()
+
+        exporter = FACSVideoExporter(use_ffmpeg=False)
+        with pytest.raises(ValueError):
+            exporter.export(str(recorder.data_path), show_progress=False)
+
+    def test_export_parallel(self, recording, tmp_path):
+        """チャンク並列書き出しでもフレーム数が一致する"""
+        from facs.recording.exporter import detect_ffmpeg_codec
+        if detect_ffmpeg_codec() is None:
+            pytest.skip("FFmpegが利用できません")
+
+        exporter = FACSVideoExporter(width=320, height=240)
+        exporter.MIN_FRAMES_PER_CHUNK = 2
+        output = exporter.export(str(recording), str(tmp_path / "out.mp4"),
+                                 show_progress=False, workers=3)
+
+        cap = cv2.VideoCapture(output)
+        assert int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) == 6
+        cap.release()
+
+    def test_render_frames_matches_single_render(self, recording):
+        """連続描画（バッファ再利用・顔なしフレームの流用）が単発描画と一致する"""
+        from facs.recording.exporter import iter_records
+        from facs.recording.recorder import RecordingMetadata
+
+        exporter = FACSVideoExporter(width=320, height=240)
+        metadata = RecordingMetadata()
+        frames = [f.copy() for f in exporter._render_frames(recording, 0, 6, 6, metadata)]
+        for i, result in enumerate(iter_records(recording)):
+            assert np.array_equal(frames[i], exporter._render_frame(result, i, 6, metadata))
+
+    def test_render_degenerate_landmarks(self):
+        """全点が同じ座標のランドマークでも描画が中断しない"""
+        from facs.recording.recorder import RecordingMetadata
+
+        exporter = FACSVideoExporter(width=320, height=240)
+        face = FaceData(landmarks=np.full((68, 2), 150.0), rect=(100, 100, 100, 100))
+        frame = exporter._render_frame(AnalysisResult(face_data=face), 0, 1, RecordingMetadata())
+        assert frame.shape == (240, 320, 3)
+
+
+class TestRecordDict:
+    """記録用辞書の変換テスト"""
+
+    def test_round_trip(self):
+        """to_record_dict -> from_record_dict で内容が復元される"""
+        from facs.core.enums import AUIntensity
+        from facs.core.models import AUDetectionResult, IntensityResult, EmotionResult
+
+        result = AnalysisResult(
+            face_data=FaceData(landmarks=np.zeros((68, 2)), rect=(1, 2, 3, 4)),
+            au_results={12: AUDetectionResult(12, "Lip Corner Puller", True, 0.8,
+                                              AUIntensity.MARKED, 0.6, 0.1)},
+            intensity_results={12: IntensityResult(12, AUIntensity.MARKED, 3.0, "C", 0.8)},
+            emotions=[EmotionResult("Happiness", 0.9, 0.8, 0.5, [6, 12], [], "")],
+            facs_code="12C",
+        )
+        restored = AnalysisResult.from_record_dict(result.to_record_dict())
+
+        assert restored.au_results == result.au_results
+        assert restored.intensity_results == result.intensity_results
+        assert restored.emotions == result.emotions
+        assert restored.face_data.rect == (1, 2, 3, 4)
+        assert np.array_equal(restored.face_data.landmarks, result.face_data.landmarks)
+        assert restored.facs_code == "12C"
+
+    def test_face_data_legacy_landmarks(self):
+        """数値リスト形式のランドマークも復元できる"""
+        face = FaceData.from_dict({"rect": None, "landmarks": [[1.0, 2.0], [3.0, 4.0]]})
+        assert face.landmarks.dtype == np.float32
+        assert face.landmarks.tolist() == [[1.0, 2.0], [3.0, 4.0]]